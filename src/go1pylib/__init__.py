@@ -6,10 +6,11 @@ This library provides a Python interface for controlling the Go1 quadruped robot
 
 from .go1 import Go1, Go1Mode
 from .mqtt.state import Go1State
+from .sync import Go1Sync
 
 __version__ = "0.1.5"
 __author__ = "Chinmay Nehate"
 __license__ = "MIT"
 
 # Export main classes for easier imports
-__all__ = ["Go1", "Go1Mode", "Go1State"]
\ No newline at end of file
+__all__ = ["Go1", "Go1Mode", "Go1State", "Go1Sync"]
\ No newline at end of file
@@ -0,0 +1,7 @@
+"""Allow ``python -m go1pylib``."""
+
+import sys
+
+from .cli import main
+
+sys.exit(main())
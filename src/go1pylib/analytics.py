@@ -0,0 +1,185 @@
+"""
+Process-pool telemetry analytics for the Go1 robot.
+
+Decoded telemetry is batched into a fixed-size window on the inbound path.
+Every ``batch_size`` packets the window is copied into a shared-memory block
+and user-defined analysis functions run on it in a ``ProcessPoolExecutor``,
+so heavy analysis never competes with the control loop for the GIL.
+"""
+
+from concurrent.futures import Future, ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Any, Callable, Dict, List, Optional
+import logging
+import threading
+import time
+
+import numpy as np
+
+from .mqtt.state import Go1State
+from .shm import _attach
+
+logger = logging.getLogger(__name__)
+
+# One row per decoded packet, as seen by analysis functions
+TELEMETRY_DTYPE = np.dtype([
+    ("timestamp", "<f8"),
+    ("soc", "<f4"),
+    ("current", "<f4"),
+    ("voltage", "<f4"),
+    ("bms_temps", "<f4", (4,)),
+    ("cell_voltages", "<f4", (10,)),
+    ("motor_temps", "<f4", (20,)),
+])
+
+AnalysisFunction = Callable[[np.ndarray], Any]
+
+def _run_analysis(fn: AnalysisFunction, shm_name: str, length: int) -> Any:
+    """
+    Worker entry point: run ``fn`` on a window stored in shared memory.
+
+    Args:
+        fn: Picklable analysis function
+        shm_name: Block holding the window
+        length: Number of valid rows in the block
+
+    Returns:
+        Whatever ``fn`` returns; arrays are copied out of shared memory
+    """
+    # Workers share the pipeline's resource tracker, which owns the block
+    shm = _attach(shm_name, shared_tracker=True)
+    try:
+        window = np.ndarray((length,), dtype=TELEMETRY_DTYPE, buffer=shm.buf)
+        result = fn(window)
+        if isinstance(result, np.ndarray):
+            result = result.copy()
+        del window
+        return result
+    finally:
+        shm.close()
+
+class AnalyticsPipeline:
+    """Batches telemetry and fans analysis out to worker processes."""
+
+    def __init__(self, analyses: Dict[str, AnalysisFunction],
+                 on_result: Optional[Callable[[str, Any], None]] = None,
+                 on_close: Optional[Callable[[], None]] = None,
+                 window: int = 600, batch_size: int = 50,
+                 max_workers: Optional[int] = None, buffers: int = 4):
+        """
+        Initialize the pipeline.
+
+        Args:
+            analyses: Analysis functions by name; each receives a structured
+                array of TELEMETRY_DTYPE rows, oldest first. They must be
+                picklable, i.e. defined at module level.
+            on_result: Called with (name, result) when an analysis finishes
+            on_close: Called once by ``close`` before the workers stop, e.g. to
+                unsubscribe ``observe`` from its source
+            window: Number of most recent packets each analysis sees
+            batch_size: Packets between analysis runs
+            max_workers: Worker processes (defaults to the CPU count)
+            buffers: Shared-memory windows that may be in flight at once;
+                batches arriving while all are busy are skipped
+        """
+        self.analyses = dict(analyses)
+        self.on_result = on_result
+        self.on_close = on_close
+        self.window = window
+        self.batch_size = batch_size
+        self.executor = ProcessPoolExecutor(max_workers=max_workers)
+
+        self.submitted_batches = 0
+        self.skipped_batches = 0
+        self.failed_analyses = 0
+
+        self._ring = np.zeros(window, dtype=TELEMETRY_DTYPE)
+        self._count = 0
+        self._since_batch = 0
+        self._lock = threading.Lock()
+        self._free: List[shared_memory.SharedMemory] = [
+            shared_memory.SharedMemory(create=True, size=self._ring.nbytes)
+            for _ in range(max(buffers, 1))
+        ]
+        self._all_buffers = list(self._free)
+
+    def observe(self, topic: str, state: Go1State) -> None:
+        """
+        Append the decoded state to the window; submit a batch when due.
+
+        Args:
+            topic: Topic the packet arrived on
+            state: Go1 state after decoding it
+        """
+        row = self._ring[self._count % self.window]
+        row["timestamp"] = time.time()
+        row["soc"] = state.bms.soc
+        row["current"] = state.bms.current
+        row["voltage"] = state.bms.voltage
+        row["bms_temps"] = state.bms.temps
+        row["cell_voltages"] = state.bms.cell_voltages
+        row["motor_temps"] = state.robot.temps
+        self._count += 1
+        self._since_batch += 1
+        if self._since_batch >= self.batch_size:
+            self._since_batch = 0
+            self._submit()
+
+    def _submit(self) -> None:
+        """Copy the window into a free shared-memory block and dispatch analyses."""
+        if not self.analyses:
+            return
+        with self._lock:
+            if not self._free:
+                self.skipped_batches += 1
+                logger.debug("Analytics workers busy, skipping batch")
+                return
+            shm = self._free.pop()
+
+        length = min(self._count, self.window)
+        start = self._count % self.window if self._count > self.window else 0
+        target = np.ndarray((length,), dtype=TELEMETRY_DTYPE, buffer=shm.buf)
+        # Unroll the ring so the oldest row comes first
+        head = self.window - start if self._count > self.window else length
+        target[:head] = self._ring[start:start + head]
+        target[head:] = self._ring[:length - head]
+        del target
+
+        pending = [len(self.analyses)]
+        self.submitted_batches += 1
+        for name, fn in self.analyses.items():
+            future = self.executor.submit(_run_analysis, fn, shm.name, length)
+            future.add_done_callback(
+                lambda f, name=name: self._on_done(name, f, shm, pending)
+            )
+
+    def _on_done(self, name: str, future: Future,
+                 shm: shared_memory.SharedMemory, pending: List[int]) -> None:
+        """Deliver one result and recycle the block once its batch is done."""
+        try:
+            result = future.result()
+            if self.on_result:
+                self.on_result(name, result)
+        except Exception as e:
+            self.failed_analyses += 1
+            logger.error(f"Analysis {name} failed: {e}")
+        finally:
+            with self._lock:
+                pending[0] -= 1
+                if pending[0] == 0:
+                    self._free.append(shm)
+
+    def close(self) -> None:
+        """Stop observing, stop the workers and release all shared-memory blocks."""
+        if self.on_close:
+            on_close, self.on_close = self.on_close, None
+            on_close()
+        self.executor.shutdown(wait=True)
+        for shm in self._all_buffers:
+            shm.close()
+            try:
+                shm.unlink()
+            except FileNotFoundError:
+                pass
+        self._all_buffers = []
+        self._free = []
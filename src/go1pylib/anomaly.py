@@ -0,0 +1,280 @@
+"""
+Streaming anomaly detection over decoded telemetry.
+
+Every check keeps exponentially weighted means and variances in small fixed
+NumPy arrays and tests each packet against the statistics from before it,
+so an anomaly is reported on the packet that shows it and a detector uses
+the same few hundred bytes however long it runs. FleetAnomalyMonitor keeps
+one detector (and one decoded state) per robot, which is all a monitoring
+host needs to watch a fleet from its raw packet streams.
+
+Checks:
+    current_spike     bms.current jumps away from its running mean
+    cell_divergence   a cell drifts from the others, or the cell spread is too wide
+    motor_outlier     a leg motor runs hotter than the same joint on the other legs
+    obstacle_dropout  an obstacle sensor jumps from a near reading to 255 (no
+                      echo), or stays frozen while the other sensors change
+"""
+
+from typing import Callable, Dict, Optional
+import logging
+
+import numpy as np
+
+from .mqtt.handler import message_handler
+from .mqtt.state import Go1State, get_go1_state_copy
+from .mqtt.topics import BmsSubTopic, FirmwareSubTopic
+
+logger = logging.getLogger(__name__)
+
+NUM_CELLS = 10
+NUM_LEG_MOTORS = 3 * 4  # hip, thigh and calf motor of each leg, leg-major
+NO_ECHO = 255
+
+# For every leg, the other three legs
+_OTHER_LEGS = np.array([[1, 2, 3], [0, 2, 3], [0, 1, 3], [0, 1, 2]])
+
+class _EwmStats:
+    """Exponentially weighted mean and variance of a fixed-size vector."""
+
+    def __init__(self, size: int, alpha: float):
+        """
+        Initialize zeroed statistics.
+
+        Args:
+            size: Vector length
+            alpha: Weight of each new sample
+        """
+        self.alpha = alpha
+        self.mean = np.zeros(size)
+        self.var = np.zeros(size)
+        self.count = 0
+
+    def update(self, x: np.ndarray) -> None:
+        """Fold in one sample in place; the first sample seeds the mean with zero variance."""
+        if self.count == 0:
+            self.mean[:] = x
+        else:
+            diff = x - self.mean
+            increment = self.alpha * diff
+            self.mean += increment
+            self.var *= 1.0 - self.alpha
+            self.var += (1.0 - self.alpha) * diff * increment
+        self.count += 1
+
+    def exceeds(self, x: np.ndarray, z: float, floor: float) -> np.ndarray:
+        """Which elements of x lie more than max(z sigma, floor) from the mean."""
+        return np.abs(x - self.mean) > np.maximum(z * np.sqrt(self.var), floor)
+
+class AnomalyDetector:
+    """
+    Online anomaly checks for one robot.
+
+    Events are passed to ``on_event`` as ``(kind, index, value)`` where
+    index is the cell, motor or sensor concerned (0 for the current):
+        - ``"current_spike"``: value is the current (mA)
+        - ``"cell_divergence"``: value is the cell's deviation from the pack mean (mV)
+        - ``"motor_outlier"``: value is the excess over the sibling motors (C)
+        - ``"obstacle_dropout"``: value is the stuck reading
+    Each fires once when the condition starts; all but current spikes fire
+    ``"<kind>_clear"`` once the condition ends.
+    """
+
+    def __init__(self, on_event: Optional[Callable[[str, int, float], None]] = None,
+                 alpha: float = 0.05, warmup: int = 20, current_z: float = 6.0,
+                 current_floor: float = 5000.0, cell_z: float = 6.0, cell_floor: float = 20.0,
+                 max_cell_spread: float = 100.0, motor_z: float = 6.0, motor_margin: float = 10.0,
+                 obstacle_near: int = 100, obstacle_stuck: int = 50):
+        """
+        Initialize the detector.
+
+        Args:
+            on_event: Called with (kind, index, value) on the decode thread
+            alpha: EWMA weight of each new packet
+            warmup: Packets per check before statistical tests start
+            current_z: Standard deviations from the mean that make a current spike
+            current_floor: Smallest deviation (mA) counted as a spike
+            cell_z: Standard deviations a cell may move relative to the pack
+            cell_floor: Smallest cell deviation change (mV) counted as divergence
+            max_cell_spread: Highest minus lowest cell (mV) that is always divergence
+            motor_z: Standard deviations above sibling motors that make an outlier
+            motor_margin: Smallest excess (C) over sibling motors counted as an outlier
+            obstacle_near: Reading (cm) below which a jump to 255 is a dropout
+            obstacle_stuck: Packets a sensor may stay frozen while others change
+        """
+        self.on_event = on_event
+        self.warmup = warmup
+        self.current_z = current_z
+        self.current_floor = current_floor
+        self.cell_z = cell_z
+        self.cell_floor = cell_floor
+        self.max_cell_spread = max_cell_spread
+        self.motor_z = motor_z
+        self.motor_margin = motor_margin
+        self.obstacle_near = obstacle_near
+        self.obstacle_stuck = obstacle_stuck
+
+        self.current = _EwmStats(1, alpha)
+        self.cells = _EwmStats(NUM_CELLS, alpha)
+        self.motors = _EwmStats(NUM_LEG_MOTORS, alpha)
+        self.events = 0
+
+        self._spiking = False
+        self._cell_flags = np.zeros(NUM_CELLS, dtype=bool)
+        self._motor_flags = np.zeros(NUM_LEG_MOTORS, dtype=bool)
+        self._obstacle_flags = np.zeros(4, dtype=bool)
+        self._obstacles = np.full(4, NO_ECHO, dtype=np.int64)
+        self._frozen = np.zeros(4, dtype=np.int64)  # packets since each sensor last changed
+        self._obstacle_packets = 0
+
+    def update_bms(self, current: float, cell_voltages) -> None:
+        """
+        Check and fold in one BMS packet.
+
+        Args:
+            current: Pack current (mA)
+            cell_voltages: Ten cell voltages (mV)
+        """
+        x = np.array([float(current)])
+        spike = self.current.count >= self.warmup and bool(
+            self.current.exceeds(x, self.current_z, self.current_floor)[0])
+        if spike and not self._spiking:
+            self._fire("current_spike", 0, float(current))
+        self._spiking = spike
+        self.current.update(x)
+
+        cells = np.asarray(cell_voltages, dtype=np.float64)
+        deviation = cells - cells.mean()
+        if self.cells.count >= self.warmup:
+            diverged = self.cells.exceeds(deviation, self.cell_z, self.cell_floor)
+        else:
+            diverged = np.zeros(NUM_CELLS, dtype=bool)
+        if cells.max() - cells.min() >= self.max_cell_spread:
+            diverged[np.argmax(np.abs(deviation))] = True
+        self._edges("cell_divergence", diverged, self._cell_flags, deviation)
+        self._cell_flags = diverged
+        # Flagged cells do not drag the baseline towards themselves
+        self.cells.update(np.where(diverged, self.cells.mean, deviation))
+
+    def update_robot(self, temps, obstacles) -> None:
+        """
+        Check and fold in one firmware packet.
+
+        Args:
+            temps: Motor temperatures (C); the first 12 are the leg motors
+            obstacles: Obstacle distances (cm, 255 when nothing is seen)
+        """
+        legs = np.asarray(temps[:NUM_LEG_MOTORS], dtype=np.float64).reshape(4, 3)
+        siblings = np.median(legs[_OTHER_LEGS], axis=1)
+        excess = (legs - siblings).ravel()
+        outlier = excess > self.motor_margin
+        if self.motors.count >= self.warmup:
+            outlier &= self.motors.exceeds(excess, self.motor_z, self.motor_margin)
+        self._edges("motor_outlier", outlier, self._motor_flags, excess)
+        self._motor_flags = outlier
+        self.motors.update(np.where(outlier, self.motors.mean, excess))
+
+        readings = np.asarray(obstacles, dtype=np.int64)
+        changed = readings != self._obstacles
+        if self._obstacle_packets == 0:
+            changed[:] = False
+        lost_echo = changed & (readings == NO_ECHO) & (self._obstacles < self.obstacle_near)
+        self._frozen = np.where(changed, 0, self._frozen + 1)
+        # A frozen sensor is suspicious only while the scene changes for the others
+        others_changed = changed.sum() - changed > 0
+        frozen = (self._frozen >= self.obstacle_stuck) & others_changed
+        dropout = lost_echo | frozen | (self._obstacle_flags & ~changed)
+        self._edges("obstacle_dropout", dropout, self._obstacle_flags, readings)
+        self._obstacle_flags = dropout
+        self._obstacles = readings
+        self._obstacle_packets += 1
+
+    def observe(self, topic: str, state: Go1State) -> None:
+        """
+        State listener: check every decoded BMS and firmware packet.
+
+        Args:
+            topic: Topic the packet arrived on
+            state: Go1 state after decoding it
+        """
+        if topic == BmsSubTopic.BMS_STATE:
+            self.update_bms(state.bms.current, state.bms.cell_voltages)
+        elif topic == FirmwareSubTopic.FIRMWARE_VERSION:
+            self.update_robot(state.robot.temps, state.robot.obstacles)
+
+    def _edges(self, kind: str, flags: np.ndarray, previous: np.ndarray, values: np.ndarray) -> None:
+        """Fire start events for new flags and clear events for dropped ones."""
+        if not (flags.any() or previous.any()):
+            return
+        for index in np.flatnonzero(flags & ~previous):
+            self._fire(kind, int(index), float(values[index]))
+        for index in np.flatnonzero(previous & ~flags):
+            self._fire(f"{kind}_clear", int(index), float(values[index]))
+
+    def _fire(self, kind: str, index: int, value: float) -> None:
+        """Count and log one event, then pass it to ``on_event``."""
+        self.events += 1
+        if kind.endswith("_clear"):
+            logger.info(f"Anomaly {kind[:-6]} on {index} cleared ({value:.1f})")
+        else:
+            logger.warning(f"Anomaly {kind} on {index}: {value:.1f}")
+        if self.on_event:
+            try:
+                self.on_event(kind, index, value)
+            except Exception as e:
+                logger.error(f"Error in anomaly event handler: {e}")
+
+class FleetAnomalyMonitor:
+    """
+    Anomaly detection for many robots from their raw packet streams.
+
+    Each robot gets its own AnomalyDetector and Go1State the first time one
+    of its packets arrives.
+    """
+
+    def __init__(self, on_event: Optional[Callable[[str, str, int, float], None]] = None,
+                 **options):
+        """
+        Initialize the monitor.
+
+        Args:
+            on_event: Called with (robot, kind, index, value)
+            **options: AnomalyDetector options shared by all robots
+        """
+        self.on_event = on_event
+        self.options = options
+        self.detectors: Dict[str, AnomalyDetector] = {}
+        self._states: Dict[str, Go1State] = {}
+
+    def detector(self, robot: str) -> AnomalyDetector:
+        """
+        Get (or create) the detector of a robot.
+
+        Args:
+            robot: Robot identifier
+
+        Returns:
+            The robot's detector
+        """
+        detector = self.detectors.get(robot)
+        if detector is None:
+            on_event = None
+            if self.on_event:
+                on_event = lambda kind, index, value: self.on_event(robot, kind, index, value)
+            detector = self.detectors[robot] = AnomalyDetector(on_event, **self.options)
+            self._states[robot] = get_go1_state_copy()
+        return detector
+
+    def observe_packet(self, robot: str, topic: str, payload: bytes) -> None:
+        """
+        Decode one packet of a robot and check it.
+
+        Args:
+            robot: Robot identifier
+            topic: Topic the packet arrived on
+            payload: Packet in the robot's wire format
+        """
+        detector = self.detector(robot)
+        state = self._states[robot]
+        message_handler(topic, payload, state)
+        detector.observe(topic, state)
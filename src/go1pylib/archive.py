@@ -0,0 +1,581 @@
+"""
+Compressed long-term telemetry archive.
+
+Telemetry packets change little from one to the next, so instead of storing
+them as they arrived (see recording.py) the archive buffers them per topic
+and writes column blocks. Each known field (``bms.soc``, ``robot.temps``,
+...) becomes a column of integer deltas, zigzag-mapped and varint-packed,
+and timestamps are stored as deltas of deltas in microseconds. The block is
+then optionally compressed with zlib or lzma.
+
+File layout::
+
+    MAGIC
+    block*      header (_BLOCK), topic, payload
+    index       one _INDEX entry plus topic per block
+    trailer     _TRAILER: index offset, block count, INDEX_MAGIC
+
+Every block header also carries its own size, so a file whose writer died
+before the index was written is still readable by scanning the headers.
+Packets are reconstructed byte for byte, so ``read_archive`` is a drop-in
+replacement for ``recording.read_recording``.
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import BinaryIO, Dict, Iterator, List, Optional, Sequence, Tuple
+import heapq
+import logging
+import lzma
+import mmap
+import queue
+import struct
+import threading
+import time
+import zlib
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"GO1ARC1\n"
+INDEX_MAGIC = b"GO1AIDX\n"
+# topic length, record size, codec, packets, first and last time (us), payload length
+_BLOCK = struct.Struct("<HHBIqqI")
+# topic length, record size, codec, packets, first and last time (us), block offset
+_INDEX = struct.Struct("<HHBIqqQ")
+_TRAILER = struct.Struct("<QI8s")
+
+CODECS = {"none": 0, "zlib": 1, "lzma": 2}
+
+# Packet layouts of the topics the robot publishes. Field names follow Go1State.
+LAYOUTS: Dict[str, Tuple[str, np.dtype]] = {
+    "bms/state": ("bms", np.dtype([
+        ("version", "u1", (2,)),
+        ("status", "u1"),
+        ("soc", "u1"),
+        ("current", "<i4"),
+        ("cycle", "<u2"),
+        ("temps", "u1", (4,)),
+        ("cell_voltages", "<u2", (10,)),
+    ])),
+    "firmware/version": ("robot", np.dtype([
+        ("header", "u1", (8,)),
+        ("temps", "u1", (20,)),
+        ("mode", "u1"),
+        ("gait_type", "u1"),
+        ("obstacles", "u1", (4,)),
+        ("reserved", "u1", (10,)),
+    ])),
+}
+
+def record_dtype(topic: str, size: int) -> np.dtype:
+    """
+    Structured dtype used to split packets of a topic into columns.
+
+    Args:
+        topic: Packet topic
+        size: Packet size in bytes
+
+    Returns:
+        The topic's layout if the size matches, otherwise a single ``raw`` byte field
+    """
+    layout = LAYOUTS.get(topic)
+    if layout is not None and layout[1].itemsize == size:
+        return layout[1]
+    return np.dtype([("raw", "u1", (size,))])
+
+def varint_encode(values: np.ndarray) -> bytes:
+    """
+    LEB128-encode unsigned 64-bit integers.
+
+    Args:
+        values: uint64 array
+
+    Returns:
+        Encoded bytes
+    """
+    values = np.asarray(values, dtype=np.uint64)
+    lengths = np.ones(len(values), dtype=np.int64)
+    rest = values >> np.uint64(7)
+    while rest.any():
+        lengths += rest > 0
+        rest >>= np.uint64(7)
+    out = np.empty(int(lengths.sum()), dtype=np.uint8)
+    starts = np.cumsum(lengths) - lengths
+    rest = values.copy()
+    for k in range(int(lengths.max(initial=0))):
+        active = lengths > k
+        byte = (rest[active] & np.uint64(0x7F)).astype(np.uint8)
+        byte[lengths[active] > k + 1] |= 0x80
+        out[starts[active] + k] = byte
+        rest >>= np.uint64(7)
+    return out.tobytes()
+
+def varint_decode(data: bytes, count: int) -> np.ndarray:
+    """
+    Decode ``count`` LEB128 integers.
+
+    Args:
+        data: Encoded bytes
+        count: Number of values expected
+
+    Returns:
+        uint64 array
+
+    Raises:
+        ValueError: If data does not hold exactly count values
+    """
+    raw = np.frombuffer(data, dtype=np.uint8)
+    ends = np.flatnonzero(raw < 0x80)
+    if len(ends) != count or (count and ends[-1] != len(raw) - 1):
+        raise ValueError(f"Expected {count} varints, found {len(ends)}")
+    starts = np.empty(count, dtype=np.int64)
+    starts[:1] = 0
+    starts[1:] = ends[:-1] + 1
+    lengths = ends - starts + 1
+    values = np.zeros(count, dtype=np.uint64)
+    for k in range(int(lengths.max(initial=0))):
+        active = lengths > k
+        values[active] |= (raw[starts[active] + k] & 0x7F).astype(np.uint64) << np.uint64(7 * k)
+    return values
+
+def zigzag(values: np.ndarray) -> np.ndarray:
+    """Map signed int64 to uint64 so small magnitudes stay small."""
+    values = values.astype(np.int64)
+    return ((values << 1) ^ (values >> 63)).view(np.uint64)
+
+def unzigzag(values: np.ndarray) -> np.ndarray:
+    """Inverse of zigzag."""
+    values = values.view(np.uint64)
+    return (values >> np.uint64(1)).view(np.int64) ^ -(values & np.uint64(1)).view(np.int64)
+
+def _encode_column(column: np.ndarray) -> bytes:
+    """Delta, zigzag and varint encode a (values,) or (values, width) column."""
+    series = column.reshape(len(column), -1).T.astype(np.int64)
+    deltas = np.diff(series, axis=1, prepend=0)
+    return varint_encode(zigzag(deltas.ravel()))
+
+def _decode_column(data: bytes, count: int, dtype: np.dtype) -> np.ndarray:
+    """Inverse of _encode_column for ``count`` rows of a field of ``dtype``."""
+    width = int(np.prod(dtype.shape)) if dtype.shape else 1
+    deltas = unzigzag(varint_decode(data, count * width)).reshape(width, count)
+    series = np.cumsum(deltas, axis=1).T.astype(dtype.base)
+    return series.reshape((count,) + dtype.shape)
+
+@dataclass
+class BlockInfo:
+    """Index entry of one archive block."""
+    topic: str
+    record_size: int
+    codec: int
+    count: int
+    start: float  # seconds
+    end: float  # seconds
+    offset: int  # file offset of the block header
+
+@dataclass
+class Block:
+    """Decoded contents of one block."""
+    topic: str
+    timestamps: np.ndarray  # float64 seconds
+    records: np.ndarray  # structured array in the topic's layout
+
+def encode_block(topic: str, timestamps: np.ndarray, records: np.ndarray,
+                 codec: str = "zlib", level: int = 6) -> bytes:
+    """
+    Encode packets of one topic into a block.
+
+    Args:
+        topic: Packet topic
+        timestamps: Receive times in seconds
+        records: Packets as a structured array (see record_dtype)
+        codec: "none", "zlib" or "lzma"
+        level: Compression level
+
+    Returns:
+        Block header, topic and payload
+    """
+    micros = np.round(np.asarray(timestamps, dtype=np.float64) * 1e6).astype(np.int64)
+    columns = [varint_encode(zigzag(np.diff(np.diff(micros, prepend=0), prepend=0)))]
+    columns += [_encode_column(records[name]) for name in records.dtype.names]
+    payload = b"".join(struct.pack("<I", len(c)) + c for c in columns)
+    if codec == "zlib":
+        payload = zlib.compress(payload, level)
+    elif codec == "lzma":
+        payload = lzma.compress(payload, preset=level)
+    elif codec != "none":
+        raise ValueError(f"Unknown codec {codec!r}, expected one of {sorted(CODECS)}")
+    encoded = topic.encode()
+    header = _BLOCK.pack(len(encoded), records.dtype.itemsize, CODECS[codec], len(records),
+                         int(micros[0]), int(micros[-1]), len(payload))
+    return header + encoded + payload
+
+def decode_block(data: bytes, offset: int = 0, fields: Optional[Sequence[str]] = None) -> Block:
+    """
+    Decode a block.
+
+    Args:
+        data: Buffer holding the block
+        offset: Offset of the block header in data
+        fields: Only decode these fields (all by default); the others are left zero
+
+    Returns:
+        The decoded block
+    """
+    topic_len, record_size, codec, count, _, _, payload_len = _BLOCK.unpack_from(data, offset)
+    start = offset + _BLOCK.size
+    topic = bytes(data[start:start + topic_len]).decode()
+    payload = bytes(data[start + topic_len:start + topic_len + payload_len])
+    if codec == CODECS["zlib"]:
+        payload = zlib.decompress(payload)
+    elif codec == CODECS["lzma"]:
+        payload = lzma.decompress(payload)
+
+    columns = []
+    pos = 0
+    while pos < len(payload):
+        (length,) = struct.unpack_from("<I", payload, pos)
+        columns.append(payload[pos + 4:pos + 4 + length])
+        pos += 4 + length
+    micros = np.cumsum(np.cumsum(unzigzag(varint_decode(columns[0], count))))
+    dtype = record_dtype(topic, record_size)
+    records = np.empty(count, dtype=dtype) if fields is None else np.zeros(count, dtype=dtype)
+    for name, column in zip(dtype.names, columns[1:]):
+        if fields is None or name in fields:
+            records[name] = _decode_column(column, count, dtype.fields[name][0])
+    return Block(topic, micros / 1e6, records)
+
+class TelemetryArchive:
+    """
+    Writes raw packets into a compressed block archive.
+
+    Packets are buffered per topic and written as a block once
+    ``block_size`` packets have arrived or the oldest buffered packet is
+    ``flush_interval`` seconds old, so a crash loses at most one block.
+
+    ``write`` only appends to a buffer; encoding, compression and file I/O
+    of finished buffers happen on a writer thread, so archiving from a raw
+    listener does not stall the network thread. Blocks are written in the
+    order their buffers finished.
+    """
+
+    def __init__(self, path: str, block_size: int = 1024, flush_interval: float = 60.0,
+                 codec: str = "zlib", level: int = 6):
+        """
+        Create (or truncate) an archive.
+
+        Args:
+            path: File to write
+            block_size: Packets per topic in a full block
+            flush_interval: Seconds after which a partial block is written
+            codec: Block compression, "none", "zlib" or "lzma"
+            level: Compression level
+        """
+        if codec not in CODECS:
+            raise ValueError(f"Unknown codec {codec!r}, expected one of {sorted(CODECS)}")
+        self.path = path
+        self.block_size = block_size
+        self.flush_interval = flush_interval
+        self.codec = codec
+        self.level = level
+        self.packets = 0
+        self.index: List[BlockInfo] = []
+        self._buffers: Dict[Tuple[str, int], Tuple[List[float], List[bytes]]] = {}
+        self._oldest: Optional[float] = None
+        self._file: Optional[BinaryIO] = open(path, "wb")
+        self._file.write(MAGIC)
+        self._lock = threading.Lock()
+        # Finished buffers waiting for the writer thread; None stops it
+        self._pending: "queue.Queue[Optional[Tuple[Tuple[str, int], List[float], List[bytes]]]]" = queue.Queue()
+        self._writer = threading.Thread(target=self._write_blocks, name="go1-archive-writer", daemon=True)
+        self._writer.start()
+
+    def write(self, topic: str, payload: bytes, timestamp: Optional[float] = None) -> None:
+        """
+        Add one packet.
+
+        Args:
+            topic: Topic the packet arrived on
+            payload: Undecoded packet bytes
+            timestamp: Receive time (defaults to time.time())
+        """
+        if timestamp is None:
+            timestamp = time.time()
+        with self._lock:
+            if self._file is None:
+                return
+            key = (topic, len(payload))
+            timestamps, payloads = self._buffers.setdefault(key, ([], []))
+            timestamps.append(timestamp)
+            payloads.append(payload)
+            self.packets += 1
+            if self._oldest is None:
+                self._oldest = timestamp
+            if len(payloads) >= self.block_size:
+                self._finish(key)
+            elif timestamp - self._oldest >= self.flush_interval:
+                self._finish_all()
+
+    def observe_raw(self, topic: str, payload: bytes) -> None:
+        """Raw listener: archive every packet as it arrives."""
+        self.write(topic, payload)
+
+    def flush(self) -> None:
+        """Write all buffered packets as (partial) blocks and wait until they are on disk."""
+        with self._lock:
+            if self._file is None:
+                return
+            self._finish_all()
+        self._pending.join()
+
+    def _finish_all(self) -> None:
+        """Hand every buffer to the writer thread. Caller holds the lock."""
+        for key in list(self._buffers):
+            self._finish(key)
+
+    def _finish(self, key: Tuple[str, int]) -> None:
+        """Hand the buffer of one topic to the writer thread. Caller holds the lock."""
+        timestamps, payloads = self._buffers.pop(key)
+        self._pending.put((key, timestamps, payloads))
+        self._oldest = min((buffered[0] for buffered, _ in self._buffers.values()), default=None)
+
+    def _write_blocks(self) -> None:
+        """Writer thread: encode and append finished buffers until stopped."""
+        while True:
+            item = self._pending.get()
+            try:
+                if item is None:
+                    return
+                self._write_block(*item)
+            except Exception as e:
+                logger.error(f"Error writing archive block to {self.path}: {e}")
+            finally:
+                self._pending.task_done()
+
+    def _write_block(self, key: Tuple[str, int], timestamps: List[float], payloads: List[bytes]) -> None:
+        """Encode and append one block. Runs on the writer thread."""
+        topic, size = key
+        records = np.frombuffer(b"".join(payloads), dtype=record_dtype(topic, size))
+        offset = self._file.tell()
+        self._file.write(encode_block(topic, timestamps, records, self.codec, self.level))
+        self._file.flush()
+        self.index.append(BlockInfo(topic, size, CODECS[self.codec], len(records),
+                                    timestamps[0], timestamps[-1], offset))
+
+    def close(self) -> None:
+        """Write remaining packets and the block index, then close the file."""
+        with self._lock:
+            if self._file is None:
+                return
+            self._finish_all()
+            self._pending.put(None)
+            self._writer.join()
+            index_offset = self._file.tell()
+            for info in self.index:
+                encoded = info.topic.encode()
+                self._file.write(_INDEX.pack(len(encoded), info.record_size, info.codec, info.count,
+                                             round(info.start * 1e6), round(info.end * 1e6),
+                                             info.offset))
+                self._file.write(encoded)
+            self._file.write(_TRAILER.pack(index_offset, len(self.index), INDEX_MAGIC))
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> 'TelemetryArchive':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+class ArchiveReader:
+    """
+    Random access to the blocks of an archive.
+
+    The file is memory-mapped and only the blocks that are read get
+    decompressed; the most recently decoded blocks are cached.
+    """
+
+    def __init__(self, path: str, cache_blocks: int = 8):
+        """
+        Open an archive.
+
+        Args:
+            path: File written by TelemetryArchive
+            cache_blocks: Number of decoded blocks to keep
+        """
+        self.path = path
+        self.cache_blocks = cache_blocks
+        self._cache: 'OrderedDict[Tuple[int, Optional[Tuple[str, ...]]], Block]' = OrderedDict()
+        with open(path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path} is not a Go1 telemetry archive")
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.index = self._read_index()
+        self._topic_index: Dict[str, Tuple[np.ndarray, np.ndarray, List[BlockInfo]]] = {}
+
+    def _read_index(self) -> List[BlockInfo]:
+        """Load the index from the trailer, or rebuild it from the block headers."""
+        data = self._map
+        if len(data) >= len(MAGIC) + _TRAILER.size:
+            index_offset, count, magic = _TRAILER.unpack_from(data, len(data) - _TRAILER.size)
+            if magic == INDEX_MAGIC:
+                index = []
+                pos = index_offset
+                for _ in range(count):
+                    topic_len, size, codec, packets, start, end, offset = _INDEX.unpack_from(data, pos)
+                    pos += _INDEX.size
+                    topic = bytes(data[pos:pos + topic_len]).decode()
+                    pos += topic_len
+                    index.append(BlockInfo(topic, size, codec, packets, start / 1e6, end / 1e6, offset))
+                return index
+
+        logger.warning(f"{self.path} has no block index, scanning blocks")
+        index = []
+        pos = len(MAGIC)
+        while pos + _BLOCK.size <= len(data):
+            topic_len, size, codec, packets, start, end, payload_len = _BLOCK.unpack_from(data, pos)
+            block_end = pos + _BLOCK.size + topic_len + payload_len
+            if block_end > len(data):
+                logger.warning(f"Truncated block at the end of {self.path}")
+                break
+            topic = bytes(data[pos + _BLOCK.size:pos + _BLOCK.size + topic_len]).decode()
+            index.append(BlockInfo(topic, size, codec, packets, start / 1e6, end / 1e6, pos))
+            pos = block_end
+        return index
+
+    @property
+    def topics(self) -> List[str]:
+        """Topics present in the archive."""
+        return sorted({info.topic for info in self.index})
+
+    @property
+    def time_range(self) -> Tuple[float, float]:
+        """First and last packet time in the archive, (inf, -inf) if empty."""
+        if not self.index:
+            return float("inf"), float("-inf")
+        return min(info.start for info in self.index), max(info.end for info in self.index)
+
+    def blocks_between(self, topic: str, start: Optional[float] = None,
+                       end: Optional[float] = None) -> List[BlockInfo]:
+        """
+        Find the blocks of a topic that overlap a time range.
+
+        Uses a per-topic index of block start times and running maximum end
+        times, so the lookup is a pair of binary searches.
+
+        Args:
+            topic: Packet topic
+            start: Range start in seconds (open if None)
+            end: Range end in seconds (open if None)
+
+        Returns:
+            Matching index entries in time order
+        """
+        entry = self._topic_index.get(topic)
+        if entry is None:
+            infos = sorted((info for info in self.index if info.topic == topic),
+                           key=lambda info: info.start)
+            starts = np.array([info.start for info in infos])
+            ends = np.maximum.accumulate(np.array([info.end for info in infos])) if infos else starts
+            entry = self._topic_index[topic] = (starts, ends, infos)
+        starts, ends, infos = entry
+        lo = 0 if start is None else int(np.searchsorted(ends, start, side="left"))
+        hi = len(infos) if end is None else int(np.searchsorted(starts, end, side="right"))
+        return [info for info in infos[lo:hi]
+                if (start is None or info.end >= start) and (end is None or info.start <= end)]
+
+    def read_block(self, info: BlockInfo, fields: Optional[Sequence[str]] = None) -> Block:
+        """
+        Decode one block.
+
+        Args:
+            info: Entry from ``index``
+            fields: Only decode these fields (all by default)
+
+        Returns:
+            The decoded block
+        """
+        key = (info.offset, None if fields is None else tuple(fields))
+        block = self._cache.get(key)
+        if block is not None:
+            self._cache.move_to_end(key)
+            return block
+        block = decode_block(self._map, info.offset, fields)
+        self._cache[key] = block
+        if len(self._cache) > self.cache_blocks:
+            self._cache.popitem(last=False)
+        return block
+
+    def _block_packets(self, infos: List[BlockInfo]) -> Iterator[Tuple[float, str, bytes]]:
+        """Yield the packets of consecutive blocks of one (topic, record size) key."""
+        for info in infos:
+            block = self.read_block(info)
+            records = block.records.tobytes()
+            size = block.records.dtype.itemsize
+            for i, timestamp in enumerate(block.timestamps.tolist()):
+                yield timestamp, info.topic, records[i * size:(i + 1) * size]
+
+    def packets(self) -> Iterator[Tuple[float, str, bytes]]:
+        """
+        Iterate over all packets in time order.
+
+        Returns:
+            Iterator of (timestamp, topic, payload)
+        """
+        # Blocks are buffered per (topic, record size), so only blocks of one
+        # key are disjoint in time; keys can interleave in flush order
+        keys: Dict[Tuple[str, int], List[BlockInfo]] = {}
+        for info in self.index:
+            keys.setdefault((info.topic, info.record_size), []).append(info)
+        streams = [self._block_packets(sorted(infos, key=lambda info: info.start))
+                   for _, infos in sorted(keys.items())]
+        return heapq.merge(*streams, key=lambda packet: packet[0])
+
+    def close(self) -> None:
+        """Release the memory map."""
+        self._cache.clear()
+        self._map.close()
+
+    def __enter__(self) -> 'ArchiveReader':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+def is_archive(path: str) -> bool:
+    """Whether path starts like a telemetry archive."""
+    with open(path, "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+def archive_recording(recording: str, path: str, **options) -> int:
+    """
+    Convert a raw recording (recording.py) into an archive.
+
+    Args:
+        recording: Recording to read
+        path: Archive to write
+        **options: TelemetryArchive options (block_size, codec, level)
+
+    Returns:
+        Number of packets converted
+    """
+    from .recording import read_recording
+
+    with TelemetryArchive(path, flush_interval=float("inf"), **options) as archive:
+        for timestamp, topic, payload in read_recording(recording):
+            archive.write(topic, payload, timestamp)
+    return archive.packets
+
+def read_archive(path: str) -> Iterator[Tuple[float, str, bytes]]:
+    """
+    Iterate over the packets of an archive in time order.
+
+    Args:
+        path: File written by TelemetryArchive
+
+    Returns:
+        Iterator of (timestamp, topic, payload)
+    """
+    with ArchiveReader(path) as reader:
+        yield from reader.packets()
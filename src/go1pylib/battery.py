@@ -0,0 +1,143 @@
+"""
+Incremental battery analytics for the Go1 robot.
+
+Every statistic is updated with constant work per BMS packet using
+time-aware exponential smoothing, so no packet history is kept and the
+remaining-runtime estimate is always current.
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+import math
+import time
+
+from .mqtt.state import BMSState, Go1State
+from .mqtt.topics import BmsSubTopic
+
+@dataclass
+class BatteryStats:
+    """Live battery statistics."""
+    cell_spread: float = 0.0  # Latest max - min cell voltage (mV)
+    cell_spread_avg: float = 0.0  # Smoothed cell spread (mV)
+    cell_spread_peak: float = 0.0  # Largest cell spread seen (mV)
+    current_avg: float = 0.0  # Smoothed current draw (mA)
+    soc: float = 0.0  # Smoothed state of charge (%)
+    soc_rate: float = 0.0  # State of charge change (% per second, negative when discharging)
+    runtime_remaining: Optional[float] = None  # Seconds until empty at the current rate
+    temp_max: float = 0.0  # Hottest battery sensor (C)
+    temp_trend: float = 0.0  # Hottest sensor change (C per second)
+    samples: int = 0
+
+class _Trend:
+    """Holt double exponential smoothing over irregular time steps."""
+
+    def __init__(self, level_tau: float, trend_tau: float):
+        """
+        Initialize an empty trend.
+
+        Args:
+            level_tau: Time constant (s) of the level smoothing
+            trend_tau: Time constant (s) of the slope smoothing
+        """
+        self.level_tau = level_tau
+        self.trend_tau = trend_tau
+        self.level: Optional[float] = None
+        self.trend = 0.0
+
+    def update(self, value: float, dt: float) -> None:
+        """
+        Fold in one sample; the first sample only sets the level.
+
+        Args:
+            value: New sample
+            dt: Seconds since the previous sample; samples with dt <= 0 are ignored
+        """
+        if self.level is None:
+            self.level = value
+            return
+        if dt <= 0:
+            return
+        predicted = self.level + self.trend * dt
+        alpha = 1.0 - math.exp(-dt / self.level_tau)
+        beta = 1.0 - math.exp(-dt / self.trend_tau)
+        level = predicted + alpha * (value - predicted)
+        self.trend += beta * ((level - self.level) / dt - self.trend)
+        self.level = level
+
+class BatteryAnalytics:
+    """Tracks battery health and runtime from BMS packets in O(1) per packet."""
+
+    def __init__(self, current_tau: float = 10.0, spread_tau: float = 60.0,
+                 soc_tau: float = 30.0, soc_trend_tau: float = 300.0,
+                 temp_tau: float = 30.0, temp_trend_tau: float = 120.0):
+        """
+        Initialize the analytics.
+
+        Args:
+            current_tau: Time constant (s) for the current draw average
+            spread_tau: Time constant (s) for the cell spread average
+            soc_tau: Time constant (s) for the smoothed state of charge
+            soc_trend_tau: Time constant (s) for the discharge rate
+            temp_tau: Time constant (s) for the smoothed temperature
+            temp_trend_tau: Time constant (s) for the temperature trend
+        """
+        self.current_tau = current_tau
+        self.spread_tau = spread_tau
+        self.stats = BatteryStats()
+        self._soc = _Trend(soc_tau, soc_trend_tau)
+        self._temp = _Trend(temp_tau, temp_trend_tau)
+        self._last_time: Optional[float] = None
+
+    def update(self, bms: BMSState, timestamp: Optional[float] = None) -> BatteryStats:
+        """
+        Fold one BMS packet into the statistics.
+
+        Args:
+            bms: Freshly decoded BMS state
+            timestamp: Packet time in seconds (defaults to the monotonic clock)
+
+        Returns:
+            The updated live statistics
+        """
+        if timestamp is None:
+            timestamp = time.monotonic()
+        stats = self.stats
+        first = self._last_time is None
+        dt = 0.0 if first else max(timestamp - self._last_time, 0.0)
+        self._last_time = timestamp
+
+        cells = bms.cell_voltages
+        spread = float(max(cells) - min(cells)) if cells else 0.0
+        temp = float(max(bms.temps)) if bms.temps else 0.0
+
+        stats.cell_spread = spread
+        stats.cell_spread_peak = max(stats.cell_spread_peak, spread)
+        stats.temp_max = temp
+        if first:
+            stats.cell_spread_avg = spread
+            stats.current_avg = float(bms.current)
+        else:
+            stats.cell_spread_avg += (1.0 - math.exp(-dt / self.spread_tau)) * (spread - stats.cell_spread_avg)
+            stats.current_avg += (1.0 - math.exp(-dt / self.current_tau)) * (bms.current - stats.current_avg)
+
+        self._soc.update(float(bms.soc), dt)
+        self._temp.update(temp, dt)
+        stats.soc = self._soc.level
+        stats.soc_rate = self._soc.trend
+        stats.temp_trend = self._temp.trend
+        stats.runtime_remaining = (
+            stats.soc / -stats.soc_rate if stats.soc_rate < -1e-6 else None
+        )
+        stats.samples += 1
+        return stats
+
+    def observe(self, topic: str, state: Go1State) -> None:
+        """
+        State listener: update on BMS packets.
+
+        Args:
+            topic: Topic the packet arrived on
+            state: Go1 state after decoding it
+        """
+        if topic == BmsSubTopic.BMS_STATE:
+            self.update(state.bms)
@@ -0,0 +1,160 @@
+"""
+Lightweight event bus for the Go1 robot.
+
+Handlers are kept per event name as a pre-sorted tuple, so emitting is one
+dictionary lookup plus a loop over the handlers. Each handler runs in its
+own try/except, so one failing handler never stops the others or the MQTT
+network thread that usually does the emitting.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Handlers with higher priority run first
+SAFETY_PRIORITY = 100
+DEFAULT_PRIORITY = 0
+
+@dataclass
+class HandlerStats:
+    """Call counts and timing for one registered handler."""
+    calls: int = 0
+    errors: int = 0
+    total_time: float = 0.0  # Seconds, only accumulated while timing is enabled
+    max_time: float = 0.0
+
+@dataclass(frozen=True)
+class _Registration:
+    handler: Callable[..., Any]
+    priority: int
+    batch: bool
+    stats: HandlerStats
+
+class EventBus:
+    """
+    Dispatches named events to prioritised handlers.
+
+    Usage::
+
+        bus.on('go1_state_change', handler)
+        bus.on('go1_state_change', stop_if_unsafe, priority=SAFETY_PRIORITY)
+        bus.emit('go1_state_change', state)
+    """
+
+    def __init__(self):
+        """Initialize a bus with no handlers."""
+        self._handlers: Dict[str, Tuple[_Registration, ...]] = {}
+        self._handlers_lock = threading.Lock()
+        self.timing = False  # Record per-handler run time in HandlerStats
+
+    def on(self, event: str, handler: Optional[Callable[..., Any]] = None,
+           priority: int = DEFAULT_PRIORITY, batch: bool = False) -> Callable[..., Any]:
+        """
+        Register a handler; can also be used as a decorator.
+
+        Args:
+            event: Event name
+            handler: Called with the emitted arguments
+            priority: Handlers with higher priority run first; equal
+                priorities run in registration order
+            batch: Receive emit_batch updates as one list of argument tuples
+                instead of one call per update
+
+        Returns:
+            The handler, unchanged
+        """
+        if handler is None:
+            return lambda fn: self.on(event, fn, priority, batch)
+
+        registration = _Registration(handler, priority, batch, HandlerStats())
+        with self._handlers_lock:
+            handlers = self._handlers.get(event, ()) + (registration,)
+            # sorted() is stable, so registration order breaks priority ties
+            self._handlers[event] = tuple(sorted(handlers, key=lambda r: -r.priority))
+        return handler
+
+    def off(self, event: str, handler: Callable[..., Any]) -> None:
+        """
+        Unregister a handler.
+
+        Args:
+            event: Event name
+            handler: Handler passed to on()
+        """
+        with self._handlers_lock:
+            handlers = tuple(r for r in self._handlers.get(event, ()) if r.handler != handler)
+            if handlers:
+                self._handlers[event] = handlers
+            else:
+                self._handlers.pop(event, None)
+
+    def has_handlers(self, event: str) -> bool:
+        """Whether any handler is registered for an event."""
+        return event in self._handlers
+
+    def emit(self, event: str, *args: Any) -> None:
+        """
+        Call every handler of an event with the given arguments.
+
+        Args:
+            event: Event name
+            *args: Arguments passed to each handler
+        """
+        handlers = self._handlers.get(event)
+        if not handlers:
+            return
+        for registration in handlers:
+            self._call(event, registration, args)
+
+    def emit_batch(self, event: str, updates: Sequence[Tuple[Any, ...]]) -> None:
+        """
+        Dispatch several updates of one event at once.
+
+        Batch handlers get the whole list in a single call; other handlers
+        are called once per update, in order.
+
+        Args:
+            event: Event name
+            updates: Argument tuples, one per update
+        """
+        handlers = self._handlers.get(event)
+        if not handlers or not updates:
+            return
+        for registration in handlers:
+            if registration.batch:
+                self._call(event, registration, (list(updates),))
+            else:
+                for args in updates:
+                    self._call(event, registration, args)
+
+    def _call(self, event: str, registration: _Registration, args: Tuple[Any, ...]) -> None:
+        """Run one handler with error isolation and optional timing."""
+        stats = registration.stats
+        stats.calls += 1
+        start = time.perf_counter() if self.timing else 0.0
+        try:
+            registration.handler(*args)
+        except Exception as e:
+            stats.errors += 1
+            logger.error(f"Error in {event} handler {registration.handler}: {e}")
+        if self.timing:
+            elapsed = time.perf_counter() - start
+            stats.total_time += elapsed
+            if elapsed > stats.max_time:
+                stats.max_time = elapsed
+
+    def handler_stats(self, event: str) -> Dict[Callable[..., Any], HandlerStats]:
+        """
+        Get call counts and timing for the handlers of an event.
+
+        Args:
+            event: Event name
+
+        Returns:
+            Stats by handler, in dispatch order
+        """
+        return {r.handler: r.stats for r in self._handlers.get(event, ())}
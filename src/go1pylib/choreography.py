@@ -0,0 +1,206 @@
+"""
+Choreography scripts for the Go1 robot.
+
+A script is a list of timed steps (motion, pose, LED, mode and wait) written
+as JSON or YAML. It is validated and clamped once, then compiled into a
+single time-indexed array of stick frames plus LED/mode events that can be
+replayed on the fixed-rate movement publisher or saved and reused.
+
+Example::
+
+    {
+        "rate_hz": 10,
+        "steps": [
+            {"type": "mode", "mode": "stand"},
+            {"type": "wait", "duration_ms": 1000},
+            {"type": "led", "r": 0, "g": 255, "b": 0},
+            {"type": "pose", "lean": 0.5, "duration_ms": 1000},
+            {"type": "move", "forward": 0.3, "duration_ms": 2000, "max_accel": 2.0}
+        ]
+    }
+"""
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple, Union
+import json
+import logging
+
+import numpy as np
+
+from .go1 import Go1Mode
+from .profiles import move_profile
+
+logger = logging.getLogger(__name__)
+
+# Stick axes set by each motion step type, in frame order
+_STEP_AXES: Dict[str, Tuple[str, str, str, str]] = {
+    "move": ("left_right", "turn", "look", "forward"),
+    "pose": ("lean", "twist", "look", "extend"),
+}
+
+@dataclass(frozen=True)
+class RoutineEvent:
+    """A non-stick command fired when playback reaches ``tick``."""
+    tick: int
+    kind: str  # "led" or "mode"
+    value: Any
+
+@dataclass(frozen=True)
+class CompiledRoutine:
+    """
+    Precomputed stick frames and events of a choreography script.
+
+    Compiled routines are cached and shared, so they are immutable: the
+    frame array is read-only and the events are a tuple.
+    """
+    frames: np.ndarray
+    rate_hz: float
+    events: Tuple[RoutineEvent, ...] = ()
+
+    @property
+    def duration_s(self) -> float:
+        """Playback length in seconds."""
+        return len(self.frames) / self.rate_hz
+
+    def events_by_tick(self) -> Dict[int, List[RoutineEvent]]:
+        """Group events by the tick they fire on."""
+        grouped: Dict[int, List[RoutineEvent]] = {}
+        for event in self.events:
+            grouped.setdefault(event.tick, []).append(event)
+        return grouped
+
+    def save(self, path: str) -> None:
+        """
+        Save the compiled routine to a ``.npz`` file.
+
+        Args:
+            path: Destination file path
+        """
+        events = [
+            {"tick": e.tick, "kind": e.kind,
+             "value": e.value.value if isinstance(e.value, Go1Mode) else list(e.value)}
+            for e in self.events
+        ]
+        np.savez(path, frames=self.frames, rate_hz=self.rate_hz,
+                 events=json.dumps(events))
+
+    @classmethod
+    def load(cls, path: str) -> 'CompiledRoutine':
+        """
+        Load a routine saved with ``save``.
+
+        Args:
+            path: Path of the ``.npz`` file
+
+        Returns:
+            CompiledRoutine instance
+        """
+        with np.load(path) as data:
+            frames = data["frames"].astype(np.float32)
+            rate_hz = float(data["rate_hz"])
+            raw_events = json.loads(str(data["events"]))
+        frames.setflags(write=False)
+        events = tuple(
+            RoutineEvent(e["tick"], e["kind"],
+                         Go1Mode(e["value"]) if e["kind"] == "mode" else tuple(e["value"]))
+            for e in raw_events
+        )
+        return cls(frames, rate_hz, events)
+
+def load_script(path: str) -> Dict[str, Any]:
+    """
+    Read a choreography script from a JSON or YAML file.
+
+    Args:
+        path: Script path; ``.yaml``/``.yml`` files require PyYAML
+
+    Returns:
+        The parsed script
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        if path.endswith((".yaml", ".yml")):
+            try:
+                import yaml
+            except ImportError as e:
+                raise ImportError("PyYAML is required to load YAML scripts") from e
+            return yaml.safe_load(f)
+        return json.load(f)
+
+def compile_script(script: Union[Dict[str, Any], str],
+                   rate_hz: Optional[float] = None) -> CompiledRoutine:
+    """
+    Validate a choreography script and compile it into a routine.
+
+    Identical scripts are compiled only once; the cached routine's frame
+    array is read-only so it can be shared safely.
+
+    Args:
+        script: Parsed script or its JSON text
+        rate_hz: Publish rate to compile for; overrides the script's ``rate_hz``
+
+    Returns:
+        The compiled routine
+
+    Raises:
+        ValueError: If a step is malformed
+    """
+    if isinstance(script, str):
+        script = json.loads(script)
+    if rate_hz is None:
+        rate_hz = float(script.get("rate_hz", 10.0))
+    return _compile_cached(json.dumps(script.get("steps", []), sort_keys=True), rate_hz)
+
+@lru_cache(maxsize=32)
+def _compile_cached(steps_json: str, rate_hz: float) -> CompiledRoutine:
+    """Compile canonicalized steps. Cached by their JSON text."""
+    if rate_hz <= 0:
+        raise ValueError("rate_hz must be positive")
+
+    segments: List[np.ndarray] = []
+    events: List[RoutineEvent] = []
+    elapsed_ms = 0.0
+    tick = 0
+
+    for index, step in enumerate(json.loads(steps_json)):
+        try:
+            if not isinstance(step, dict):
+                raise TypeError(f"expected an object, got {type(step).__name__}")
+            kind = step.get("type")
+            if kind == "led":
+                color = tuple(int(max(0, min(255, step.get(c, 0)))) for c in "rgb")
+                events.append(RoutineEvent(tick, "led", color))
+            elif kind == "mode":
+                events.append(RoutineEvent(tick, "mode", Go1Mode(step["mode"])))
+            elif kind in _STEP_AXES or kind == "wait":
+                duration_ms = float(step["duration_ms"])
+                if duration_ms < 0:
+                    raise ValueError("duration_ms must not be negative")
+                # Tick boundaries come from cumulative time so rounding never drifts
+                elapsed_ms += duration_ms
+                end_tick = int(round(elapsed_ms / 1000.0 * rate_hz))
+                segments.append(_segment(step, kind, end_tick - tick, rate_hz))
+                tick = end_tick
+            else:
+                raise ValueError(f"unknown step type {kind!r}")
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"Invalid choreography step {index}: {e}") from e
+
+    frames = (np.concatenate(segments) if segments
+              else np.zeros((0, 4), dtype=np.float32))
+    frames.setflags(write=False)
+    logger.debug(f"Compiled routine: {len(frames)} ticks, {len(events)} events")
+    return CompiledRoutine(frames, rate_hz, tuple(events))
+
+def _segment(step: Dict[str, Any], kind: str, ticks: int, rate_hz: float) -> np.ndarray:
+    """Build the stick frames of one timed step."""
+    if kind == "wait" or ticks <= 0:
+        return np.zeros((max(ticks, 0), 4), dtype=np.float32)
+
+    setpoint = tuple(
+        float(max(-1.0, min(1.0, step.get(axis, 0.0)))) for axis in _STEP_AXES[kind]
+    )
+    if "max_accel" in step:
+        return move_profile(setpoint, ticks / rate_hz, float(step["max_accel"]),
+                            step.get("max_jerk"), rate_hz)[:ticks]
+    return np.repeat(np.array([setpoint], dtype=np.float32), ticks, axis=0)
@@ -0,0 +1,390 @@
+"""
+Command line interface for go1pylib.
+
+Subcommands:
+    monitor  live one-line view of battery, motors, mode and message rates
+    record   capture raw telemetry packets to a file or compressed archive
+    replay   decode a recording or archive at its original (or scaled) speed
+    bench    decode, publish and round-trip benchmarks against a robot or
+             the local stand-in
+    drive    stream stick setpoints read from stdin
+    query    print one field from a directory of archives as CSV
+
+Heavy modules are imported inside the subcommands so ``--help`` and argument
+errors come back immediately.
+"""
+
+from typing import Dict, List, Optional
+import argparse
+import asyncio
+import logging
+import sys
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+def _make_transport(args: argparse.Namespace) -> Optional['Transport']:
+    """Create the transport selected with --transport, or None for the default MQTT transport."""
+    from . import transport
+
+    name = getattr(args, "transport", "mqtt")
+    if name == "loopback":
+        return transport.LoopbackTransport()
+    if name == "udp":
+        return transport.UDPHighCmdTransport(args.udp_host, args.udp_port, local_port=0)
+    return None
+
+def _make_robot(args: argparse.Namespace, connect: bool = True) -> 'Go1':
+    """Create a Go1 for the common connection options, connected or simulated."""
+    from .go1 import Go1
+
+    transport = _make_transport(args)
+    robot = Go1({"host": args.host, "port": args.port}, transport=transport)
+    if getattr(args, "sim", False):
+        from . import sim
+        sim.attach(robot)
+    elif connect:
+        robot.init()
+    return robot
+
+class _RateCounter:
+    """Counts packets per topic for the status line."""
+
+    def __init__(self):
+        self.counts: Dict[str, int] = {}
+        self._last: Dict[str, int] = {}
+        self._last_time = time.monotonic()
+
+    def observe_raw(self, topic: str, payload: bytes) -> None:
+        self.counts[topic] = self.counts.get(topic, 0) + 1
+
+    def rates(self) -> Dict[str, float]:
+        """Packets per second per topic since the previous call."""
+        now = time.monotonic()
+        elapsed = max(now - self._last_time, 1e-9)
+        rates = {t: (c - self._last.get(t, 0)) / elapsed for t, c in self.counts.items()}
+        self._last = dict(self.counts)
+        self._last_time = now
+        return rates
+
+def _format_duration(seconds: Optional[float]) -> str:
+    if seconds is None:
+        return "--"
+    minutes = int(seconds // 60)
+    return f"{minutes // 60}h{minutes % 60:02d}m"
+
+def format_status(robot: 'Go1', rates: Dict[str, float]) -> str:
+    """
+    Render the robot's current state as one status line.
+
+    Args:
+        robot: Go1 controller whose state to show
+        rates: Inbound packets per second by topic
+
+    Returns:
+        Status line without a trailing newline
+    """
+    state = robot.mqtt.go1_state
+    bms = state.bms
+    temps = state.robot.temps
+    hottest = max(range(len(temps)), key=temps.__getitem__) if temps else 0
+    rx = " ".join(f"{topic.split('/')[0]} {rate:.1f}/s" for topic, rate in sorted(rates.items()))
+    mqtt = robot.mqtt
+    rtt = f"{mqtt.rtt * 1000:.1f}ms" if mqtt.rtt is not None else "--"
+    return (
+        f"SoC {bms.soc:3.0f}% {bms.voltage / 1000:5.2f}V {bms.current / 1000:+6.2f}A "
+        f"runtime {_format_duration(robot.battery.stats.runtime_remaining)} | "
+        f"motors max {temps[hottest] if temps else 0}C (#{hottest}) | "
+        f"mode {state.robot.mode} {state.robot.state} | "
+        f"rx {rx or '--'} | stick {mqtt.publish_rate:.0f}Hz rtt {rtt} drops {mqtt.stale_stick_drops}"
+    )
+
+def _print_status(line: str, out) -> None:
+    out.write("\r\x1b[2K" + line)
+    out.flush()
+
+async def _watch(robot: 'Go1', counter: _RateCounter, interval: float,
+                 duration: Optional[float], out) -> None:
+    """Refresh the status line every interval until the duration is over."""
+    end = None if duration is None else time.monotonic() + duration
+    while end is None or time.monotonic() < end:
+        await asyncio.sleep(interval)
+        _print_status(format_status(robot, counter.rates()), out)
+
+def cmd_monitor(args: argparse.Namespace) -> int:
+    """Show a live status line with state and per-topic packet rates."""
+    robot = _make_robot(args)
+    counter = _RateCounter()
+    robot.mqtt.add_raw_listener(counter.observe_raw)
+    try:
+        asyncio.run(_watch(robot, counter, args.interval, args.duration, sys.stdout))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        sys.stdout.write("\n")
+        robot.mqtt.disconnect()
+    return 0
+
+def cmd_record(args: argparse.Namespace) -> int:
+    """Record raw telemetry to a packet log or column archive."""
+    from .archive import TelemetryArchive
+    from .recording import TelemetryRecorder
+
+    robot = _make_robot(args)
+    counter = _RateCounter()
+    if args.format == "archive":
+        writer = TelemetryArchive(args.file, codec=args.codec)
+    else:
+        writer = TelemetryRecorder(args.file)
+    with writer as recorder:
+        robot.mqtt.add_raw_listener(recorder.observe_raw)
+        robot.mqtt.add_raw_listener(counter.observe_raw)
+        try:
+            asyncio.run(_watch(robot, counter, args.interval, args.duration, sys.stderr))
+        except KeyboardInterrupt:
+            pass
+        finally:
+            robot.mqtt.disconnect()
+    sys.stderr.write(f"\nRecorded {recorder.packets} packets to {args.file}\n")
+    return 0
+
+def cmd_replay(args: argparse.Namespace) -> int:
+    """Decode a recording or archive, paced like the original by default."""
+    from .archive import is_archive, read_archive
+    from .recording import read_recording
+    from . import sim
+
+    robot = _make_robot(args, connect=False)
+    counter = _RateCounter()
+    robot.mqtt.add_raw_listener(counter.observe_raw)
+    packets = 0
+    first: Optional[float] = None
+    start = time.monotonic()
+    next_status = start
+    try:
+        reader = read_archive if is_archive(args.file) else read_recording
+        for timestamp, topic, payload in reader(args.file):
+            if first is None:
+                first = timestamp
+            if args.speed > 0:
+                delay = (timestamp - first) / args.speed - (time.monotonic() - start)
+                if delay > 0:
+                    time.sleep(delay)
+            sim.feed(robot, topic, payload)
+            packets += 1
+            if not args.quiet and time.monotonic() >= next_status:
+                _print_status(format_status(robot, counter.rates()), sys.stdout)
+                next_status += args.interval
+    except KeyboardInterrupt:
+        pass
+    if not args.quiet:
+        _print_status(format_status(robot, counter.rates()), sys.stdout)
+        sys.stdout.write("\n")
+    print(f"Replayed {packets} packets in {time.monotonic() - start:.2f}s")
+    return 0
+
+def _percentile(samples: List[float], q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+def cmd_bench(args: argparse.Namespace) -> int:
+    """Measure decode and publish throughput and broker round trips."""
+    import numpy as np
+    from . import sim
+    from .mqtt.rate import PROBE_TOPIC
+    from .mqtt.topics import BmsSubTopic, FirmwareSubTopic
+
+    robot = _make_robot(args)
+    results = []
+    try:
+        packets = [(BmsSubTopic.BMS_STATE, sim.bms_packet()),
+                   (FirmwareSubTopic.FIRMWARE_VERSION, sim.firmware_packet())]
+        start = time.perf_counter()
+        for i in range(args.count):
+            sim.feed(robot, *packets[i & 1])
+        results.append(("decode", f"{args.count / (time.perf_counter() - start):,.0f} packets/s"))
+
+        # Zero frames only, so benchmarking a live robot never moves it
+        frame = np.zeros(4, dtype=np.float32)
+        start = time.perf_counter()
+        for _ in range(args.count):
+            robot.mqtt._publish_stick(frame)
+        results.append(("stick publish", f"{args.count / (time.perf_counter() - start):,.0f} frames/s"))
+        results.append(("stale drops", str(robot.mqtt.stale_stick_drops)))
+
+        latencies = []
+        # Broker round trips only exist for the MQTT transport on a real broker
+        for _ in range(args.probes if robot.mqtt.client and not args.sim else 0):
+            start = time.perf_counter()
+            robot.mqtt.client.publish(PROBE_TOPIC, b"", qos=1).wait_for_publish()
+            latencies.append(time.perf_counter() - start)
+        if latencies:
+            results.append(("round trip p50", f"{_percentile(latencies, 0.5) * 1000:.3f} ms"))
+            results.append(("round trip p99", f"{_percentile(latencies, 0.99) * 1000:.3f} ms"))
+    finally:
+        robot.mqtt.disconnect()
+
+    if args.transport != "mqtt":
+        target = f"{args.transport} transport"
+    else:
+        target = "local stand-in" if args.sim else f"{args.host}:{args.port}"
+    print(f"go1pylib bench against {target}")
+    for name, value in results:
+        print(f"  {name:<16} {value}")
+    return 0
+
+def _parse_frame(line: str) -> Optional['np.ndarray']:
+    """Parse 'left_right turn look forward' (spaces or commas) into a frame."""
+    import numpy as np
+
+    try:
+        values = [float(v) for v in line.replace(",", " ").split()]
+    except ValueError:
+        return None
+    if len(values) != 4:
+        return None
+    return np.clip(np.array(values, dtype=np.float32), -1.0, 1.0)
+
+def cmd_drive(args: argparse.Namespace) -> int:
+    """Stream stick setpoints read line by line from stdin."""
+    import numpy as np
+
+    robot = _make_robot(args)
+    latest = [np.zeros(4, dtype=np.float32)]
+    finished = threading.Event()
+
+    def read_stdin() -> None:
+        # Latest line wins; the publisher samples it once per tick
+        for line in sys.stdin:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            frame = _parse_frame(line)
+            if frame is None:
+                logger.warning(f"Ignoring malformed setpoint: {line!r}")
+                continue
+            latest[0] = frame
+        finished.set()
+
+    def frames():
+        # Always send at least one frame, and end only once the frame parsed
+        # from the last line has gone out
+        while True:
+            done = finished.is_set()
+            yield latest[0]
+            if done:
+                return
+
+    async def run() -> None:
+        if args.rate:
+            robot.mqtt.publish_frequency = 1.0 / args.rate
+        threading.Thread(target=read_stdin, name="go1-drive-stdin", daemon=True).start()
+        await robot.mqtt.send_setpoint_stream(frames())
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        robot.mqtt.disconnect()
+    return 0
+
+def cmd_query(args: argparse.Namespace) -> int:
+    """Print one archived field of a robot as CSV."""
+    from .query import TelemetryStore
+
+    with TelemetryStore(args.root) as store:
+        try:
+            timestamps, values = store.query(args.robot, args.field, args.start, args.end,
+                                             args.resample, args.agg)
+        except ValueError as e:
+            logger.error(str(e))
+            return 1
+    for timestamp, value in zip(timestamps.tolist(), values.tolist()):
+        row = value if isinstance(value, list) else [value]
+        print(",".join([f"{timestamp:.6f}"] + [f"{v:g}" for v in row]))
+    return 0
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser for all subcommands."""
+    from .query import AGGREGATES
+
+    parser = argparse.ArgumentParser(prog="go1pylib", description="Go1 robot command line tools")
+    parser.add_argument("-v", "--verbose", action="store_true", help="enable debug logging")
+    connection = argparse.ArgumentParser(add_help=False)
+    connection.add_argument("--host", default="192.168.12.1", help="MQTT broker host")
+    connection.add_argument("--port", type=int, default=1883, help="MQTT broker port")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("monitor", parents=[connection], help="live state and rate view")
+    p.add_argument("--sim", action="store_true", help="monitor the local stand-in")
+    p.add_argument("--interval", type=float, default=1.0, help="refresh interval in seconds")
+    p.add_argument("--duration", type=float, help="stop after this many seconds")
+    p.set_defaults(func=cmd_monitor)
+
+    p = sub.add_parser("record", parents=[connection], help="record raw telemetry")
+    p.add_argument("file", help="recording to write")
+    p.add_argument("--format", choices=["raw", "archive"], default="raw",
+                   help="packet log, or compressed column archive for long-term storage")
+    p.add_argument("--codec", choices=["none", "zlib", "lzma"], default="zlib",
+                   help="block compression for --format archive")
+    p.add_argument("--interval", type=float, default=1.0, help="status refresh interval in seconds")
+    p.add_argument("--duration", type=float, help="stop after this many seconds")
+    p.set_defaults(func=cmd_record)
+
+    p = sub.add_parser("replay", help="decode a recording or archive")
+    p.add_argument("file", help="recording or archive to read")
+    p.add_argument("--speed", type=float, default=1.0, help="playback speed factor, 0 for as fast as possible")
+    p.add_argument("--interval", type=float, default=1.0, help="status refresh interval in seconds")
+    p.add_argument("-q", "--quiet", action="store_true", help="only print the summary")
+    p.set_defaults(func=cmd_replay, host="127.0.0.1", port=1883)
+
+    p = sub.add_parser("bench", parents=[connection], help="throughput and latency benchmarks")
+    p.add_argument("--sim", action="store_true", help="benchmark against the local stand-in")
+    p.add_argument("--count", type=int, default=10000, help="packets and frames per throughput test")
+    p.add_argument("--probes", type=int, default=100, help="QoS 1 round trips to time")
+    p.add_argument("--transport", choices=["mqtt", "loopback", "udp"], default="mqtt",
+                   help="transport to benchmark: the robot's MQTT broker, loopback "
+                        "(library overhead only) or UDP HighCmd")
+    p.add_argument("--udp-host", default="192.168.123.161", help="robot address for --transport udp")
+    p.add_argument("--udp-port", type=int, default=8082, help="robot port for --transport udp")
+    p.set_defaults(func=cmd_bench)
+
+    p = sub.add_parser("drive", parents=[connection], help="stream setpoints from stdin")
+    p.add_argument("--sim", action="store_true", help="drive the local stand-in")
+    p.add_argument("--rate", type=float, help="publish rate in Hz")
+    p.set_defaults(func=cmd_drive)
+
+    p = sub.add_parser("query", help="query archived telemetry")
+    p.add_argument("root", help="directory with one archive directory per robot")
+    p.add_argument("robot", help="robot directory name")
+    p.add_argument("field", help="field such as bms.current or robot.temps[3]")
+    p.add_argument("--start", type=float, help="start, Unix time in seconds")
+    p.add_argument("--end", type=float, help="end, Unix time in seconds")
+    p.add_argument("--resample", help="bin width such as 1s or 5min")
+    p.add_argument("--agg", default="mean", choices=AGGREGATES,
+                   help="aggregate per bin")
+    p.set_defaults(func=cmd_query, host="127.0.0.1", port=1883)
+    return parser
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Run the command line interface.
+
+    Args:
+        argv: Arguments without the program name (defaults to sys.argv[1:])
+
+    Returns:
+        Process exit code
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if getattr(args, "sim", False) and getattr(args, "transport", "mqtt") != "mqtt":
+        parser.error("--sim replaces the MQTT client and cannot be combined with --transport")
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.WARNING)
+    try:
+        return args.func(args)
+    except OSError as e:
+        logger.error(f"Could not connect to {args.host}:{args.port}: {e}")
+        return 1
@@ -0,0 +1,157 @@
+"""
+Injectable time sources for the Go1 robot.
+
+Motion timing runs on the asyncio loop's clock and the watchdog polls its
+clock object, so swapping SystemClock for VirtualClock moves all of them to
+simulated time. A VirtualClock's event loop never waits: whenever nothing is
+ready to run it jumps straight to the next scheduled timer, so a ten minute
+mission against the simulated robot (``sim.attach``) finishes in moments.
+"""
+
+from typing import Any, Awaitable, Callable, List, Optional
+import asyncio
+import heapq
+import itertools
+import selectors
+import time
+
+class Clock:
+    """Time source interface."""
+
+    virtual = False
+
+    def monotonic(self) -> float:
+        """Current time in seconds."""
+        raise NotImplementedError
+
+    def new_event_loop(self) -> asyncio.AbstractEventLoop:
+        """Create an event loop whose time() follows this clock."""
+        raise NotImplementedError
+
+    def run(self, main: Awaitable[Any]) -> Any:
+        """
+        Run a coroutine to completion on a new loop of this clock.
+
+        Args:
+            main: Coroutine to run
+
+        Returns:
+            The coroutine's result
+        """
+        loop = self.new_event_loop()
+        try:
+            asyncio.set_event_loop(loop)
+            return loop.run_until_complete(main)
+        finally:
+            try:
+                pending = asyncio.all_tasks(loop)
+                for task in pending:
+                    task.cancel()
+                if pending:
+                    loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+                loop.run_until_complete(loop.shutdown_asyncgens())
+            finally:
+                asyncio.set_event_loop(None)
+                loop.close()
+
+class SystemClock(Clock):
+    """Real monotonic time; the default everywhere."""
+
+    def monotonic(self) -> float:
+        return time.monotonic()
+
+    def new_event_loop(self) -> asyncio.AbstractEventLoop:
+        return asyncio.new_event_loop()
+
+SYSTEM_CLOCK = SystemClock()
+
+class _VirtualSelector(selectors.DefaultSelector):
+    """Selector that advances a virtual clock instead of waiting for timers."""
+
+    def __init__(self, clock: 'VirtualClock'):
+        super().__init__()
+        self._clock = clock
+
+    def select(self, timeout: Optional[float] = None):
+        if timeout is None or timeout <= 0:
+            # Nothing scheduled (or something ready): behave like a real loop
+            return super().select(timeout)
+        events = super().select(0)
+        if not events:
+            self._clock.advance(timeout)
+        return events
+
+class _VirtualEventLoop(asyncio.SelectorEventLoop):
+    """Event loop whose time() is a VirtualClock."""
+
+    def __init__(self, clock: 'VirtualClock'):
+        super().__init__(_VirtualSelector(clock))
+        self._virtual_clock = clock
+
+    def time(self) -> float:
+        return self._virtual_clock.monotonic()
+
+class VirtualClock(Clock):
+    """
+    Simulated time that only moves when advanced.
+
+    Time advances explicitly through ``advance`` or implicitly while an
+    event loop from ``new_event_loop``/``run`` has nothing to do but wait.
+    Periodic callbacks registered with ``every`` run at their exact due
+    times even when a single advance jumps over several of them.
+    """
+
+    virtual = True
+
+    def __init__(self, start: float = 0.0):
+        """
+        Initialize the clock.
+
+        Args:
+            start: Initial time in seconds
+        """
+        self._now = start
+        self._timers: List[list] = []  # [due, seq, interval, callback, active]
+        self._seq = itertools.count()
+
+    def monotonic(self) -> float:
+        return self._now
+
+    def advance(self, seconds: float) -> None:
+        """
+        Move time forward, running periodic callbacks that fall due on the way.
+
+        Args:
+            seconds: How far to advance
+        """
+        target = self._now + max(seconds, 0.0)
+        while self._timers and self._timers[0][0] <= target:
+            timer = heapq.heappop(self._timers)
+            if not timer[4]:
+                continue
+            self._now = max(self._now, timer[0])
+            timer[0] += timer[2]
+            heapq.heappush(self._timers, timer)
+            timer[3]()
+        self._now = target
+
+    def every(self, interval: float, callback: Callable[[], None]) -> Callable[[], None]:
+        """
+        Call ``callback`` every ``interval`` seconds of virtual time.
+
+        Args:
+            interval: Period in seconds
+            callback: Called without arguments
+
+        Returns:
+            Function that cancels the periodic call
+        """
+        timer = [self._now + interval, next(self._seq), interval, callback, True]
+        heapq.heappush(self._timers, timer)
+
+        def cancel() -> None:
+            timer[4] = False
+        return cancel
+
+    def new_event_loop(self) -> asyncio.AbstractEventLoop:
+        return _VirtualEventLoop(self)
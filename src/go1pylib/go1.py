@@ -1,8 +1,12 @@
 from enum import Enum
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterator, Iterable
 import asyncio
+import math
 from dataclasses import dataclass
-from events import Events
+import numpy as np
+
+from .bus import EventBus
+from .movement import MotionStatus
 
 class Go1Mode(str, Enum):
     """Available modes for the Go1 robot."""
@@ -18,28 +22,46 @@ class Go1Mode(str, Enum):
     RUN = "run"
     CLIMB = "climb"
 
-class Go1(Events):
+class Go1(EventBus):
     """
     Main class for controlling the Go1 quadruped robot.
     
     This class provides high-level control interfaces for the Go1 robot,
     including movement, pose control, LED control, and mode settings.
+    State updates and other notifications are dispatched through the
+    EventBus interface (``robot.on('go1_state_change', handler)``).
+
+    Motion methods are coroutines that finish when the move does and return
+    its final MotionStatus; cancelling the awaiting task stops the move.
+    Code that needs the MotionHandle itself can submit through
+    ``robot.mqtt.send_movement_command`` or ``send_setpoint_stream``.
     """
 
-    def __init__(self, mqtt_options: Optional[Dict[str, Any]] = None):
+    def __init__(self, mqtt_options: Optional[Dict[str, Any]] = None,
+                 transport: Optional['Transport'] = None):
         """
         Initialize a new Go1 robot controller.
 
         Args:
             mqtt_options: Optional MQTT client configuration options
+            transport: Optional transport (see go1pylib.transport) to use
+                instead of an MQTTTransport to the configured broker
         """
         super().__init__()
         # These will be imported from their respective modules once we convert them
         from .mqtt.client import Go1MQTT
         from .mqtt.state import Go1State, get_go1_state_copy
+        from .battery import BatteryAnalytics
         
+        if transport is not None:
+            mqtt_options = {**(mqtt_options or {}), "transport": transport}
         self.mqtt = Go1MQTT(self, mqtt_options)
         self.go1_state = get_go1_state_copy()
+        self._stream_hub = None
+
+        # Live battery statistics (runtime estimate, cell imbalance, ...)
+        self.battery = BatteryAnalytics()
+        self.mqtt.add_state_listener(self.battery.observe)
 
     def init(self) -> None:
         """Initialize the connection to the robot."""
@@ -55,6 +77,154 @@ class Go1(Events):
         """
         self.emit('go1_state_change', state)
 
+    async def serve_metrics(self, host: str = "127.0.0.1", port: int = 9100) -> 'MetricsServer':
+        """
+        Serve battery, thermal and link metrics over HTTP in Prometheus format.
+
+        Args:
+            host: Interface to bind to
+            port: TCP port to listen on
+
+        Returns:
+            The running MetricsServer; call ``stop()`` on it to shut it down
+        """
+        from .metrics import MetricsServer
+
+        server = MetricsServer(self.mqtt.metrics, host, port)
+        await server.start()
+        return server
+
+    async def serve_teleop(self, host: str = "0.0.0.0", port: int = 9150,
+                           protocol: str = "udp", timeout: float = 0.2,
+                           priority: int = 0) -> 'TeleopBridge':
+        """
+        Accept teleop setpoint packets and drive the robot with the latest one.
+
+        See ``teleop`` for the packet format.
+
+        Args:
+            host: Interface to bind to
+            port: Port to listen on (0 picks a free port)
+            protocol: "udp" or "tcp"
+            timeout: Seconds of silence after which zero frames are sent
+            priority: Motion priority of the teleop stream
+
+        Returns:
+            The running TeleopBridge; call ``stop()`` on it when done
+        """
+        from .teleop import TeleopBridge
+
+        bridge = TeleopBridge(self.mqtt, timeout, priority)
+        await bridge.start(host, port, protocol)
+        return bridge
+
+    def add_analytics(self, analyses: Dict[str, Any], **options: Any) -> 'AnalyticsPipeline':
+        """
+        Run telemetry analyses in worker processes.
+
+        Each result is emitted as a ``go1_analytics`` event with the
+        analysis name and its return value.
+
+        Args:
+            analyses: Picklable analysis functions by name
+            **options: Further AnalyticsPipeline options (window, batch_size, ...)
+
+        Returns:
+            The running pipeline; call ``close()`` on it when done
+        """
+        from .analytics import AnalyticsPipeline
+
+        pipeline = AnalyticsPipeline(
+            analyses,
+            on_result=lambda name, result: self.emit('go1_analytics', name, result),
+            on_close=lambda: self.mqtt.remove_state_listener(pipeline.observe),
+            **options
+        )
+        self.mqtt.add_state_listener(pipeline.observe)
+        return pipeline
+
+    def enable_thermal_protection(self, **options: Any) -> 'ThermalMonitor':
+        """
+        Monitor motor temperatures and throttle speed setpoints when hot.
+
+        Threshold and rate-of-rise crossings are emitted as ``go1_thermal``
+        events with the event kind, motor index and value.
+
+        Args:
+            **options: ThermalMonitor options (warn_temp, limit_temp, ...)
+
+        Returns:
+            The running monitor
+        """
+        from .thermal import ThermalMonitor
+
+        monitor = ThermalMonitor(
+            on_event=lambda kind, motor, value: self.emit('go1_thermal', kind, motor, value),
+            **options
+        )
+        self.mqtt.add_state_listener(monitor.observe)
+        self.mqtt.add_setpoint_filter(monitor.filter)
+        return monitor
+
+    def enable_anomaly_detection(self, **options: Any) -> 'AnomalyDetector':
+        """
+        Watch telemetry for current spikes, cell divergence, motor outliers
+        and obstacle sensor dropouts.
+
+        Anomalies are emitted as ``go1_anomaly`` events with the event kind,
+        index and value.
+
+        Args:
+            **options: AnomalyDetector options (current_z, motor_margin, ...)
+
+        Returns:
+            The running detector
+        """
+        from .anomaly import AnomalyDetector
+
+        detector = AnomalyDetector(
+            on_event=lambda kind, index, value: self.emit('go1_anomaly', kind, index, value),
+            **options
+        )
+        self.mqtt.add_state_listener(detector.observe)
+        return detector
+
+    def states(self, topics: Optional[Iterable[str]] = None, policy: str = "latest",
+               maxsize: int = 64) -> 'StateStream':
+        """
+        Stream state snapshots as an async iterator.
+
+        Usage::
+
+            async with robot.states(topics=["bms/state"], policy="buffer") as stream:
+                async for snap in stream:
+                    ...
+
+        Must be called from the coroutine's event loop; close the stream
+        (or leave the ``async with`` block) on that loop as well.
+
+        Args:
+            topics: Only yield snapshots caused by these topics (all if None)
+            policy: "latest", "buffer" or "block" (see StateStream)
+            maxsize: Queue bound for the "buffer" and "block" policies
+
+        Returns:
+            An open StateStream
+        """
+        from .stream import StateStream, StateStreamHub
+
+        if self._stream_hub is None:
+            self._stream_hub = StateStreamHub()
+            self.mqtt.add_state_listener(self._stream_hub.observe)
+        stream = StateStream(asyncio.get_running_loop(), topics, policy, maxsize)
+        self._stream_hub.add(stream)
+        return stream
+
+    @property
+    def odometry(self) -> 'Odometry':
+        """Dead-reckoning pose estimate built from published stick frames."""
+        return self.mqtt.odometry
+
     def publish_connection_status(self, connected: bool) -> None:
         """
         Publish the connection status.
@@ -64,52 +234,64 @@ class Go1(Events):
         """
         self.emit('go1_connection_status', connected)
 
-    async def go_forward(self, speed: float, duration_ms: int) -> None:
+    async def go_forward(self, speed: float, duration_ms: int) -> MotionStatus:
         """
         Move forward based on speed and time.
 
         Args:
             speed: A value from 0 to 1
             duration_ms: Length of time for movement in milliseconds
+
+        Returns:
+            Final status of the move
         """
         self.mqtt.update_speed(0, 0, 0, speed)
-        await self.mqtt.send_movement_command(duration_ms)
+        return await self.mqtt.send_movement_command(duration_ms)
 
-    async def go_backward(self, speed: float, duration_ms: int) -> None:
+    async def go_backward(self, speed: float, duration_ms: int) -> MotionStatus:
         """
         Move backward based on speed and time.
 
         Args:
             speed: A value from 0 to 1
             duration_ms: Length of time for movement in milliseconds
+
+        Returns:
+            Final status of the move
         """
         self.mqtt.update_speed(0, 0, 0, -speed)
-        await self.mqtt.send_movement_command(duration_ms)
+        return await self.mqtt.send_movement_command(duration_ms)
 
-    async def go_left(self, speed: float, duration_ms: int) -> None:
+    async def go_left(self, speed: float, duration_ms: int) -> MotionStatus:
         """
         Move left based on speed and time.
 
         Args:
             speed: A value from 0 to 1
             duration_ms: Length of time for movement in milliseconds
+
+        Returns:
+            Final status of the move
         """
         self.mqtt.update_speed(-speed, 0, 0, 0)
-        await self.mqtt.send_movement_command(duration_ms)
+        return await self.mqtt.send_movement_command(duration_ms)
 
-    async def go_right(self, speed: float, duration_ms: int) -> None:
+    async def go_right(self, speed: float, duration_ms: int) -> MotionStatus:
         """
         Move right based on speed and time.
 
         Args:
             speed: A value from 0 to 1
             duration_ms: Length of time for movement in milliseconds
+
+        Returns:
+            Final status of the move
         """
         self.mqtt.update_speed(speed, 0, 0, 0)
-        await self.mqtt.send_movement_command(duration_ms)
+        return await self.mqtt.send_movement_command(duration_ms)
 
     async def go(self, left_right_speed: float, turn_speed: float, 
-                 forward_speed: float, duration_ms: int) -> None:
+                 forward_speed: float, duration_ms: int) -> MotionStatus:
         """
         Combined movement in multiple directions.
 
@@ -118,34 +300,158 @@ class Go1(Events):
             turn_speed: A value from -1 to 1
             forward_speed: A value from -1 to 1
             duration_ms: Length of time for movement in milliseconds
+
+        Returns:
+            Final status of the move
         """
         self.mqtt.update_speed(left_right_speed, turn_speed, 0, forward_speed)
-        await self.mqtt.send_movement_command(duration_ms)
+        return await self.mqtt.send_movement_command(duration_ms)
+
+    async def go_smooth(self, left_right_speed: float, turn_speed: float,
+                        forward_speed: float, duration_ms: int,
+                        max_accel: float = 2.0, max_jerk: Optional[float] = None) -> MotionStatus:
+        """
+        Combined movement with smooth ramps up to speed and back to a stop.
+
+        The setpoint sequence is precomputed (and cached) by
+        ``profiles.move_profile``; passing ``max_jerk`` gives an S-curve
+        instead of a trapezoidal profile.
+
+        Args:
+            left_right_speed: A value from -1 to 1
+            turn_speed: A value from -1 to 1
+            forward_speed: A value from -1 to 1
+            duration_ms: Length of time for movement in milliseconds, including ramps
+            max_accel: Maximum change of any axis per second
+            max_jerk: Maximum change of that rate per second, or None
 
-    async def turn_left(self, speed: float, duration_ms: int) -> None:
+        Returns:
+            Final status of the move
+        """
+        from .profiles import move_profile
+
+        period = self.mqtt.publish_frequency
+        frames = move_profile(
+            (left_right_speed, turn_speed, 0.0, forward_speed),
+            duration_ms / 1000.0, max_accel, max_jerk, 1.0 / period
+        )
+        # Keep the rate the profile was computed for even if it adapts meanwhile
+        return await self.mqtt.send_setpoint_stream(frames, period=period)
+
+    async def go_to(self, x: float, y: float, speed: float = 0.3,
+                    tolerance: float = 0.1, timeout_ms: int = 30000) -> bool:
+        """
+        Walk to a point using the odometry estimate for closed-loop steering.
+
+        Coordinates are in meters in the odometry frame (x forward, y left
+        of the pose the estimate was last reset to).
+
+        Args:
+            x: Target x position in meters
+            y: Target y position in meters
+            speed: Maximum forward speed, a value from 0 to 1
+            tolerance: Distance in meters at which the target counts as reached
+            timeout_ms: Give up after this many milliseconds
+
+        Returns:
+            Whether the target was reached within the timeout
+        """
+        reached = []
+        ticks = int(timeout_ms / 1000.0 / self.mqtt.publish_frequency)
+        await self.mqtt.send_setpoint_stream(
+            self._go_to_frames(x, y, speed, tolerance, ticks, reached)
+        )
+        return bool(reached)
+
+    def _go_to_frames(self, x: float, y: float, speed: float, tolerance: float,
+                      ticks: int, reached: list) -> Iterator[np.ndarray]:
+        """Yield one steering frame per tick until the target is reached."""
+        for _ in range(ticks):
+            px, py, theta = self.odometry.pose
+            dx, dy = x - px, y - py
+            if math.hypot(dx, dy) <= tolerance:
+                reached.append(True)
+                break
+            error = math.remainder(math.atan2(dy, dx) - theta, math.tau)
+            # Turn on the spot when badly misaligned, otherwise blend in forward speed
+            turn = -max(-1.0, min(1.0, 1.5 * error))
+            forward = speed * max(0.0, math.cos(error))
+            yield np.array([0.0, turn, 0.0, forward], dtype=np.float32)
+        yield np.zeros(4, dtype=np.float32)
+
+    async def play_routine(self, routine: 'CompiledRoutine') -> MotionStatus:
+        """
+        Replay a compiled choreography routine at its compiled rate.
+
+        LED and mode events fire on the tick they were scheduled for, just
+        before that tick's stick frame is published. A mode command that is
+        not sent (not connected, or over the mode command rate limit) fails
+        the routine, since the steps after it assume the new mode.
+
+        Args:
+            routine: Routine produced by ``choreography.compile_script``
+
+        Returns:
+            Final status of the routine
+        """
+        return await self.mqtt.send_setpoint_stream(
+            self._routine_frames(routine), period=1.0 / routine.rate_hz
+        )
+
+    def _routine_frames(self, routine: 'CompiledRoutine') -> Iterator[np.ndarray]:
+        """Yield routine frames, firing each tick's events first."""
+        events = routine.events_by_tick()
+        for tick, frame in enumerate(routine.frames):
+            for event in events.get(tick, ()):
+                self._fire_routine_event(event)
+            yield frame
+        # Events scheduled after the last timed step
+        for tick in sorted(t for t in events if t >= len(routine.frames)):
+            for event in events[tick]:
+                self._fire_routine_event(event)
+
+    def _fire_routine_event(self, event: 'RoutineEvent') -> None:
+        """
+        Send a routine LED or mode event.
+
+        Raises:
+            RuntimeError: If a mode command was not sent
+        """
+        if event.kind == "led":
+            self.set_led_color(*event.value)
+        elif event.kind == "mode" and not self.set_mode(event.value):
+            raise RuntimeError(f"Mode command {event.value.value} at tick {event.tick} was not sent")
+
+    async def turn_left(self, speed: float, duration_ms: int) -> MotionStatus:
         """
         Rotate left based on speed and time.
 
         Args:
             speed: A value from 0 to 1
             duration_ms: Length of time for movement in milliseconds
+
+        Returns:
+            Final status of the move
         """
         self.mqtt.update_speed(0, -speed, 0, 0)
-        await self.mqtt.send_movement_command(duration_ms)
+        return await self.mqtt.send_movement_command(duration_ms)
 
-    async def turn_right(self, speed: float, duration_ms: int) -> None:
+    async def turn_right(self, speed: float, duration_ms: int) -> MotionStatus:
         """
         Rotate right based on speed and time.
 
         Args:
             speed: A value from 0 to 1
             duration_ms: Length of time for movement in milliseconds
+
+        Returns:
+            Final status of the move
         """
         self.mqtt.update_speed(0, speed, 0, 0)
-        await self.mqtt.send_movement_command(duration_ms)
+        return await self.mqtt.send_movement_command(duration_ms)
 
     async def pose(self, lean: float, twist: float, look: float, 
-                  extend: float, duration_ms: int) -> None:
+                   extend: float, duration_ms: int) -> MotionStatus:
         """
         Raw pose method for accessing all axes together. Requires stand mode.
 
@@ -155,102 +461,143 @@ class Go1(Events):
             look: Look up/down amount (-1 to 1)
             extend: Extend/squat amount (-1 to 1)
             duration_ms: Length of time for movement in milliseconds
+
+        Returns:
+            Final status of the move
         """
         self.mqtt.update_speed(lean, twist, look, extend)
-        await self.mqtt.send_movement_command(duration_ms)
+        return await self.mqtt.send_movement_command(duration_ms)
 
-    async def extend_up(self, speed: float, duration_ms: int) -> None:
+    async def extend_up(self, speed: float, duration_ms: int) -> MotionStatus:
         """
         Extend up - requires stand mode.
 
         Args:
             speed: A value from 0 to 1
             duration_ms: Length of time for movement in milliseconds
+
+        Returns:
+            Final status of the move
         """
         self.mqtt.update_speed(0, 0, 0, speed)
-        await self.mqtt.send_movement_command(duration_ms)
+        return await self.mqtt.send_movement_command(duration_ms)
 
-    async def squat_down(self, speed: float, duration_ms: int) -> None:
+    async def squat_down(self, speed: float, duration_ms: int) -> MotionStatus:
         """
         Squat down - requires stand mode.
 
         Args:
             speed: A value from 0 to 1
             duration_ms: Length of time for movement in milliseconds
+
+        Returns:
+            Final status of the move
         """
         self.mqtt.update_speed(0, 0, 0, -speed)
-        await self.mqtt.send_movement_command(duration_ms)
+        return await self.mqtt.send_movement_command(duration_ms)
 
-    async def lean_left(self, speed: float, duration_ms: int) -> None:
+    async def lean_left(self, speed: float, duration_ms: int) -> MotionStatus:
         """
         Lean body to the left - requires stand mode.
 
         Args:
             speed: A value from 0 to 1
             duration_ms: Length of time for movement in milliseconds
+
+        Returns:
+            Final status of the move
         """
         self.mqtt.update_speed(-speed, 0, 0, 0)
-        await self.mqtt.send_movement_command(duration_ms)
+        return await self.mqtt.send_movement_command(duration_ms)
 
-    async def lean_right(self, speed: float, duration_ms: int) -> None:
+    async def lean_right(self, speed: float, duration_ms: int) -> MotionStatus:
         """
         Lean body to the right - requires stand mode.
 
         Args:
             speed: A value from 0 to 1
             duration_ms: Length of time for movement in milliseconds
+
+        Returns:
+            Final status of the move
         """
         self.mqtt.update_speed(speed, 0, 0, 0)
-        await self.mqtt.send_movement_command(duration_ms)
+        return await self.mqtt.send_movement_command(duration_ms)
 
-    async def twist_left(self, speed: float, duration_ms: int) -> None:
+    async def twist_left(self, speed: float, duration_ms: int) -> MotionStatus:
         """
         Twist body to the left - requires stand mode.
 
         Args:
             speed: A value from 0 to 1
             duration_ms: Length of time for movement in milliseconds
+
+        Returns:
+            Final status of the move
         """
         self.mqtt.update_speed(0, -speed, 0, 0)
-        await self.mqtt.send_movement_command(duration_ms)
+        return await self.mqtt.send_movement_command(duration_ms)
 
-    async def twist_right(self, speed: float, duration_ms: int) -> None:
+    async def twist_right(self, speed: float, duration_ms: int) -> MotionStatus:
         """
         Twist body to the right - requires stand mode.
 
         Args:
             speed: A value from 0 to 1
             duration_ms: Length of time for movement in milliseconds
+
+        Returns:
+            Final status of the move
         """
         self.mqtt.update_speed(0, speed, 0, 0)
-        await self.mqtt.send_movement_command(duration_ms)
+        return await self.mqtt.send_movement_command(duration_ms)
 
-    async def look_down(self, speed: float, duration_ms: int) -> None:
+    async def look_down(self, speed: float, duration_ms: int) -> MotionStatus:
         """
         Look down - requires stand mode.
 
         Args:
             speed: A value from 0 to 1
             duration_ms: Length of time for movement in milliseconds
+
+        Returns:
+            Final status of the move
         """
         self.mqtt.update_speed(0, 0, speed, 0)
-        await self.mqtt.send_movement_command(duration_ms)
+        return await self.mqtt.send_movement_command(duration_ms)
 
-    async def look_up(self, speed: float, duration_ms: int) -> None:
+    async def look_up(self, speed: float, duration_ms: int) -> MotionStatus:
         """
         Look up - requires stand mode.
 
         Args:
             speed: A value from 0 to 1
             duration_ms: Length of time for movement in milliseconds
+
+        Returns:
+            Final status of the move
         """
         self.mqtt.update_speed(0, 0, -speed, 0)
-        await self.mqtt.send_movement_command(duration_ms)
+        return await self.mqtt.send_movement_command(duration_ms)
+
+    async def reset_body(self) -> MotionStatus:
+        """
+        Helper function to clear out previous queued movements.
 
-    async def reset_body(self) -> None:
-        """Helper function to clear out previous queued movements."""
+        Returns:
+            Final status of the move
+        """
         self.mqtt.update_speed(0, 0, 0, 0)
-        await self.mqtt.send_movement_command(1000)
+        return await self.mqtt.send_movement_command(1000)
+
+    def stop(self) -> bool:
+        """
+        Cancel the running motion command; a zero frame goes out on the next tick.
+
+        Returns:
+            False if no motion command was running
+        """
+        return self.mqtt.motion.cancel_active()
 
     async def wait(self, duration_ms: int) -> None:
         """
@@ -272,11 +619,15 @@ class Go1(Events):
         """
         self.mqtt.send_led_command(r, g, b)
 
-    def set_mode(self, mode: Go1Mode) -> None:
+    def set_mode(self, mode: Go1Mode) -> bool:
         """
         Set Go1's operation mode.
 
         Args:
             mode: The mode to set the robot to
+
+        Returns:
+            True if the command was sent (False if not connected or over
+            the mode command rate limit)
         """
-        self.mqtt.send_mode_command(mode)
\ No newline at end of file
+        return self.mqtt.send_mode_command(mode)
\ No newline at end of file
@@ -0,0 +1,320 @@
+"""
+Prometheus-style metrics for the Go1 robot.
+
+Metrics are rendered into per-section text buffers. Telemetry sections are
+rendered when a decoded packet changes them; counters that move on every
+message or stick publish are only updated in place and their sections are
+re-rendered when a scrape finds them out of date.
+"""
+
+from typing import Dict, List, Optional, Set, Tuple
+import asyncio
+import bisect
+import logging
+import threading
+import time
+
+from .mqtt.state import Go1State
+from .mqtt.topics import BmsSubTopic, FirmwareSubTopic
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (seconds) of the publish latency histogram buckets
+LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0
+)
+
+class Go1Metrics:
+    """
+    Collector for battery, thermal and link statistics.
+
+    Each group of metrics lives in its own pre-rendered section which is
+    re-rendered only after that group is updated: telemetry sections at
+    once, counter sections on the next ``render``.
+    """
+
+    def __init__(self, prefix: str = "go1", rate_smoothing: float = 0.2):
+        """
+        Initialize the metrics collector.
+
+        Args:
+            prefix: Prefix prepended to every metric name
+            rate_smoothing: EWMA factor used for per-topic message rates
+        """
+        self.prefix = prefix
+        self.rate_smoothing = rate_smoothing
+        self._lock = threading.Lock()
+
+        # Section order is fixed up front so rendering never races a resize
+        self._sections: Dict[str, bytes] = {
+            "bms": b"",
+            "robot": b"",
+            "messages": b"",
+            "publish": b"",
+            "connection": b"",
+            "link": b"",
+        }
+
+        # Link statistics
+        self._message_counts: Dict[str, int] = {}
+        self._message_intervals: Dict[str, float] = {}
+        self._message_last: Dict[str, float] = {}
+        self._latency_buckets: Dict[str, List[int]] = {}
+        self._latency_sum: Dict[str, float] = {}
+        self._latency_count: Dict[str, int] = {}
+        self.connects = 0
+        self.reconnects = 0
+        self.stale_drops = 0
+        # Counter sections updated since they were last rendered
+        self._outdated: Set[str] = {"connection"}
+
+    def observe_message(self, topic: str, now: Optional[float] = None) -> None:
+        """
+        Record an inbound message for per-topic counters and rates.
+
+        Args:
+            topic: Topic the message was received on
+            now: Receive time in seconds (defaults to the monotonic clock)
+        """
+        if now is None:
+            now = time.monotonic()
+        with self._lock:
+            self._message_counts[topic] = self._message_counts.get(topic, 0) + 1
+            last = self._message_last.get(topic)
+            if last is not None and now > last:
+                interval = now - last
+                previous = self._message_intervals.get(topic)
+                if previous is None:
+                    self._message_intervals[topic] = interval
+                else:
+                    self._message_intervals[topic] = (
+                        previous + self.rate_smoothing * (interval - previous)
+                    )
+            self._message_last[topic] = now
+            self._outdated.add("messages")
+
+    def observe_state(self, topic: str, state: Go1State) -> None:
+        """
+        Refresh the section that the decoded message on ``topic`` touched.
+
+        Args:
+            topic: Topic the message was received on
+            state: Go1 state after decoding the message
+        """
+        if topic == BmsSubTopic.BMS_STATE:
+            self._render_bms(state)
+        elif topic == FirmwareSubTopic.FIRMWARE_VERSION:
+            self._render_robot(state)
+
+    def observe_publish(self, topic: str, seconds: float) -> None:
+        """
+        Record the latency of an outbound publish.
+
+        Args:
+            topic: Topic that was published to
+            seconds: Time from publish call until paho reported it sent
+        """
+        with self._lock:
+            buckets = self._latency_buckets.get(topic)
+            if buckets is None:
+                buckets = self._latency_buckets[topic] = [0] * len(LATENCY_BUCKETS)
+                self._latency_sum[topic] = 0.0
+                self._latency_count[topic] = 0
+            i = bisect.bisect_left(LATENCY_BUCKETS, seconds)
+            if i < len(buckets):
+                buckets[i] += 1
+            self._latency_sum[topic] += seconds
+            self._latency_count[topic] += 1
+            self._outdated.add("publish")
+
+    def observe_connect(self) -> None:
+        """Record a successful (re)connection to the broker."""
+        with self._lock:
+            self.connects += 1
+            if self.connects > 1:
+                self.reconnects += 1
+            self._outdated.add("connection")
+
+    def observe_stale_drop(self) -> None:
+        """Record a stick frame replaced by a newer one before it was sent."""
+        with self._lock:
+            self.stale_drops += 1
+            self._outdated.add("connection")
+
+    def observe_link(self, rtt: Optional[float], publish_rate: float) -> None:
+        """
+        Record the current broker RTT estimate and stick publish rate.
+
+        Args:
+            rtt: Smoothed round-trip time in seconds, if measured yet
+            publish_rate: Stick publish rate in Hz
+        """
+        p = self.prefix
+        lines = [
+            f"# TYPE {p}_stick_publish_rate_hertz gauge",
+            f"{p}_stick_publish_rate_hertz {publish_rate:.3f}",
+        ]
+        if rtt is not None:
+            lines.append(f"# TYPE {p}_broker_rtt_seconds gauge")
+            lines.append(f"{p}_broker_rtt_seconds {rtt:.6f}")
+        self._sections["link"] = ("\n".join(lines) + "\n").encode()
+
+    def render(self) -> bytes:
+        """
+        Get the full metrics exposition.
+
+        Returns:
+            Prometheus text-format payload
+        """
+        with self._lock:
+            if "messages" in self._outdated:
+                self._render_messages()
+            if "publish" in self._outdated:
+                self._render_publish()
+            if "connection" in self._outdated:
+                self._render_connection()
+            self._outdated.clear()
+            return b"".join(self._sections.values())
+
+    def _render_bms(self, state: Go1State) -> None:
+        """Render the battery section."""
+        p = self.prefix
+        bms = state.bms
+        lines = [
+            f"# TYPE {p}_bms_soc_percent gauge",
+            f"{p}_bms_soc_percent {bms.soc}",
+            f"# TYPE {p}_bms_current_milliamps gauge",
+            f"{p}_bms_current_milliamps {bms.current}",
+            f"# TYPE {p}_bms_voltage_millivolts gauge",
+            f"{p}_bms_voltage_millivolts {bms.voltage}",
+            f"# TYPE {p}_bms_cell_voltage_millivolts gauge",
+        ]
+        lines.extend(
+            f'{p}_bms_cell_voltage_millivolts{{cell="{i}"}} {v}'
+            for i, v in enumerate(bms.cell_voltages)
+        )
+        lines.append(f"# TYPE {p}_bms_temperature_celsius gauge")
+        lines.extend(
+            f'{p}_bms_temperature_celsius{{sensor="{i}"}} {t}'
+            for i, t in enumerate(bms.temps)
+        )
+        self._sections["bms"] = ("\n".join(lines) + "\n").encode()
+
+    def _render_robot(self, state: Go1State) -> None:
+        """Render the motor temperature section."""
+        p = self.prefix
+        lines = [f"# TYPE {p}_motor_temperature_celsius gauge"]
+        lines.extend(
+            f'{p}_motor_temperature_celsius{{motor="{i}"}} {t}'
+            for i, t in enumerate(state.robot.temps)
+        )
+        self._sections["robot"] = ("\n".join(lines) + "\n").encode()
+
+    def _render_messages(self) -> None:
+        """Render per-topic message counters and rates. Caller holds the lock."""
+        p = self.prefix
+        lines = [f"# TYPE {p}_messages_received_total counter"]
+        lines.extend(
+            f'{p}_messages_received_total{{topic="{topic}"}} {count}'
+            for topic, count in self._message_counts.items()
+        )
+        lines.append(f"# TYPE {p}_message_rate_hertz gauge")
+        lines.extend(
+            f'{p}_message_rate_hertz{{topic="{topic}"}} {1.0 / interval:.3f}'
+            for topic, interval in self._message_intervals.items()
+        )
+        self._sections["messages"] = ("\n".join(lines) + "\n").encode()
+
+    def _render_publish(self) -> None:
+        """Render publish latency histograms. Caller holds the lock."""
+        p = self.prefix
+        name = f"{p}_publish_latency_seconds"
+        lines = [f"# TYPE {name} histogram"]
+        for topic, buckets in self._latency_buckets.items():
+            cumulative = 0
+            for bound, count in zip(LATENCY_BUCKETS, buckets):
+                cumulative += count
+                lines.append(f'{name}_bucket{{topic="{topic}",le="{bound}"}} {cumulative}')
+            total = self._latency_count[topic]
+            lines.append(f'{name}_bucket{{topic="{topic}",le="+Inf"}} {total}')
+            lines.append(f'{name}_sum{{topic="{topic}"}} {self._latency_sum[topic]:.6f}')
+            lines.append(f'{name}_count{{topic="{topic}"}} {total}')
+        self._sections["publish"] = ("\n".join(lines) + "\n").encode()
+
+    def _render_connection(self) -> None:
+        """Render connection and backpressure counters. Caller holds the lock."""
+        p = self.prefix
+        lines = [
+            f"# TYPE {p}_connects_total counter",
+            f"{p}_connects_total {self.connects}",
+            f"# TYPE {p}_reconnects_total counter",
+            f"{p}_reconnects_total {self.reconnects}",
+            f"# TYPE {p}_stale_stick_frames_dropped_total counter",
+            f"{p}_stale_stick_frames_dropped_total {self.stale_drops}",
+        ]
+        self._sections["connection"] = ("\n".join(lines) + "\n").encode()
+
+class MetricsServer:
+    """Minimal asyncio HTTP server exposing a Go1Metrics collector."""
+
+    CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+    def __init__(self, metrics: Go1Metrics, host: str = "127.0.0.1", port: int = 9100):
+        """
+        Initialize the metrics server.
+
+        Args:
+            metrics: Collector whose buffers are served
+            host: Interface to bind to
+            port: TCP port to listen on (0 picks a free port)
+        """
+        self.metrics = metrics
+        self.host = host
+        self.port = port
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> None:
+        """Start listening for scrapes."""
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        logger.info(f"Metrics endpoint listening on http://{self.host}:{self.port}/metrics")
+
+    async def stop(self) -> None:
+        """Stop the server and close the listening socket."""
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve a single HTTP request."""
+        try:
+            request_line = await asyncio.wait_for(reader.readline(), timeout=5.0)
+            # Drain headers; the body of a scrape request is always empty
+            while True:
+                line = await asyncio.wait_for(reader.readline(), timeout=5.0)
+                if line in (b"\r\n", b"\n", b""):
+                    break
+
+            parts = request_line.split()
+            path = parts[1].split(b"?")[0] if len(parts) > 1 else b""
+            if path in (b"/", b"/metrics"):
+                status, body = b"200 OK", self.metrics.render()
+            else:
+                status, body = b"404 Not Found", b"not found\n"
+
+            writer.write(
+                b"HTTP/1.1 " + status + b"\r\n"
+                b"Content-Type: " + self.CONTENT_TYPE.encode() + b"\r\n"
+                b"Content-Length: " + str(len(body)).encode() + b"\r\n"
+                b"Connection: close\r\n\r\n" + body
+            )
+            await writer.drain()
+        except (asyncio.TimeoutError, ConnectionError) as e:
+            logger.debug(f"Metrics request aborted: {e}")
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
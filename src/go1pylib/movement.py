@@ -0,0 +1,289 @@
+"""
+Command ownership for Go1 motion.
+
+Every motion call submits a command to the robot's single MovementPublisher
+and gets a MotionHandle back. Only the publisher's loop ever publishes stick
+frames, so concurrent behaviours cannot interleave setpoints or double the
+publish rate; a newer command either preempts the active one or is rejected,
+depending on priority and policy.
+
+Cancelling or replacing a command wakes the loop immediately, so the change
+reaches the robot on the very next tick rather than after the current
+period; whenever motion ends without a successor the loop publishes a final
+zero frame.
+"""
+
+from enum import Enum
+from typing import Any, Iterable, Iterator, Optional
+import asyncio
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+POLICIES = ("preempt", "reject")
+
+class MotionStatus(str, Enum):
+    """Lifecycle states of a motion command."""
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    PREEMPTED = "preempted"
+    REJECTED = "rejected"
+    CANCELLED = "cancelled"
+    FAILED = "failed"
+
+class MotionHandle:
+    """
+    Handle for one submitted motion command.
+
+    Await the handle to wait until the command has finished; the result is
+    the final MotionStatus. Cancelling the task that awaits the handle also
+    cancels the command.
+    """
+
+    def __init__(self, frames: Iterable[np.ndarray], period: Optional[float] = None,
+                 priority: int = 0, loop: Optional[asyncio.AbstractEventLoop] = None,
+                 publisher: Optional['MovementPublisher'] = None):
+        """
+        Initialize the handle.
+
+        Args:
+            frames: Stick frames to publish, one per tick
+            period: Seconds between frames (None follows the client's publish rate)
+            priority: Commands with higher priority preempt lower ones
+            loop: Event loop the command runs on
+            publisher: Publisher to notify when the command is cancelled
+        """
+        self.period = period
+        self.priority = priority
+        self.status = MotionStatus.PENDING
+        self.ticks = 0
+        self._frames: Iterator[np.ndarray] = iter(frames)
+        self._loop = loop or asyncio.get_running_loop()
+        self._future: asyncio.Future = self._loop.create_future()
+        self._future.add_done_callback(self._on_future_done)
+        self._publisher = publisher
+
+    @property
+    def done(self) -> bool:
+        """Whether the command has finished, for whatever reason."""
+        return self._future.done()
+
+    def _finish(self, status: MotionStatus) -> None:
+        """Record the final status and wake everyone awaiting the handle."""
+        if self._future.done():
+            return
+        self.status = status
+        self._future.set_result(status)
+
+    def cancel(self) -> bool:
+        """
+        Stop the command; the robot gets a zero frame on the next tick.
+
+        Returns:
+            False if the command had already finished
+        """
+        if self.done:
+            return False
+        self._finish(MotionStatus.CANCELLED)
+        return True
+
+    def _on_future_done(self, future: asyncio.Future) -> None:
+        """Treat cancellation of an awaiting task as cancelling the command."""
+        if future.cancelled():
+            self.status = MotionStatus.CANCELLED
+        if self._publisher and self._publisher.active is self:
+            self._publisher._wakeup()
+
+    def __await__(self):
+        return self._future.__await__()
+
+    def __repr__(self) -> str:
+        return f"MotionHandle(status={self.status.value}, priority={self.priority}, ticks={self.ticks})"
+
+def hold_frames(frame: np.ndarray, duration_s: float,
+                loop: asyncio.AbstractEventLoop) -> Iterator[np.ndarray]:
+    """
+    Yield the same frame until ``duration_s`` has passed since the first tick.
+
+    Args:
+        frame: Stick frame to hold
+        duration_s: How long to hold it
+        loop: Event loop whose clock times the move
+
+    Returns:
+        Iterator of frames
+    """
+    end = loop.time() + duration_s
+    yield frame
+    while loop.time() < end:
+        yield frame
+
+class MovementPublisher:
+    """The single stick publisher loop of one robot."""
+
+    def __init__(self, mqtt: Any, policy: str = "preempt"):
+        """
+        Initialize the publisher.
+
+        Args:
+            mqtt: Go1MQTT client whose stick topic this publisher owns
+            policy: What a new command of equal priority does to an active
+                one: "preempt" replaces it, "reject" leaves it running
+        """
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown policy {policy!r}, expected one of {POLICIES}")
+        self.mqtt = mqtt
+        self.policy = policy
+        self.active: Optional[MotionHandle] = None
+        self._task: Optional[asyncio.Task] = None
+        self._wake: Optional[asyncio.Future] = None
+        self._moving = False
+
+    def submit(self, frames: Iterable[np.ndarray], period: Optional[float] = None,
+               priority: int = 0, policy: Optional[str] = None) -> MotionHandle:
+        """
+        Submit a command; must be called from the event loop.
+
+        Args:
+            frames: Stick frames to publish, one per tick
+            period: Seconds between frames (None follows the client's publish rate)
+            priority: Higher priorities always preempt, lower ones are rejected
+            policy: Override the publisher policy for equal priorities
+
+        Returns:
+            Handle of the submitted command
+        """
+        loop = asyncio.get_running_loop()
+        handle = MotionHandle(frames, period, priority, loop, self)
+        if not self.mqtt.ready:
+            logger.error("MQTT client not connected")
+            handle._finish(MotionStatus.FAILED)
+            return handle
+
+        current = self.active
+        if current is not None and not current.done:
+            policy = policy or self.policy
+            if priority < current.priority or (priority == current.priority and policy == "reject"):
+                logger.info(f"Motion command rejected, {current} keeps control")
+                handle._finish(MotionStatus.REJECTED)
+                return handle
+            logger.debug(f"Motion command preempts {current}")
+            current._finish(MotionStatus.PREEMPTED)
+
+        self.active = handle
+        self._ensure_running(loop)
+        self._wakeup()
+        return handle
+
+    def cancel_active(self) -> bool:
+        """
+        Cancel whatever command is running.
+
+        Returns:
+            False if no command was running
+        """
+        return self.active.cancel() if self.active else False
+
+    def _wakeup(self) -> None:
+        """End the loop's current wait so it acts on the next tick right away."""
+        if self._wake and not self._wake.done():
+            self._wake.set_result(True)
+
+    async def _wait(self, loop: asyncio.AbstractEventLoop,
+                    deadline: Optional[float] = None) -> bool:
+        """
+        Sleep until the deadline (or indefinitely) unless woken up.
+
+        Returns:
+            True if woken up before the deadline
+        """
+        waiter = loop.create_future()
+        self._wake = waiter
+        timer = None
+        if deadline is not None:
+            timer = loop.call_at(deadline, lambda: waiter.done() or waiter.set_result(False))
+        try:
+            return await waiter
+        finally:
+            if timer:
+                timer.cancel()
+            self._wake = None
+
+    def _ensure_running(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Start the publisher loop, or restart it on a new event loop."""
+        if self._task and not self._task.done() and self._task.get_loop() is loop:
+            return
+        if self._task and not self._task.done():
+            self._task.cancel()
+        self._wake = None
+        self._moving = False
+        self._task = loop.create_task(self._run())
+
+    async def _run(self) -> None:
+        """Publish one frame of the active command per tick."""
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time()
+        while True:
+            handle = self.active
+            if handle is None or handle.done:
+                if self.active is handle:
+                    self.active = None
+                if self._moving:
+                    # Motion ended and nothing took over
+                    self._moving = False
+                    self._publish_zero()
+                await self._wait(loop)
+                next_tick = loop.time()
+                continue
+
+            if not self.mqtt.connected:
+                logger.error("Lost connection during movement")
+                handle._finish(MotionStatus.FAILED)
+                continue
+            try:
+                frame = next(handle._frames)
+            except StopIteration:
+                handle._finish(MotionStatus.COMPLETED)
+                continue
+            except Exception as e:
+                logger.error(f"Error producing setpoint: {e}")
+                handle._finish(MotionStatus.FAILED)
+                continue
+
+            handle.status = MotionStatus.RUNNING
+            try:
+                self.mqtt._publish_stick(frame)
+            except Exception as e:
+                logger.error(f"Error sending movement command: {e}")
+            handle.ticks += 1
+            self._moving = True
+
+            next_tick += handle.period or self.mqtt.publish_frequency
+            if await self._wait(loop, next_tick):
+                # Cancelled or replaced: act now instead of at the old deadline
+                next_tick = loop.time()
+
+    def _publish_zero(self) -> None:
+        """Send the final zero frame after motion ends."""
+        if not self.mqtt.connected:
+            return
+        try:
+            self.mqtt._publish_stick(np.zeros(4, dtype=np.float32))
+            logger.debug("Sent final zero frame")
+        except Exception as e:
+            logger.error(f"Error sending final zero frame: {e}")
+
+    def close(self) -> None:
+        """Stop the publisher loop, fail the active command and stop the robot."""
+        if self._moving:
+            self._moving = False
+            self._publish_zero()
+        if self.active:
+            self.active._finish(MotionStatus.FAILED)
+            self.active = None
+        if self._task:
+            self._task.cancel()
+            self._task = None
@@ -1,14 +1,27 @@
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Callable, Iterable
 import numpy as np
 import paho.mqtt.client as mqtt
 import asyncio
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 import logging
+import threading
 import time
 
 from .state import Go1State, get_go1_state_copy
 from .handler import message_handler
+from .topics import FirmwareSubTopic
+from .rate import AdaptiveRateController
+from .limits import DEFAULT_PUBLISH_LIMITS, PublishLimiter, TopicLimit
 from ..go1 import Go1Mode
+from ..metrics import Go1Metrics
+from ..watchdog import StickWatchdog
+from ..reflex import ObstacleReflex
+from ..odometry import Odometry
+from ..shm import StateExporter
+from ..clock import Clock, SYSTEM_CLOCK
+from ..movement import MotionHandle, MovementPublisher, hold_frames
+from ..transport import Transport
+from .transport import MQTTTransport
 
 logger = logging.getLogger(__name__)
 
@@ -20,6 +33,18 @@ class MQTTConfig:
     client_id: str = ""  # Will be randomly generated
     keepalive: int = 60  # Increased from 5 to 60
     protocol: int = mqtt.MQTTv311  # Use v3.1.1 by default
+    watchdog_deadline: Optional[float] = 0.5  # Seconds; None disables the watchdog
+    reflex_thresholds: Optional[Dict[str, float]] = None  # e.g. {"front": 0.75}; None disables
+    adaptive_rate: bool = False  # Tune the stick publish rate from measured broker RTT
+    min_publish_period: float = 0.02  # Seconds, lower bound for adaptive rate
+    max_publish_period: float = 0.2  # Seconds, upper bound for adaptive rate
+    max_queued_messages: int = 0  # Cap on paho's QoS>0 outbound queue; 0 is unlimited
+    shm_name: Optional[str] = None  # Export decoded state to this shared-memory block
+    motion_policy: str = "preempt"  # "preempt" or "reject" a new motion command of equal priority
+    clock: Optional[Clock] = None  # Time source for watchdog and odometry; None is the system clock
+    transport: Optional[Transport] = None  # Send and receive through this; None is an MQTTTransport to host:port
+    # Token buckets by topic: LED commands merge, mode commands over the limit are rejected; None disables
+    publish_limits: Optional[Dict[str, TopicLimit]] = field(default_factory=lambda: dict(DEFAULT_PUBLISH_LIMITS))
 
 class Go1MQTT:
     """MQTT client for communicating with the Go1 robot."""
@@ -46,137 +71,372 @@ class Go1MQTT:
             for key, value in mqtt_options.items():
                 setattr(self.config, key, value)
         
-        # Initialize client
-        self.client: Optional[mqtt.Client] = None
+        # Initialize transport
+        self.transport: Transport = self.config.transport or MQTTTransport(
+            host=self.config.host,
+            port=self.config.port,
+            client_id=self.config.client_id,
+            keepalive=self.config.keepalive,
+            protocol=self.config.protocol,
+            max_queued_messages=self.config.max_queued_messages
+        )
+        self.transport.on_telemetry = self._handle_packet
+        self.transport.on_connection = self._on_connection
+        self.transport.on_published = self._on_publish
         self.floats = np.zeros(4, dtype=np.float32)
+        self._last_frame = np.zeros(4, dtype=np.float32)
         self.connected = False
+
+        # Outbound stick backpressure (latest-wins, see _send_stick)
+        self._stick_lock = threading.Lock()
+        self._stick_inflight: Optional[Any] = None
+        self._stick_pending: Optional[bytes] = None
+        self._stick_sent_at = 0.0
+        self.stale_stick_drops = 0
         
         # Topics
         self.movement_topic = "controller/stick"
         self.led_topic = "programming/code"
         self.mode_topic = "controller/action"
-        self.publish_frequency = 0.1  # 100ms in seconds
+        self.rate_controller: Optional[AdaptiveRateController] = None
+        self._publish_frequency = 0.1  # 100ms in seconds
         
         # State
         self.go1_state = get_go1_state_copy()
+        self.clock = self.config.clock or SYSTEM_CLOCK
+        self.state_listeners: List[Callable[[str, Go1State], None]] = []
+        self.raw_listeners: List[Callable[[str, bytes], None]] = []
+        self.setpoint_filters: List[Callable[[np.ndarray], np.ndarray]] = []
+        self.metrics = Go1Metrics()
+        self.watchdog: Optional[StickWatchdog] = None
+        if self.config.watchdog_deadline:
+            self.watchdog = StickWatchdog(self._send_stick,
+                                          self.config.watchdog_deadline,
+                                          clock=self.clock)
+        self.odometry = Odometry()
+        if self.config.adaptive_rate and self.transport.supports_acks:
+            self.rate_controller = AdaptiveRateController(
+                self.config.min_publish_period,
+                self.config.max_publish_period,
+                initial_period=self.publish_frequency
+            )
+        self.state_exporter: Optional[StateExporter] = None
+        if self.config.shm_name:
+            self.state_exporter = StateExporter(self.config.shm_name)
+        self.motion = MovementPublisher(self, self.config.motion_policy)
+        self.limiter: Optional[PublishLimiter] = None
+        if self.config.publish_limits:
+            self.limiter = PublishLimiter(self.config.publish_limits, clock=self.clock,
+                                          hold=self._stick_congested)
+        self.reflex: Optional[ObstacleReflex] = None
+        if self.config.reflex_thresholds:
+            self.reflex = ObstacleReflex(self._on_reflex_block,
+                                         self.config.reflex_thresholds)
 
     def connect(self) -> None:
-        """Establish connection to the MQTT broker."""
-        logger.info("Connecting to MQTT broker...")
-        
+        """
+        Open the configured transport (by default the robot's MQTT broker).
+
+        The shared-memory export closed by a previous ``disconnect`` is
+        created again first, so packets of the new connection are exported.
+        """
+        if self.config.shm_name and self.state_exporter is None:
+            self.state_exporter = StateExporter(self.config.shm_name)
+        logger.info(f"Connecting over {self.transport.name} transport...")
         try:
-            # Create client with basic options that work across versions
-            self.client = mqtt.Client(
-                client_id=self.config.client_id,
-                clean_session=True,
-                protocol=self.config.protocol
-            )
-            
-            # Set up callbacks
-            self.client.on_connect = self._on_connect
-            self.client.on_disconnect = self._on_disconnect
-            self.client.on_message = self._on_message
-            self.client.on_publish = self._on_publish
-            self.client.on_log = self._on_log
-            
-            # Connect to broker
-            self.client.connect(
-                host=self.config.host,
-                port=self.config.port,
-                keepalive=self.config.keepalive
-            )
-            self.client.loop_start()
-            
-            # Wait for connection to establish
-            timeout = 10  # seconds
-            start_time = time.time()
-            while not self.connected:
-                if time.time() - start_time > timeout:
-                    raise ConnectionError("Connection timeout")
-                time.sleep(0.1)
-            
-            logger.info("Successfully connected to MQTT broker")
-            
+            self.transport.connect()
         except Exception as e:
-            logger.error(f"Failed to connect to MQTT broker: {e}")
+            logger.error(f"Failed to connect {self.transport.name} transport: {e}")
             raise
+        logger.info(f"Connected over {self.transport.name} transport")
+        if self.watchdog:
+            self.watchdog.start()
 
-    def _on_connect(self, client, userdata, flags, rc):
-        """Callback for when the client connects to the broker."""
-        if rc == 0:
-            logger.info("Connected to MQTT broker")
-            self.connected = True
-            self.go1.publish_connection_status(True)
-        else:
-            error_messages = {
-                1: "Connection refused - incorrect protocol version",
-                2: "Connection refused - invalid client identifier",
-                3: "Connection refused - server unavailable",
-                4: "Connection refused - bad username or password",
-                5: "Connection refused - not authorised"
-            }
-            error_msg = error_messages.get(rc, f"Unknown error code: {rc}")
-            logger.error(f"Failed to connect to MQTT broker: {error_msg}")
-            self.connected = False
-
-    def _on_disconnect(self, client, userdata, rc):
-        """Callback for when the client disconnects from the broker."""
-        if rc == 0:
-            logger.info("Cleanly disconnected from MQTT broker")
+    @property
+    def client(self) -> Optional[mqtt.Client]:
+        """The paho client of the MQTT transport; None for other transports or before connect."""
+        return getattr(self.transport, "client", None)
+
+    @client.setter
+    def client(self, client: Optional[mqtt.Client]) -> None:
+        self.transport.client = client
+
+    @property
+    def ready(self) -> bool:
+        """Whether commands can be sent."""
+        return self.connected and self.transport.ready
+
+    def _on_connection(self, connected: bool) -> None:
+        """Track the transport's link state."""
+        self.connected = connected
+        if connected:
+            self.metrics.observe_connect()
         else:
-            logger.warning(f"Unexpectedly disconnected from MQTT broker with code: {rc}")
-        self.connected = False
-        self.go1.publish_connection_status(False)
+            self._reset_stick_queue()
+        self.go1.publish_connection_status(connected)
+
+    def _handle_packet(self, topic: str, payload: bytes) -> None:
+        """
+        Decode one inbound packet and notify listeners.
 
-    def _on_message(self, client, userdata, msg):
-        """Callback for when a message is received."""
+        Args:
+            topic: Topic the packet arrived on
+            payload: Undecoded packet bytes
+        """
         try:
-            logger.debug(f"Received message on topic {msg.topic}")
+            logger.debug(f"Received message on topic {topic}")
+            for listener in self.raw_listeners:
+                try:
+                    listener(topic, payload)
+                except Exception as e:
+                    logger.error(f"Error in raw listener {listener}: {e}")
             self.go1.publish_state(self.go1_state)
-            message_handler(msg.topic, msg.payload, self.go1_state)
+            message_handler(topic, payload, self.go1_state)
+            if self.reflex and topic == FirmwareSubTopic.FIRMWARE_VERSION:
+                self.reflex.evaluate(self.go1_state)
+            if self.state_exporter:
+                self.state_exporter.write(self.go1_state)
+            for listener in self.state_listeners:
+                try:
+                    listener(topic, self.go1_state)
+                except Exception as e:
+                    logger.error(f"Error in state listener {listener}: {e}")
+            self.metrics.observe_message(topic)
+            self.metrics.observe_state(topic, self.go1_state)
         except Exception as e:
             logger.error(f"Error processing message: {e}")
 
-    def _on_publish(self, client, userdata, mid):
-        """Callback for when a message is published."""
-        logger.debug(f"Published message {mid}")
-
-    def _on_log(self, client, userdata, level, buf):
-        """Callback for logging."""
-        logger.debug(f"MQTT Log: {buf}")
+    def _on_publish(self, mid: int) -> None:
+        """Called by the transport once a message it handed back in flight is sent."""
+        self._on_stick_published(mid)
+        if self.rate_controller and self.rate_controller.on_ack(mid, self.clock.monotonic()):
+            self.metrics.observe_link(self.rate_controller.rtt, self.rate_controller.rate_hz)
 
     def subscribe(self) -> None:
         """Subscribe to relevant topics."""
-        if not self.client:
-            logger.error("Cannot subscribe: Client not initialized")
-            return
-        if not self.connected:
+        if not self.ready:
             logger.error("Cannot subscribe: Client not connected")
             return
 
         try:
-            topics = [
-                ("bms/state", 0),
-                ("firmware/version", 0)
-            ]
-            self.client.subscribe(topics)
-            logger.info(f"Subscribed to topics: {[t[0] for t in topics]}")
+            topics = ["bms/state", "firmware/version"]
+            self.transport.subscribe(topics)
+            logger.info(f"Subscribed to topics: {topics}")
         except Exception as e:
             logger.error(f"Error subscribing to topics: {e}")
 
+    def add_state_listener(self, listener: Callable[[str, Go1State], None]) -> None:
+        """
+        Register a callable run on the network thread after each decoded packet.
+
+        Args:
+            listener: Called with (topic, state); must return quickly
+        """
+        self.state_listeners.append(listener)
+
+    def remove_state_listener(self, listener: Callable[[str, Go1State], None]) -> None:
+        """
+        Unregister a listener added with add_state_listener.
+
+        Args:
+            listener: The listener to remove
+        """
+        if listener in self.state_listeners:
+            self.state_listeners.remove(listener)
+
+    def add_raw_listener(self, listener: Callable[[str, bytes], None]) -> None:
+        """
+        Register a callable run on the network thread with each undecoded packet.
+
+        Args:
+            listener: Called with (topic, payload); must return quickly
+        """
+        self.raw_listeners.append(listener)
+
+    def remove_raw_listener(self, listener: Callable[[str, bytes], None]) -> None:
+        """
+        Unregister a listener added with add_raw_listener.
+
+        Args:
+            listener: The listener to remove
+        """
+        if listener in self.raw_listeners:
+            self.raw_listeners.remove(listener)
+
+    def add_setpoint_filter(self, setpoint_filter: Callable[[np.ndarray], np.ndarray]) -> None:
+        """
+        Register a filter applied to every outgoing stick frame after the reflex.
+
+        Args:
+            setpoint_filter: Takes a float32 frame and returns the frame to send;
+                must not modify its argument in place
+        """
+        self.setpoint_filters.append(setpoint_filter)
+
+    def remove_setpoint_filter(self, setpoint_filter: Callable[[np.ndarray], np.ndarray]) -> None:
+        """
+        Unregister a filter added with add_setpoint_filter.
+
+        Args:
+            setpoint_filter: The filter to remove
+        """
+        if setpoint_filter in self.setpoint_filters:
+            self.setpoint_filters.remove(setpoint_filter)
+
     def get_state(self) -> Go1State:
         """Get current robot state."""
         return self.go1_state
 
     def disconnect(self) -> None:
         """Disconnect from the MQTT broker."""
-        if self.client:
-            try:
-                self.client.loop_stop()
-                self.client.disconnect()
-                logger.info("Disconnected from MQTT broker")
-            except Exception as e:
-                logger.error(f"Error disconnecting: {e}")
+        self.motion.close()
+        if self.limiter:
+            self.limiter.close()
+        if self.watchdog:
+            self.watchdog.stop()
+        try:
+            self.transport.disconnect()
+            logger.info(f"Disconnected {self.transport.name} transport")
+        except Exception as e:
+            logger.error(f"Error disconnecting: {e}")
+        self.connected = False
+        # Only once no network thread can still decode into it
+        if self.state_exporter:
+            self.state_exporter.close()
+            self.state_exporter = None
+
+    def _publish_via(self, topic: str, send: Callable[..., None], *args: Any) -> None:
+        """
+        Send a command through the transport and record its latency under topic.
+
+        Args:
+            topic: Topic the latency is recorded under
+            send: Transport publish method
+            *args: Arguments for send
+        """
+        start = time.perf_counter()
+        send(*args)
+        self.metrics.observe_publish(topic, time.perf_counter() - start)
+
+    def _publish_stick(self, frame: np.ndarray) -> None:
+        """
+        Publish a stick frame after the reflex and setpoint filters and run the
+        per-tick bookkeeping (watchdog, RTT probes).
+
+        Args:
+            frame: float32 stick frame (left_right, turn, look, backward_forward)
+        """
+        self._last_frame = frame
+        self._send_stick(self._filter_frame(frame).tobytes())
+        if self.rate_controller:
+            now = self.clock.monotonic()
+            if self.rate_controller.should_probe(now):
+                self._send_rtt_probe(now)
+
+    def _filter_frame(self, frame: np.ndarray) -> np.ndarray:
+        """Apply the reflex and all registered setpoint filters to a frame."""
+        if self.reflex:
+            frame = self.reflex.filter(frame)
+        for setpoint_filter in self.setpoint_filters:
+            frame = setpoint_filter(frame)
+        return frame
+
+    def _send_stick(self, payload: bytes) -> None:
+        """
+        Hand a stick payload to the transport with latest-wins semantics.
+
+        At most one stick frame is in flight at a time. While it has
+        not been written to the socket, newer frames replace each other in
+        a single pending slot (counted in ``stale_stick_drops``) and the
+        newest one is sent from ``_on_publish`` as soon as the link frees
+        up. Never blocks, so it is safe from the watchdog and network
+        threads as well as the event loop.
+
+        Args:
+            payload: Encoded float32 stick frame
+        """
+        if self.watchdog:
+            self.watchdog.feed(payload)
+        with self._stick_lock:
+            if self._stick_inflight is not None and not self._stick_inflight.is_published():
+                if self._stick_pending is not None:
+                    self.stale_stick_drops += 1
+                    self.metrics.observe_stale_drop()
+                self._stick_pending = payload
+                return
+            self._stick_pending = None
+            self._write_stick(payload)
+
+    def _write_stick(self, payload: bytes) -> None:
+        """Publish a stick payload through the transport. Caller holds the stick lock."""
+        if not self.ready:
+            self._stick_inflight = None
+            return
+        self._stick_sent_at = time.perf_counter()
+        self._stick_inflight = self.transport.publish_setpoint(payload)
+        if self._stick_inflight is None:
+            # Already on the wire (or dropped); latency is known now
+            self.metrics.observe_publish(self.movement_topic,
+                                         time.perf_counter() - self._stick_sent_at)
+        self.odometry.update(np.frombuffer(payload, dtype=np.float32), self.clock.monotonic())
+
+    def _on_stick_published(self, mid: int) -> None:
+        """Record stick latency and flush the pending frame once one is written."""
+        with self._stick_lock:
+            inflight = self._stick_inflight
+            if inflight is None or inflight.mid != mid:
+                return
+            self.metrics.observe_publish(self.movement_topic,
+                                         time.perf_counter() - self._stick_sent_at)
+            self._stick_inflight = None
+            if self._stick_pending is not None:
+                payload, self._stick_pending = self._stick_pending, None
+                self._write_stick(payload)
+
+    def _stick_congested(self) -> bool:
+        """Whether a stick frame is waiting for the link (limited commands then wait too)."""
+        return self._stick_pending is not None
+
+    def _reset_stick_queue(self) -> None:
+        """Forget in-flight and pending stick frames; the transport drops them on disconnect."""
+        with self._stick_lock:
+            if self._stick_pending is not None:
+                self.stale_stick_drops += 1
+                self.metrics.observe_stale_drop()
+            self._stick_inflight = None
+            self._stick_pending = None
+
+    def _send_rtt_probe(self, now: float) -> None:
+        """Publish a QoS 1 probe whose PUBACK measures broker round-trip time."""
+        self.rate_controller.begin_probe(now)
+        self.rate_controller.probe_sent(self.transport.publish_probe())
+
+    @property
+    def rtt(self) -> Optional[float]:
+        """Smoothed broker round-trip time in seconds, if adaptive rate is on."""
+        return self.rate_controller.rtt if self.rate_controller else None
+
+    @property
+    def publish_frequency(self) -> float:
+        """Seconds between stick frames; follows the rate controller when adaptive rate is on."""
+        if self.rate_controller:
+            return self.rate_controller.period
+        return self._publish_frequency
+
+    @publish_frequency.setter
+    def publish_frequency(self, period: float) -> None:
+        self._publish_frequency = period
+        if self.rate_controller:
+            self.rate_controller.period = period
+
+    @property
+    def publish_rate(self) -> float:
+        """Current stick publish rate in Hz."""
+        return 1.0 / self.publish_frequency
+
+    def _on_reflex_block(self) -> None:
+        """Immediately replace the last setpoint with its reflex-filtered version."""
+        self._send_stick(self._filter_frame(self._last_frame).tobytes())
 
     def update_speed(self, left_right: float, turn_left_right: float,
                     look_up_down: float, backward_forward: float) -> None:
@@ -195,46 +455,52 @@ class Go1MQTT:
         self.floats[3] = self._clamp(backward_forward)
         logger.debug(f"Speed updated: {self.floats}")
 
-    async def send_movement_command(self, duration_ms: int) -> None:
+    def send_movement_command(self, duration_ms: int, priority: int = 0,
+                              policy: Optional[str] = None) -> MotionHandle:
         """
-        Send movement command for specified duration.
-        
+        Hold the current speed values for the specified duration.
+
+        The speed values are captured when the command is submitted, so later
+        ``update_speed`` calls cannot change a move that is already running.
+
         Args:
             duration_ms: Duration of movement in milliseconds
+            priority: Commands with higher priority preempt lower ones
+            policy: "preempt" or "reject" an active command of equal priority
+                (defaults to the configured motion_policy)
+
+        Returns:
+            Handle of the command; await it to wait for the move to finish
         """
-        if not self.client or not self.connected:
-            logger.error("MQTT client not connected")
-            return
+        loop = asyncio.get_running_loop()
+        logger.debug(f"Submitting movement {self.floats} for {duration_ms}ms")
+        return self.motion.submit(
+            hold_frames(self.floats.copy(), duration_ms / 1000.0, loop),
+            priority=priority, policy=policy
+        )
 
-        try:
-            # Send initial zero command
-            zero_floats = np.zeros(4, dtype=np.float32)
-            info = self.client.publish(
-                self.movement_topic,
-                zero_floats.tobytes(),
-                qos=0
-            )
-            info.wait_for_publish()  # Wait for the publish to complete
-            logger.debug("Sent initial zero command")
+    def send_setpoint_stream(self, frames: Iterable[np.ndarray],
+                             period: Optional[float] = None, priority: int = 0,
+                             policy: Optional[str] = None) -> MotionHandle:
+        """
+        Stream stick frames, one per publish tick.
 
-            end_time = asyncio.get_event_loop().time() + (duration_ms / 1000.0)
-            
-            while asyncio.get_event_loop().time() < end_time:
-                if not self.connected:
-                    logger.error("Lost connection during movement")
-                    return
-                    
-                logger.debug(f"Sending command {self.floats}")
-                info = self.client.publish(
-                    self.movement_topic,
-                    self.floats.tobytes(),
-                    qos=0
-                )
-                info.wait_for_publish()
-                await asyncio.sleep(self.publish_frequency)
+        Ticks are scheduled against absolute deadlines so the stream keeps
+        its timing even when an individual publish is slow. Frames may also
+        come from a generator, which is advanced once per tick and can
+        therefore compute each setpoint from the latest state.
 
-        except Exception as e:
-            logger.error(f"Error sending movement command: {e}")
+        Args:
+            frames: float32 array of shape (ticks, 4) or an iterable of frames
+            period: Seconds between frames (defaults to publish_frequency)
+            priority: Commands with higher priority preempt lower ones
+            policy: "preempt" or "reject" an active command of equal priority
+                (defaults to the configured motion_policy)
+
+        Returns:
+            Handle of the command; await it to wait for the stream to finish
+        """
+        return self.motion.submit(frames, period=period, priority=priority, policy=policy)
 
     def send_led_command(self, r: int, g: int, b: int) -> None:
         """
@@ -245,35 +511,49 @@ class Go1MQTT:
             g: Green value (0-255)
             b: Blue value (0-255)
         """
-        if not self.client or not self.connected:
+        if not self.ready:
             logger.error("MQTT client not connected")
             return
+        if self.limiter:
+            self.limiter.submit(self.led_topic, lambda: self._send_led(r, g, b))
+        else:
+            self._send_led(r, g, b)
 
+    def _send_led(self, r: int, g: int, b: int) -> None:
+        """Publish an LED command now."""
         try:
-            command = f"child_conn.send('change_light({r},{g},{b})')"
-            info = self.client.publish(self.led_topic, command, qos=0)
-            info.wait_for_publish()
+            self._publish_via(self.led_topic, self.transport.publish_led, r, g, b)
             logger.debug(f"Sent LED command: R={r}, G={g}, B={b}")
         except Exception as e:
             logger.error(f"Error sending LED command: {e}")
 
-    def send_mode_command(self, mode: Go1Mode) -> None:
+    def send_mode_command(self, mode: Go1Mode) -> bool:
         """
         Send mode change command.
+
+        The command is published before this returns. It is never deferred:
+        if mode commands are over their rate limit it is rejected instead.
         
         Args:
             mode: Target mode to set
+
+        Returns:
+            True if the command was sent
         """
-        if not self.client or not self.connected:
+        if not self.ready:
             logger.error("MQTT client not connected")
-            return
+            return False
+        if self.limiter and not self.limiter.try_acquire(self.mode_topic):
+            return False
 
         try:
-            info = self.client.publish(self.mode_topic, mode.value, qos=1)
-            info.wait_for_publish()
+            self._publish_via(self.mode_topic, self.transport.publish_mode, mode)
+            self.odometry.set_mode(mode)
             logger.info(f"Mode command sent: {mode.value}")
+            return True
         except Exception as e:
             logger.error(f"Error sending mode command: {e}")
+            return False
 
     @staticmethod
     def _clamp(speed: float) -> float:
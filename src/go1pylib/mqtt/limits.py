@@ -0,0 +1,223 @@
+"""
+Per-topic token-bucket limits on outbound commands.
+
+Stick frames share the connection with LED and mode commands, so a script
+that floods ``programming/code`` or ``controller/action`` delays motion.
+PublishLimiter gives each limited topic a token bucket; commands beyond
+its rate are handled per topic:
+
+    - merge topics (LED) are deferred, keeping only the newest command,
+      and also wait while a stick frame is queued behind a busy link
+    - other topics (mode) are never deferred or dropped: a command is sent
+      immediately or, when over the limit, rejected with an error so the
+      caller knows it was not sent
+
+Topics without a limit, such as ``controller/stick``, always go straight
+through.
+"""
+
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional
+import logging
+import threading
+
+from .topics import PubTopic
+from ..clock import Clock, SYSTEM_CLOCK
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class TopicLimit:
+    """Token bucket settings of one topic."""
+    rate: float  # Commands per second
+    burst: float  # Commands that may be sent back to back
+    merge: bool = False  # Defer over-limit commands latest-wins instead of rejecting them
+
+DEFAULT_PUBLISH_LIMITS: Dict[str, TopicLimit] = {
+    PubTopic.PROGRAMMING_CODE.value: TopicLimit(rate=10.0, burst=5.0, merge=True),
+    PubTopic.CONTROLLER_ACTION.value: TopicLimit(rate=5.0, burst=10.0),
+}
+
+class TokenBucket:
+    """Classic token bucket refilled continuously at ``rate``."""
+
+    def __init__(self, rate: float, burst: float, now: float):
+        """
+        Initialize a full bucket.
+
+        Args:
+            rate: Tokens added per second
+            burst: Bucket capacity
+            now: Current time in seconds
+        """
+        if rate <= 0 or burst < 1:
+            raise ValueError("Expected rate > 0 and burst >= 1")
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self._last = now
+
+    def _refill(self, now: float) -> None:
+        if now > self._last:
+            self.tokens = min(self.burst, self.tokens + (now - self._last) * self.rate)
+            self._last = now
+
+    def take(self, now: float) -> bool:
+        """Take one token if available."""
+        self._refill(now)
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return True
+        return False
+
+    def wait_time(self, now: float) -> float:
+        """Seconds until a token is available."""
+        self._refill(now)
+        return max(0.0, (1.0 - self.tokens) / self.rate)
+
+class PublishLimiter:
+    """Runs publish actions within per-topic token-bucket limits."""
+
+    def __init__(self, limits: Dict[str, TopicLimit], clock: Clock = SYSTEM_CLOCK,
+                 hold: Optional[Callable[[], bool]] = None, hold_retry: float = 0.01):
+        """
+        Initialize the limiter.
+
+        Args:
+            limits: Limit per topic; other topics are not limited
+            clock: Time source
+            hold: Returns True while deferred merge-topic commands should
+                wait (e.g. a stick frame is queued)
+            hold_retry: Seconds between checks while held
+        """
+        self.limits = dict(limits)
+        self.clock = clock
+        self.hold = hold
+        self.hold_retry = hold_retry
+
+        now = clock.monotonic()
+        self._buckets = {topic: TokenBucket(limit.rate, limit.burst, now)
+                         for topic, limit in self.limits.items()}
+        self._pending: Dict[str, Callable[[], None]] = {}
+        self.throttled: Dict[str, int] = {topic: 0 for topic in self.limits}
+        self.merged: Dict[str, int] = {topic: 0 for topic in self.limits}
+        self.rejected: Dict[str, int] = {topic: 0 for topic in self.limits}
+
+        self._lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+        self._cancel_virtual: Optional[Callable[[], None]] = None
+
+    def submit(self, topic: str, action: Callable[[], None]) -> bool:
+        """
+        Run a publish action now if the topic's limit allows.
+
+        Over the limit, an action on a merge topic is deferred (replacing any
+        action already deferred for that topic) and an action on any other
+        limited topic is rejected.
+
+        Args:
+            topic: Topic the action publishes to
+            action: Performs the publish; runs on the calling thread when sent
+                immediately and on a timer thread when deferred
+
+        Returns:
+            True if the action ran immediately
+        """
+        bucket = self._buckets.get(topic)
+        if bucket is None or not self.limits[topic].merge:
+            run_now = self.try_acquire(topic)
+            if run_now:
+                action()
+            return run_now
+        with self._lock:
+            now = self.clock.monotonic()
+            if topic not in self._pending and not self._held() and bucket.take(now):
+                run_now = True
+            else:
+                run_now = False
+                self.throttled[topic] += 1
+                if topic in self._pending:
+                    self.merged[topic] += 1
+                self._pending[topic] = action
+                self._schedule()
+        if run_now:
+            action()
+        return run_now
+
+    def try_acquire(self, topic: str) -> bool:
+        """
+        Take a token for a command that must be sent now or not at all.
+
+        Args:
+            topic: Topic the command publishes to
+
+        Returns:
+            True if the command may be sent; False (logged and counted in
+            ``rejected``) if the topic is over its limit
+        """
+        bucket = self._buckets.get(topic)
+        if bucket is None:
+            return True
+        with self._lock:
+            if bucket.take(self.clock.monotonic()):
+                return True
+            self.rejected[topic] += 1
+        logger.error(f"Rate limit exceeded on {topic}, command not sent")
+        return False
+
+    def _held(self) -> bool:
+        return self.hold is not None and self.hold()
+
+    def _schedule(self) -> None:
+        """Arm the flush timer for the earliest deferred command. Caller holds the lock."""
+        if self._timer is not None or self._cancel_virtual is not None:
+            return
+        now = self.clock.monotonic()
+        waits = [self._buckets[topic].wait_time(now) for topic in self._pending]
+        if not waits:
+            return
+        delay = max(min(waits), self.hold_retry if self._held() else 0.0)
+        if self.clock.virtual:
+            def fire() -> None:
+                cancel()
+                self._flush()
+            cancel = self._cancel_virtual = self.clock.every(delay, fire)
+        else:
+            self._timer = threading.Timer(delay, self._flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _flush(self) -> None:
+        """Run deferred commands that have tokens, then re-arm for the rest."""
+        ready = []
+        with self._lock:
+            self._timer = None
+            self._cancel_virtual = None
+            if not self._held():
+                now = self.clock.monotonic()
+                for topic in list(self._pending):
+                    if self._buckets[topic].take(now):
+                        ready.append(self._pending.pop(topic))
+            self._schedule()
+        for action in ready:
+            try:
+                action()
+            except Exception as e:
+                logger.error(f"Error in deferred publish: {e}")
+
+    @property
+    def pending(self) -> int:
+        """Number of deferred commands."""
+        with self._lock:
+            return len(self._pending)
+
+    def close(self) -> None:
+        """Cancel the timer and discard deferred commands."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if self._cancel_virtual is not None:
+                self._cancel_virtual()
+                self._cancel_virtual = None
+            self._pending.clear()
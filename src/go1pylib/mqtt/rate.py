@@ -0,0 +1,146 @@
+"""
+Adaptive stick publish rate driven by broker round-trip time.
+
+RTT is measured with small QoS 1 probes: the time from publishing a probe
+until the broker's PUBACK arrives. The smoothed RTT and its variance are
+tracked like a TCP retransmission timer and the publish period follows
+them within configured bounds.
+"""
+
+from typing import Dict, Optional
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+PROBE_TOPIC = "go1pylib/rtt_probe"
+
+class AdaptiveRateController:
+    """Chooses the stick publish period from measured broker RTT."""
+
+    def __init__(self, min_period: float = 0.02, max_period: float = 0.2,
+                 initial_period: float = 0.1, probe_interval: float = 1.0,
+                 probe_timeout: float = 2.0):
+        """
+        Initialize the controller.
+
+        Args:
+            min_period: Shortest allowed publish period in seconds
+            max_period: Longest allowed publish period in seconds
+            initial_period: Period used until the first RTT sample arrives
+            probe_interval: Seconds between RTT probes
+            probe_timeout: Seconds after which an unacknowledged probe counts as lost
+        """
+        if not 0 < min_period <= max_period:
+            raise ValueError("Expected 0 < min_period <= max_period")
+        self.min_period = min_period
+        self.max_period = max_period
+        self.probe_interval = probe_interval
+        self.probe_timeout = probe_timeout
+
+        self.period = max(min_period, min(max_period, initial_period))
+        self.rtt: Optional[float] = None
+        self.rtt_var = 0.0
+        self.samples = 0
+        self.lost_probes = 0
+
+        self._lock = threading.Lock()
+        self._probe_sent_at: Optional[float] = None
+        self._last_probe_at = float("-inf")
+        self._probe_mid: Optional[int] = None
+        self._early_acks: Dict[int, float] = {}
+
+    @property
+    def rate_hz(self) -> float:
+        """Current publish rate in Hz."""
+        return 1.0 / self.period
+
+    def should_probe(self, now: float) -> bool:
+        """
+        Whether a new probe should be sent now.
+
+        Probes go out at most once per ``probe_interval``. Also expires a
+        probe that has been outstanding for too long and backs off the
+        publish rate when that happens.
+
+        Args:
+            now: Current monotonic time
+        """
+        with self._lock:
+            if self._probe_sent_at is not None:
+                if now - self._probe_sent_at < self.probe_timeout:
+                    return False
+                self.lost_probes += 1
+                self.period = min(self.max_period, self.period * 2)
+                logger.debug(f"RTT probe lost, backing off to {self.period:.3f}s")
+                self._probe_sent_at = None
+            return now - self._last_probe_at >= self.probe_interval
+
+    def begin_probe(self, now: float) -> None:
+        """
+        Mark a probe as about to be published.
+
+        Args:
+            now: Monotonic time just before the probe is handed to paho
+        """
+        with self._lock:
+            self._probe_sent_at = now
+            self._last_probe_at = now
+            self._probe_mid = None
+            self._early_acks.clear()
+
+    def probe_sent(self, mid: int) -> None:
+        """
+        Record the message id paho assigned to the probe.
+
+        Args:
+            mid: Message id returned by publish()
+        """
+        with self._lock:
+            acked_at = self._early_acks.pop(mid, None)
+            self._early_acks.clear()
+            if acked_at is not None:
+                # The PUBACK beat us to it
+                self._sample(acked_at)
+            else:
+                self._probe_mid = mid
+
+    def on_ack(self, mid: int, now: float) -> bool:
+        """
+        Handle a publish acknowledgement from paho's on_publish callback.
+
+        Args:
+            mid: Acknowledged message id
+            now: Monotonic time of the acknowledgement
+
+        Returns:
+            True if this completed an RTT probe and the period was updated
+        """
+        with self._lock:
+            if self._probe_sent_at is None:
+                return False
+            if self._probe_mid is None:
+                self._early_acks[mid] = now
+                return False
+            if mid != self._probe_mid:
+                return False
+            self._sample(now)
+            return True
+
+    def _sample(self, acked_at: float) -> None:
+        """Fold one RTT sample in and update the period. Caller holds the lock."""
+        rtt = max(acked_at - self._probe_sent_at, 0.0)
+        self._probe_sent_at = None
+        self._probe_mid = None
+        self.samples += 1
+
+        if self.rtt is None:
+            self.rtt = rtt
+            self.rtt_var = rtt / 2
+        else:
+            self.rtt_var += 0.25 * (abs(self.rtt - rtt) - self.rtt_var)
+            self.rtt += 0.125 * (rtt - self.rtt)
+
+        # Never publish faster than the link can reliably turn a message around
+        target = self.rtt + 4 * self.rtt_var
+        self.period = max(self.min_period, min(self.max_period, target))
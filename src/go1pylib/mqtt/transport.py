@@ -0,0 +1,142 @@
+from typing import List, Optional
+import logging
+import threading
+
+import paho.mqtt.client as mqtt
+
+from .topics import PubTopic
+from .rate import PROBE_TOPIC
+from ..go1 import Go1Mode
+from ..transport import Transport
+
+logger = logging.getLogger(__name__)
+
+CONNECT_ERRORS = {
+    1: "Connection refused - incorrect protocol version",
+    2: "Connection refused - invalid client identifier",
+    3: "Connection refused - server unavailable",
+    4: "Connection refused - bad username or password",
+    5: "Connection refused - not authorised"
+}
+
+class MQTTTransport(Transport):
+    """
+    The robot's MQTT broker, reached through a paho client.
+
+    This is the transport Go1MQTT uses when none is configured. Stick frames
+    go out at QoS 0 and are handed back in flight so the owner can apply
+    backpressure; mode commands use QoS 1. Both mode and LED commands wait
+    until paho has written them.
+    """
+
+    name = "mqtt"
+    supports_acks = True
+
+    def __init__(self, host: str = "192.168.12.1", port: int = 1883, client_id: str = "",
+                 keepalive: int = 60, protocol: int = mqtt.MQTTv311,
+                 max_queued_messages: int = 0, timeout: float = 10.0):
+        """
+        Initialize the transport.
+
+        Args:
+            host: Broker host
+            port: Broker port
+            client_id: MQTT client id
+            keepalive: MQTT keepalive in seconds
+            protocol: MQTT protocol version
+            max_queued_messages: Cap on paho's QoS>0 outbound queue; 0 is unlimited
+            timeout: Seconds to wait for the broker to accept the connection
+        """
+        super().__init__()
+        self.host = host
+        self.port = port
+        self.client_id = client_id
+        self.keepalive = keepalive
+        self.protocol = protocol
+        self.max_queued_messages = max_queued_messages
+        self.timeout = timeout
+        self.client: Optional[mqtt.Client] = None
+        self._connected_event = threading.Event()
+
+    @property
+    def ready(self) -> bool:
+        return self.client is not None
+
+    def connect(self) -> None:
+        self.client = mqtt.Client(
+            client_id=self.client_id,
+            clean_session=True,
+            protocol=self.protocol
+        )
+        self.client.max_queued_messages_set(self.max_queued_messages)
+        self.client.on_connect = self._on_connect
+        self.client.on_disconnect = self._on_disconnect
+        self.client.on_message = self._on_message
+        self.client.on_publish = self._on_publish
+        self.client.on_log = self._on_log
+
+        self._connected_event.clear()
+        self.client.connect(host=self.host, port=self.port, keepalive=self.keepalive)
+        self.client.loop_start()
+        if not self._connected_event.wait(self.timeout):
+            self.client.loop_stop()
+            raise ConnectionError("Connection timeout")
+
+    def _on_connect(self, client, userdata, flags, rc) -> None:
+        """Callback for when the client connects to the broker."""
+        if rc != 0:
+            error_msg = CONNECT_ERRORS.get(rc, f"Unknown error code: {rc}")
+            logger.error(f"Failed to connect to MQTT broker: {error_msg}")
+            return
+        logger.info("Connected to MQTT broker")
+        self._set_connected(True)
+        self._connected_event.set()
+
+    def _on_disconnect(self, client, userdata, rc) -> None:
+        """Callback for when the client disconnects from the broker."""
+        if rc == 0:
+            logger.info("Cleanly disconnected from MQTT broker")
+        else:
+            logger.warning(f"Unexpectedly disconnected from MQTT broker with code: {rc}")
+        self._connected_event.clear()
+        self._set_connected(False)
+
+    def _on_message(self, client, userdata, msg) -> None:
+        """Callback for when a message is received."""
+        self._deliver(msg.topic, msg.payload)
+
+    def _on_publish(self, client, userdata, mid) -> None:
+        """Callback for when paho has written (QoS 0) or had acknowledged (QoS 1) a message."""
+        logger.debug(f"Published message {mid}")
+        if self.on_published:
+            self.on_published(mid)
+
+    def _on_log(self, client, userdata, level, buf) -> None:
+        """Callback for logging."""
+        logger.debug(f"MQTT Log: {buf}")
+
+    def subscribe(self, topics: List[str]) -> None:
+        self.client.subscribe([(topic, 0) for topic in topics])
+
+    def disconnect(self) -> None:
+        if self.client is None:
+            return
+        self.client.loop_stop()
+        self.client.disconnect()
+        # paho reports a clean disconnect itself when the socket was open
+        if self.connected:
+            self._set_connected(False)
+
+    def publish_setpoint(self, payload: bytes) -> Optional[mqtt.MQTTMessageInfo]:
+        info = self.client.publish(PubTopic.CONTROLLER_STICK.value, payload, qos=0)
+        return info if info.rc == mqtt.MQTT_ERR_SUCCESS else None
+
+    def publish_mode(self, mode: Go1Mode) -> None:
+        self.client.publish(PubTopic.CONTROLLER_ACTION.value, mode.value, qos=1).wait_for_publish()
+
+    def publish_led(self, r: int, g: int, b: int) -> None:
+        command = f"child_conn.send('change_light({r},{g},{b})')"
+        self.client.publish(PubTopic.PROGRAMMING_CODE.value, command, qos=0).wait_for_publish()
+
+    def publish_probe(self) -> int:
+        return self.client.publish(PROBE_TOPIC, b"", qos=1).mid
@@ -0,0 +1,139 @@
+"""
+Dead-reckoning odometry for the Go1 robot.
+
+The estimator integrates the stick frames that were actually published,
+using their publish timestamps, into a 2D pose (x forward, y left, theta
+counter-clockwise) in the frame the robot started in. Frames only count
+while the last commanded mode is a walking gait; in stand mode the same
+axes pose the body without moving it.
+"""
+
+from dataclasses import dataclass
+from typing import Optional, Tuple
+import math
+import threading
+
+import numpy as np
+
+from .go1 import Go1Mode
+
+# Modes in which stick frames move the robot over the ground
+WALKING_MODES = frozenset({Go1Mode.WALK, Go1Mode.RUN, Go1Mode.CLIMB})
+
+@dataclass
+class OdometryCalibration:
+    """
+    Conversion from stick values to body velocities at full deflection.
+
+    The defaults are rough walk-mode figures; measure them on your robot
+    and surface for useful estimates.
+    """
+    forward_speed: float = 0.6  # m/s at backward_forward = 1
+    lateral_speed: float = 0.3  # m/s at left_right = 1
+    yaw_rate: float = 2.0  # rad/s at turn_left_right = 1
+    hold_timeout: float = 0.5  # Seconds a setpoint is assumed to stay in effect
+
+class Odometry:
+    """
+    Pose estimator integrating commanded velocities.
+
+    Each published frame is held until the next one arrives (zero-order
+    hold), but never longer than ``hold_timeout`` since the firmware stops
+    on its own once setpoints stop arriving.
+    """
+
+    def __init__(self, calibration: Optional[OdometryCalibration] = None,
+                 trajectory_capacity: int = 4096):
+        """
+        Initialize the estimator at the origin.
+
+        Args:
+            calibration: Stick-to-velocity calibration constants
+            trajectory_capacity: Number of most recent poses kept in the trajectory log
+        """
+        self.calibration = calibration or OdometryCalibration()
+        self.walking = True  # Until a mode command says otherwise
+        self._lock = threading.Lock()
+        self._trajectory = np.zeros((max(trajectory_capacity, 1), 4))
+        self.reset()
+
+    def reset(self, x: float = 0.0, y: float = 0.0, theta: float = 0.0) -> None:
+        """
+        Reset the pose and clear the trajectory log.
+
+        Args:
+            x: Initial x position in meters
+            y: Initial y position in meters
+            theta: Initial heading in radians
+        """
+        with self._lock:
+            self._x, self._y, self._theta = x, y, theta
+            self._vx = self._vy = self._omega = 0.0
+            self._last_time: Optional[float] = None
+            self._length = 0
+            self._next = 0  # Trajectory row the next pose goes to
+
+    def set_mode(self, mode: Go1Mode) -> None:
+        """
+        Follow a mode change; frames published outside walking gaits are ignored.
+
+        Args:
+            mode: Mode that was commanded
+        """
+        with self._lock:
+            self.walking = mode in WALKING_MODES
+
+    @property
+    def pose(self) -> Tuple[float, float, float]:
+        """Current (x, y, theta) estimate."""
+        with self._lock:
+            return self._x, self._y, self._theta
+
+    def update(self, frame: np.ndarray, timestamp: float) -> None:
+        """
+        Integrate the previous setpoint up to ``timestamp`` and adopt ``frame``.
+
+        Args:
+            frame: Published stick frame (left_right, turn, look, backward_forward)
+            timestamp: Monotonic time the frame was published at
+        """
+        cal = self.calibration
+        with self._lock:
+            if self._last_time is not None:
+                dt = min(max(timestamp - self._last_time, 0.0), cal.hold_timeout)
+                if dt > 0:
+                    # Midpoint heading keeps arcs accurate at low publish rates
+                    heading = self._theta + 0.5 * self._omega * dt
+                    cos_h, sin_h = math.cos(heading), math.sin(heading)
+                    self._x += (self._vx * cos_h - self._vy * sin_h) * dt
+                    self._y += (self._vx * sin_h + self._vy * cos_h) * dt
+                    self._theta = math.remainder(self._theta + self._omega * dt, math.tau)
+
+            if self.walking:
+                # Stick axes: positive left_right is right, positive turn is clockwise
+                self._vx = float(frame[3]) * cal.forward_speed
+                self._vy = -float(frame[0]) * cal.lateral_speed
+                self._omega = -float(frame[1]) * cal.yaw_rate
+            else:
+                self._vx = self._vy = self._omega = 0.0
+            self._last_time = timestamp
+            self._append(timestamp)
+
+    def trajectory(self) -> np.ndarray:
+        """
+        Get the logged trajectory.
+
+        Returns:
+            Array of shape (n, 4) with columns (time, x, y, theta), oldest
+            first, holding at most the last ``trajectory_capacity`` poses
+        """
+        with self._lock:
+            if self._length < len(self._trajectory):
+                return self._trajectory[:self._length].copy()
+            return np.roll(self._trajectory, -self._next, axis=0)
+
+    def _append(self, timestamp: float) -> None:
+        """Write the current pose into the trajectory ring. Caller holds the lock."""
+        self._trajectory[self._next] = (timestamp, self._x, self._y, self._theta)
+        self._next = (self._next + 1) % len(self._trajectory)
+        self._length = min(self._length + 1, len(self._trajectory))
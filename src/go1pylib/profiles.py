@@ -0,0 +1,134 @@
+"""
+Motion profiles for smooth Go1 stick setpoints.
+
+Profiles are computed in one vectorized NumPy evaluation over the whole
+publish time grid and cached by their parameters, so streaming a profile
+costs nothing beyond indexing into a precomputed array.
+"""
+
+from functools import lru_cache
+from typing import Optional, Tuple
+
+import numpy as np
+
+def _ramp_velocity(t: np.ndarray, span: float, max_accel: float,
+                   max_jerk: Optional[float]) -> np.ndarray:
+    """
+    Evaluate a 0 -> span ramp at times ``t``.
+
+    Without a jerk limit the ramp is linear (trapezoidal profile); with one
+    the slope itself ramps up and down (S-curve profile).
+
+    Args:
+        t: Sample times in seconds
+        span: Absolute change of the setpoint
+        max_accel: Maximum rate of change (setpoint units per second)
+        max_jerk: Maximum change of that rate (units per second squared)
+
+    Returns:
+        Setpoint change reached at each sample time
+    """
+    if max_jerk is None:
+        return np.minimum(max_accel * t, span)
+
+    # Time spent ramping the slope up (and down again)
+    t_jerk = max_accel / max_jerk
+    if span < max_accel * t_jerk:
+        # Slope never reaches max_accel: triangular slope profile
+        t_jerk = np.sqrt(span / max_jerk)
+        peak = max_jerk * t_jerk
+    else:
+        peak = max_accel
+    t_const = span / peak - t_jerk
+    total = 2 * t_jerk + t_const
+    v_jerk = 0.5 * max_jerk * t_jerk ** 2
+
+    rising = 0.5 * max_jerk * t ** 2
+    constant = v_jerk + peak * (t - t_jerk)
+    falling = span - 0.5 * max_jerk * (total - t) ** 2
+    return np.select(
+        [t < t_jerk, t < t_jerk + t_const, t < total],
+        [rising, constant, falling],
+        default=span,
+    )
+
+@lru_cache(maxsize=256)
+def ramp_profile(start: float, target: float, max_accel: float,
+                 max_jerk: Optional[float], rate_hz: float) -> np.ndarray:
+    """
+    Setpoint sequence moving a single axis from ``start`` to ``target``.
+
+    The first sample is ``start`` and the last is ``target``.
+
+    Args:
+        start: Initial setpoint
+        target: Final setpoint
+        max_accel: Maximum rate of change (setpoint units per second)
+        max_jerk: Maximum change of that rate, or None for a trapezoidal ramp
+        rate_hz: Publish rate the sequence will be streamed at
+
+    Returns:
+        Read-only float32 array, one sample per publish tick
+    """
+    if max_accel <= 0 or rate_hz <= 0:
+        raise ValueError("max_accel and rate_hz must be positive")
+    if max_jerk is not None and max_jerk <= 0:
+        raise ValueError("max_jerk must be positive")
+
+    span = abs(target - start)
+    if span == 0:
+        profile = np.array([start], dtype=np.float32)
+    else:
+        # Duration of the whole ramp, then one vectorized evaluation over it
+        if max_jerk is None:
+            duration = span / max_accel
+        else:
+            t_jerk = min(max_accel / max_jerk, np.sqrt(span / max_jerk))
+            duration = span / (max_jerk * t_jerk) + t_jerk
+        ticks = int(np.ceil(duration * rate_hz)) + 1
+        t = np.arange(ticks) / rate_hz
+        delta = _ramp_velocity(t, span, max_accel, max_jerk)
+        profile = (start + np.sign(target - start) * delta).astype(np.float32)
+
+    profile.setflags(write=False)
+    return profile
+
+@lru_cache(maxsize=256)
+def move_profile(setpoint: Tuple[float, float, float, float], duration_s: float,
+                 max_accel: float, max_jerk: Optional[float],
+                 rate_hz: float) -> np.ndarray:
+    """
+    Stick frames that ramp up to ``setpoint``, hold it and ramp back to zero.
+
+    All four axes share one normalized envelope so they stay synchronized;
+    the limits apply to the axis with the largest magnitude. If the move is
+    too short to reach the setpoint the envelope peaks below it.
+
+    Args:
+        setpoint: Target (left_right, turn, look, backward_forward) frame
+        duration_s: Total length of the move including both ramps
+        max_accel: Maximum rate of change (stick units per second)
+        max_jerk: Maximum change of that rate, or None for trapezoidal ramps
+        rate_hz: Publish rate the frames will be streamed at
+
+    Returns:
+        Read-only float32 array of shape (ticks, 4); first and last frames are zero
+    """
+    target = np.clip(np.asarray(setpoint, dtype=np.float64), -1.0, 1.0)
+    ticks = max(int(round(duration_s * rate_hz)), 2)
+    peak = float(np.max(np.abs(target)))
+
+    if peak == 0:
+        frames = np.zeros((ticks, 4), dtype=np.float32)
+    else:
+        # Scale the limits so the dominant axis respects them
+        jerk = None if max_jerk is None else max_jerk / peak
+        ramp = ramp_profile(0.0, 1.0, max_accel / peak, jerk, rate_hz)
+        up = np.ones(ticks)
+        n = min(len(ramp), ticks)
+        up[:n] = ramp[:n]
+        envelope = np.minimum(up, up[::-1])
+        frames = np.outer(envelope, target).astype(np.float32)
+
+    frames.setflags(write=False)
+    return frames
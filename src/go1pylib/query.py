@@ -0,0 +1,261 @@
+"""
+Time-range queries over archived telemetry.
+
+A TelemetryStore is a directory with one subdirectory of archives
+(archive.py) per robot::
+
+    root/
+        go1-a/2024-05-01.arc
+        go1-a/2024-05-02.arc
+        go1-b/...
+
+A query only opens the archives whose time range overlaps the request,
+finds the overlapping blocks through each archive's block index, decodes
+just the requested column and aggregates it with NumPy. Nothing goes
+through message_handler, so weeks of telemetry can be scanned quickly.
+
+Fields are named after Go1State: ``bms.current``, ``bms.soc``,
+``bms.cell_voltages``, ``robot.temps[3]``, ``robot.obstacles`` and so on,
+plus the derived ``bms.voltage`` (sum of the cell voltages). Values are in
+the robot's raw units, as in Go1State.
+"""
+
+from typing import Callable, Dict, List, Optional, Tuple, Union
+import logging
+import os
+import re
+
+import numpy as np
+
+from .archive import LAYOUTS, ArchiveReader
+
+logger = logging.getLogger(__name__)
+
+AGGREGATES = ("mean", "min", "max", "sum", "count", "first", "last")
+
+_UNITS = {"ms": 0.001, "s": 1.0, "min": 60.0, "m": 60.0, "h": 3600.0, "d": 86400.0}
+_INTERVAL = re.compile(r"^\s*(\d+(?:\.\d*)?|\.\d+)\s*(ms|s|min|m|h|d)?\s*$")
+_FIELD = re.compile(r"^(\w+)\.(\w+)(?:\[(\d+)\])?$")
+
+# Fields computed from stored columns: name -> (column, function of the column)
+DERIVED: Dict[str, Tuple[str, Callable[[np.ndarray], np.ndarray]]] = {
+    "bms.voltage": ("cell_voltages", lambda cells: cells.sum(axis=1, dtype=np.int64)),
+}
+
+def parse_interval(interval: Union[str, float]) -> float:
+    """
+    Parse a resampling interval such as "500ms", "1s", "5min" or "1h".
+
+    Args:
+        interval: Interval string, or seconds as a number
+
+    Returns:
+        Interval in seconds
+
+    Raises:
+        ValueError: If the interval is malformed or not positive
+    """
+    if isinstance(interval, (int, float)):
+        seconds = float(interval)
+    else:
+        match = _INTERVAL.match(interval)
+        if not match:
+            raise ValueError(f"Invalid interval {interval!r}")
+        seconds = float(match.group(1)) * _UNITS[match.group(2) or "s"]
+    if seconds <= 0:
+        raise ValueError(f"Interval must be positive, got {interval!r}")
+    return seconds
+
+def resolve_field(field: str) -> Tuple[str, str, Optional[int], Optional[Callable[[np.ndarray], np.ndarray]]]:
+    """
+    Map a field name to the archived column that holds it.
+
+    Args:
+        field: Field such as "bms.current" or "robot.temps[3]"
+
+    Returns:
+        (topic, column, element index or None, derivation or None)
+
+    Raises:
+        ValueError: If the field is unknown
+    """
+    if field in DERIVED:
+        column, derive = DERIVED[field]
+        return "bms/state", column, None, derive
+    match = _FIELD.match(field)
+    if match:
+        prefix, name, index = match.groups()
+        for topic, (layout_prefix, dtype) in LAYOUTS.items():
+            if layout_prefix == prefix and name in dtype.names:
+                shape = dtype.fields[name][0].shape
+                if index is not None and (not shape or int(index) >= shape[0]):
+                    break
+                return topic, name, None if index is None else int(index), None
+    raise ValueError(f"Unknown telemetry field {field!r}")
+
+def downsample(timestamps: np.ndarray, values: np.ndarray, interval: float,
+               agg: str = "mean", origin: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Aggregate samples into fixed time bins.
+
+    Args:
+        timestamps: Sorted sample times in seconds
+        values: Samples, shape (n,) or (n, width)
+        interval: Bin width in seconds
+        agg: One of AGGREGATES
+        origin: Time of a bin edge (defaults to a multiple of interval)
+
+    Returns:
+        (bin start times, aggregated values) for the bins that hold samples
+    """
+    if agg not in AGGREGATES:
+        raise ValueError(f"Unknown aggregate {agg!r}, expected one of {AGGREGATES}")
+    if len(timestamps) == 0:
+        return np.empty(0), np.empty((0,) + values.shape[1:])
+    if origin is None:
+        origin = np.floor(timestamps[0] / interval) * interval
+    bins = np.floor((timestamps - origin) / interval).astype(np.int64)
+    starts = np.flatnonzero(np.diff(bins, prepend=bins[0] - 1))
+    counts = np.diff(np.append(starts, len(bins)))
+    if counts.ndim < values.ndim:
+        counts = counts.reshape((-1,) + (1,) * (values.ndim - 1))
+
+    if agg == "mean":
+        result = np.add.reduceat(values.astype(np.float64), starts, axis=0) / counts
+    elif agg == "sum":
+        result = np.add.reduceat(values, starts, axis=0)
+    elif agg == "min":
+        result = np.minimum.reduceat(values, starts, axis=0)
+    elif agg == "max":
+        result = np.maximum.reduceat(values, starts, axis=0)
+    elif agg == "count":
+        result = np.broadcast_to(counts, (len(starts),) + values.shape[1:]).copy()
+    elif agg == "first":
+        result = values[starts]
+    else:
+        result = values[np.append(starts[1:], len(values)) - 1]
+    return origin + bins[starts] * interval, result
+
+class TelemetryStore:
+    """Queries over a directory of per-robot telemetry archives."""
+
+    def __init__(self, root: str):
+        """
+        Open a store.
+
+        Args:
+            root: Directory with one subdirectory of ``*.arc`` archives per robot
+        """
+        self.root = root
+        self._readers: Dict[str, Tuple[int, ArchiveReader]] = {}  # path -> (file size, reader)
+
+    @property
+    def robots(self) -> List[str]:
+        """Robots that have an archive directory."""
+        return sorted(entry.name for entry in os.scandir(self.root) if entry.is_dir())
+
+    def archives(self, robot: str) -> List[ArchiveReader]:
+        """
+        Open and return the archives of a robot.
+
+        Readers are kept open between queries and reopened when their file
+        has grown, so archives still being written are picked up.
+
+        Args:
+            robot: Robot directory name
+
+        Returns:
+            Readers in file name order
+
+        Raises:
+            ValueError: If the store has no directory for the robot
+        """
+        directory = os.path.join(self.root, robot)
+        if not os.path.isdir(directory):
+            raise ValueError(f"No archives for robot {robot!r} in {self.root}")
+        readers = []
+        for name in sorted(os.listdir(directory)):
+            if not name.endswith(".arc"):
+                continue
+            path = os.path.join(directory, name)
+            size = os.path.getsize(path)
+            cached = self._readers.get(path)
+            if cached is not None and cached[0] != size:
+                cached[1].close()
+                cached = None
+            if cached is None:
+                try:
+                    cached = self._readers[path] = (size, ArchiveReader(path))
+                except ValueError as e:
+                    self._readers.pop(path, None)
+                    logger.warning(f"Skipping {path}: {e}")
+                    continue
+            readers.append(cached[1])
+        return readers
+
+    def query(self, robot: str, field: str, start: Optional[float] = None,
+              end: Optional[float] = None, resample: Optional[Union[str, float]] = None,
+              agg: str = "mean") -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Read one field of one robot over a time range.
+
+        Args:
+            robot: Robot directory name
+            field: Field such as "bms.current" or "robot.temps[3]"
+            start: Range start, Unix time in seconds (inclusive, open if None)
+            end: Range end, Unix time in seconds (exclusive, open if None)
+            resample: Bin width such as "1s" or "5min"; None returns raw samples
+            agg: Aggregate per bin, one of AGGREGATES
+
+        Returns:
+            (timestamps, values); values has one column per element for
+            array fields such as "robot.temps"
+        """
+        topic, column, index, derive = resolve_field(field)
+        times: List[np.ndarray] = []
+        values: List[np.ndarray] = []
+        for reader in self.archives(robot):
+            first, last = reader.time_range
+            if (start is not None and last < start) or (end is not None and first >= end):
+                continue
+            for info in reader.blocks_between(topic, start, end):
+                block = reader.read_block(info, fields=(column,))
+                if column not in block.records.dtype.names:
+                    continue  # packets of an unexpected size, kept as raw bytes
+                times.append(block.timestamps)
+                values.append(block.records[column])
+
+        dtype = LAYOUTS[topic][1].fields[column][0]
+        if not times:
+            timestamps, data = np.empty(0), np.empty((0,) + dtype.shape, dtype=dtype.base)
+        else:
+            timestamps, data = np.concatenate(times), np.concatenate(values)
+            if np.any(np.diff(timestamps) < 0):
+                order = np.argsort(timestamps, kind="stable")
+                timestamps, data = timestamps[order], data[order]
+        if start is not None or end is not None:
+            lo = 0 if start is None else np.searchsorted(timestamps, start, side="left")
+            hi = len(timestamps) if end is None else np.searchsorted(timestamps, end, side="left")
+            timestamps, data = timestamps[lo:hi], data[lo:hi]
+        if derive is not None:
+            data = derive(data)
+        elif index is not None:
+            data = data[:, index]
+
+        if resample is None:
+            return timestamps, data
+        interval = parse_interval(resample)
+        origin = None if start is None else np.floor(start / interval) * interval
+        return downsample(timestamps, data, interval, agg, origin)
+
+    def close(self) -> None:
+        """Close all open archives."""
+        for _, reader in self._readers.values():
+            reader.close()
+        self._readers.clear()
+
+    def __enter__(self) -> 'TelemetryStore':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,96 @@
+"""
+Raw telemetry recording and playback.
+
+A recording is a small header followed by one record per packet: a fixed
+``<dHI`` header (receive time, topic length, payload length), the topic and
+the undecoded payload. Packets are written exactly as they arrived, so a
+replay exercises the same decode path as the live robot.
+"""
+
+from typing import BinaryIO, Iterator, Optional, Tuple
+import logging
+import struct
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"GO1REC1\n"
+_RECORD = struct.Struct("<dHI")
+
+class TelemetryRecorder:
+    """Appends raw packets to a recording file."""
+
+    def __init__(self, path: str):
+        """
+        Create (or truncate) a recording.
+
+        Args:
+            path: File to write
+        """
+        self.path = path
+        self.packets = 0
+        self._file: Optional[BinaryIO] = open(path, "wb")
+        self._file.write(MAGIC)
+        self._lock = threading.Lock()
+
+    def write(self, topic: str, payload: bytes, timestamp: Optional[float] = None) -> None:
+        """
+        Append one packet.
+
+        Args:
+            topic: Topic the packet arrived on
+            payload: Undecoded packet bytes
+            timestamp: Receive time (defaults to time.time())
+        """
+        if timestamp is None:
+            timestamp = time.time()
+        encoded = topic.encode()
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(_RECORD.pack(timestamp, len(encoded), len(payload)))
+            self._file.write(encoded)
+            self._file.write(payload)
+            self.packets += 1
+
+    def observe_raw(self, topic: str, payload: bytes) -> None:
+        """Raw listener: record every packet as it arrives."""
+        self.write(topic, payload)
+
+    def close(self) -> None:
+        """Flush and close the file."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def __enter__(self) -> 'TelemetryRecorder':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+def read_recording(path: str) -> Iterator[Tuple[float, str, bytes]]:
+    """
+    Iterate over the packets of a recording.
+
+    Args:
+        path: File written by TelemetryRecorder
+
+    Returns:
+        Iterator of (timestamp, topic, payload); a truncated final record is skipped
+    """
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a Go1 telemetry recording")
+        while True:
+            header = f.read(_RECORD.size)
+            if len(header) < _RECORD.size:
+                return
+            timestamp, topic_len, payload_len = _RECORD.unpack(header)
+            body = f.read(topic_len + payload_len)
+            if len(body) < topic_len + payload_len:
+                logger.warning(f"Truncated record at the end of {path}")
+                return
+            yield timestamp, body[:topic_len].decode(), body[topic_len:]
@@ -0,0 +1,103 @@
+"""
+Reflex-level obstacle stop for the Go1 robot.
+
+The reflex is evaluated synchronously on the MQTT network thread right after
+a firmware/version packet has been decoded, so a stop frame goes out in the
+same callback that delivered the obstacle reading.
+"""
+
+from typing import Callable, Dict, Optional
+import logging
+
+import numpy as np
+
+from .mqtt.state import Go1State
+
+logger = logging.getLogger(__name__)
+
+# Stick frame index and sign that move the robot towards each side
+_DIRECTION_AXES: Dict[str, tuple] = {
+    "front": (3, 1.0),
+    "back": (3, -1.0),
+    "left": (0, -1.0),
+    "right": (0, 1.0),
+}
+
+class ObstacleReflex:
+    """
+    Blocks setpoints that move the robot towards a close obstacle.
+
+    Thresholds are distance warning levels (0 to 1, see
+    ``RobotReceiver.distance_to_warning``); a side is blocked while its
+    warning is at or above its threshold. Only sides that have a threshold
+    are guarded.
+    """
+
+    def __init__(self, on_block: Callable[[], None],
+                 thresholds: Optional[Dict[str, float]] = None):
+        """
+        Initialize the reflex.
+
+        Args:
+            on_block: Called on the decode thread when a side becomes blocked
+            thresholds: Warning level per side ("front", "back", "left", "right")
+        """
+        if thresholds is None:
+            thresholds = {"front": 0.75}
+        unknown = set(thresholds) - set(_DIRECTION_AXES)
+        if unknown:
+            raise ValueError(f"Unknown reflex directions: {sorted(unknown)}")
+
+        self.on_block = on_block
+        self.thresholds = dict(thresholds)
+        self.blocked: Dict[str, bool] = {side: False for side in self.thresholds}
+        self.trips = 0
+
+    @property
+    def active(self) -> bool:
+        """Whether any side is currently blocked."""
+        return any(self.blocked.values())
+
+    def evaluate(self, state: Go1State) -> bool:
+        """
+        Update blocked sides from freshly decoded distance warnings.
+
+        Args:
+            state: Go1 state right after decoding a firmware/version packet
+
+        Returns:
+            True if a side became blocked by this packet
+        """
+        warning = state.robot.distance_warning
+        newly_blocked = False
+        for side, threshold in self.thresholds.items():
+            blocked = getattr(warning, side) >= threshold
+            if blocked and not self.blocked[side]:
+                newly_blocked = True
+            self.blocked[side] = blocked
+
+        if newly_blocked:
+            self.trips += 1
+            logger.warning(f"Obstacle reflex engaged: {self.blocked}")
+            self.on_block()
+        return newly_blocked
+
+    def filter(self, frame: np.ndarray) -> np.ndarray:
+        """
+        Remove setpoint components that move towards a blocked side.
+
+        Args:
+            frame: Stick frame (left_right, turn, look, backward_forward)
+
+        Returns:
+            The frame itself if nothing is blocked, otherwise a filtered copy
+        """
+        if not self.active:
+            return frame
+        filtered = frame.copy()
+        for side, blocked in self.blocked.items():
+            if blocked:
+                axis, sign = _DIRECTION_AXES[side]
+                if filtered[axis] * sign > 0:
+                    filtered[axis] = 0.0
+        return filtered
@@ -0,0 +1,171 @@
+"""
+Shared-memory export of decoded Go1 state.
+
+The process that owns the MQTT connection writes every decoded packet into a
+fixed-layout ``multiprocessing.shared_memory`` block. Readers in other local
+processes map the same block without copying and use a seqlock counter to
+get consistent snapshots without ever blocking the writer.
+"""
+
+from multiprocessing import shared_memory
+from typing import Optional, Set
+import logging
+import os
+import time
+
+import numpy as np
+
+from .mqtt.state import Go1State
+
+logger = logging.getLogger(__name__)
+
+# Fixed block layout shared by writer and readers
+STATE_DTYPE = np.dtype([
+    ("seq", "<u8"),  # Seqlock counter, odd while a write is in progress
+    ("packets", "<u8"),  # Number of decoded packets written so far
+    ("timestamp", "<f8"),  # time.time() of the last write
+    ("bms_soc", "<f4"),
+    ("bms_current", "<f4"),
+    ("bms_voltage", "<f4"),
+    ("bms_cycle", "<u4"),
+    ("bms_temps", "<f4", (4,)),
+    ("cell_voltages", "<f4", (10,)),
+    ("motor_temps", "<f4", (20,)),
+    ("obstacles", "u1", (4,)),
+    ("mode", "u1"),
+    ("gait_type", "u1"),
+], align=True)
+
+# Blocks exported by this process; their tracker registration belongs to the exporter
+_exported: Set[str] = set()
+
+def _attach(name: str, shared_tracker: bool = False) -> shared_memory.SharedMemory:
+    """
+    Attach to an existing block without letting this process unlink it on exit.
+
+    Args:
+        name: Block name
+        shared_tracker: This process shares the creator's resource tracker
+            (a multiprocessing child), so its registration must be left alone
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        pass
+
+    # Python < 3.13 registers every attached block with the resource tracker,
+    # which unlinks it when the reader exits; drop this block's registration
+    # unless it is the creator's own
+    shm = shared_memory.SharedMemory(name=name)
+    if os.name == "posix" and not shared_tracker and name not in _exported:
+        from multiprocessing import resource_tracker
+        resource_tracker.unregister(shm._name, "shared_memory")
+    return shm
+
+class StateExporter:
+    """Writes decoded Go1 state into a shared-memory block."""
+
+    def __init__(self, name: str):
+        """
+        Create (or take over) the shared-memory block.
+
+        Args:
+            name: Name readers use to attach to the block
+        """
+        try:
+            self.shm = shared_memory.SharedMemory(name=name, create=True,
+                                                  size=STATE_DTYPE.itemsize)
+        except FileExistsError:
+            logger.warning(f"Shared memory block {name} exists, reusing it")
+            # Tracked like a created block: the exporter owns and unlinks it
+            self.shm = shared_memory.SharedMemory(name=name)
+        self.name = name
+        _exported.add(name)
+        self._record = np.ndarray((), dtype=STATE_DTYPE, buffer=self.shm.buf)
+        self._record[()] = np.zeros((), dtype=STATE_DTYPE)
+
+    def write(self, state: Go1State) -> None:
+        """
+        Publish the current state to readers.
+
+        Args:
+            state: Decoded Go1 state
+        """
+        record = self._record
+        record["seq"] += 1  # Odd: readers retry until the write completes
+        record["packets"] += 1
+        record["timestamp"] = time.time()
+        bms = state.bms
+        record["bms_soc"] = bms.soc
+        record["bms_current"] = bms.current
+        record["bms_voltage"] = bms.voltage
+        record["bms_cycle"] = bms.cycle
+        record["bms_temps"] = bms.temps
+        record["cell_voltages"] = bms.cell_voltages
+        robot = state.robot
+        record["motor_temps"] = robot.temps
+        record["obstacles"] = robot.obstacles
+        record["mode"] = robot.mode
+        record["gait_type"] = robot.gait_type
+        record["seq"] += 1
+
+    def close(self, unlink: bool = True) -> None:
+        """
+        Release the block.
+
+        Args:
+            unlink: Also remove the block so no new reader can attach
+        """
+        self._record = None
+        self.shm.close()
+        if unlink:
+            _exported.discard(self.name)
+            try:
+                self.shm.unlink()
+            except FileNotFoundError:
+                pass
+
+class StateReader:
+    """Zero-copy reader for a block written by StateExporter."""
+
+    def __init__(self, name: str):
+        """
+        Attach to an existing block.
+
+        Args:
+            name: Name the exporter was created with
+        """
+        self.shm = _attach(name)
+        self.name = name
+        self.view = np.ndarray((), dtype=STATE_DTYPE, buffer=self.shm.buf)
+
+    @property
+    def seq(self) -> int:
+        """Current seqlock counter; changes whenever new state is written."""
+        return int(self.view["seq"])
+
+    def read(self, max_retries: int = 1000) -> Optional[np.void]:
+        """
+        Take a consistent snapshot of the latest state.
+
+        Args:
+            max_retries: Attempts before giving up on a torn read
+
+        Returns:
+            A structured record with the STATE_DTYPE fields, or None if no
+            consistent snapshot could be taken
+        """
+        view = self.view
+        for _ in range(max_retries):
+            before = int(view["seq"])
+            if before & 1:
+                continue
+            snapshot = view.copy()
+            if int(view["seq"]) == before:
+                return snapshot[()]
+        return None
+
+    def close(self) -> None:
+        """Detach from the block."""
+        self.view = None
+        self.shm.close()
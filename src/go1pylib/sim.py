@@ -0,0 +1,218 @@
+"""
+Local stand-in for a Go1 robot.
+
+SimulatedClient takes the place of the paho client inside Go1MQTT, so the
+whole library (motion, watchdog, metrics, listeners) runs without a broker.
+Telemetry packets in the robot's wire format can be built with
+``bms_packet``/``firmware_packet`` and fed through the normal decode path.
+HighCmdReceiver stands in for the robot's UDP high-level command port when
+testing ``transport.UDPHighCmdTransport``.
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple
+import socket
+import struct
+import threading
+
+import paho.mqtt.client as mqtt
+
+class SimulatedMessageInfo:
+    """Publish result that reports itself as sent immediately."""
+
+    def __init__(self, mid: int):
+        self.mid = mid
+        self.rc = mqtt.MQTT_ERR_SUCCESS
+
+    def is_published(self) -> bool:
+        return True
+
+    def wait_for_publish(self, timeout: Optional[float] = None) -> None:
+        return None
+
+class SimulatedClient:
+    """
+    Minimal paho client replacement that records what would be published.
+
+    Publishes complete synchronously and ``on_publish`` is never called, so
+    broker acknowledgements (and therefore adaptive rate probes) are not
+    simulated.
+    """
+
+    def __init__(self):
+        """Initialize an empty client."""
+        self.publish_counts: Dict[str, int] = {}
+        self.last_payloads: Dict[str, bytes] = {}
+        self._mid = 0
+        self._lock = threading.Lock()
+
+    def publish(self, topic: str, payload=None, qos: int = 0, retain: bool = False) -> SimulatedMessageInfo:
+        """Record a publish and return an already-sent message info."""
+        if isinstance(payload, str):
+            payload = payload.encode()
+        with self._lock:
+            self._mid += 1
+            self.publish_counts[topic] = self.publish_counts.get(topic, 0) + 1
+            self.last_payloads[topic] = payload
+            return SimulatedMessageInfo(self._mid)
+
+    def subscribe(self, topics, qos: int = 0):
+        return (mqtt.MQTT_ERR_SUCCESS, 0)
+
+    def max_queued_messages_set(self, count: int) -> None:
+        pass
+
+    def loop_start(self) -> None:
+        pass
+
+    def loop_stop(self) -> None:
+        pass
+
+    def disconnect(self) -> None:
+        pass
+
+class HighCmdReceiver:
+    """
+    Local UDP endpoint that decodes and checks HighCmd packets.
+
+    Listens on 127.0.0.1 (an ephemeral port by default) and can answer the
+    last sender with HighState packets.
+    """
+
+    def __init__(self, port: int = 0):
+        """
+        Start listening.
+
+        Args:
+            port: UDP port to bind (0 picks one; see ``address``)
+        """
+        from .transport import decode_highcmd
+
+        self._decode = decode_highcmd
+        self.commands: List['HighCmd'] = []
+        self.rejected = 0
+        self.sender: Optional[Tuple[str, int]] = None
+        self.received = threading.Condition()
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind(("127.0.0.1", port))
+        self.sock.settimeout(0.2)
+        self.address: Tuple[str, int] = self.sock.getsockname()
+        self._running = True
+        self._thread = threading.Thread(target=self._receive, name="go1-sim-highcmd", daemon=True)
+        self._thread.start()
+
+    def _receive(self) -> None:
+        while self._running:
+            try:
+                packet, sender = self.sock.recvfrom(2048)
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            with self.received:
+                self.sender = sender
+                try:
+                    self.commands.append(self._decode(packet))
+                except ValueError:
+                    self.rejected += 1
+                self.received.notify_all()
+
+    def wait_for(self, count: int, timeout: float = 2.0) -> bool:
+        """
+        Wait until at least ``count`` packets (valid or not) have arrived.
+
+        Args:
+            count: Number of packets to wait for
+            timeout: Seconds to wait
+
+        Returns:
+            True if they arrived in time
+        """
+        with self.received:
+            return self.received.wait_for(lambda: len(self.commands) + self.rejected >= count, timeout)
+
+    def send_state(self, payload: bytes) -> None:
+        """
+        Send a HighState packet to the last sender.
+
+        Args:
+            payload: Packet bytes
+        """
+        self.sock.sendto(payload, self.sender)
+
+    def close(self) -> None:
+        """Stop listening."""
+        self._running = False
+        self._thread.join()
+        self.sock.close()
+
+def attach(robot: 'Go1') -> SimulatedClient:
+    """
+    Replace a robot's MQTT client with a simulated one and mark it connected.
+
+    The watchdog is started as it would be on connect. Pair the robot with a
+    ``clock.VirtualClock`` (``{"clock": clock}`` in the MQTT options, then
+    ``clock.run(...)``) to run missions faster than real time.
+
+    Args:
+        robot: Go1 controller that has not been connected
+
+    Returns:
+        The simulated client
+    """
+    client = SimulatedClient()
+    robot.mqtt.client = client
+    robot.mqtt.connected = True
+    if robot.mqtt.watchdog:
+        robot.mqtt.watchdog.start()
+    return client
+
+def feed(robot: 'Go1', topic: str, payload: bytes) -> None:
+    """
+    Deliver a telemetry packet through the normal receive path.
+
+    Args:
+        robot: Go1 controller
+        topic: Topic the packet arrives on
+        payload: Packet in the robot's wire format
+    """
+    robot.mqtt.transport._deliver(topic, payload)
+
+def bms_packet(soc: int = 80, current: int = -3000, cycle: int = 10,
+               temps: Sequence[int] = (30, 30, 30, 30),
+               cell_voltages: Sequence[int] = (4000,) * 10) -> bytes:
+    """
+    Encode a ``bms/state`` packet.
+
+    Args:
+        soc: State of charge (%)
+        current: Current (mA, negative while discharging)
+        cycle: Charge cycle count
+        temps: Four battery temperatures (C)
+        cell_voltages: Ten cell voltages (mV)
+
+    Returns:
+        Packet bytes
+    """
+    return (bytes([1, 0, 0, soc]) + struct.pack("<iH", current, cycle)
+            + bytes(temps) + struct.pack("<10H", *cell_voltages))
+
+def firmware_packet(temps: Sequence[int] = (40,) * 20, mode: int = 1, gait_type: int = 1,
+                    obstacles: Sequence[int] = (255, 255, 255, 255)) -> bytes:
+    """
+    Encode a ``firmware/version`` packet.
+
+    Args:
+        temps: Twenty motor temperatures (C)
+        mode: Robot mode
+        gait_type: Gait type
+        obstacles: Obstacle distances (front, left, right, back)
+
+    Returns:
+        Packet bytes
+    """
+    packet = bytearray(44)
+    packet[8:28] = bytes(temps)
+    packet[28] = mode
+    packet[29] = gait_type
+    packet[30:34] = bytes(obstacles)
+    return bytes(packet)
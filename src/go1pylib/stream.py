@@ -0,0 +1,171 @@
+"""
+Async iterator streaming of Go1 state.
+
+State is decoded on the paho network thread. The hub takes one snapshot
+per packet and hands it to every interested stream via
+``call_soon_threadsafe``, so consumers are plain coroutines and a slow
+consumer never holds up network I/O or other consumers.
+"""
+
+from collections import deque
+from copy import deepcopy
+from typing import Deque, Iterable, List, Optional
+import asyncio
+import logging
+import threading
+
+from .mqtt.state import Go1State
+
+logger = logging.getLogger(__name__)
+
+POLICIES = ("latest", "buffer", "block")
+
+class StateStream:
+    """
+    Async iterator over state snapshots with a selectable backpressure policy.
+
+    Policies:
+        - ``latest``: keep only the newest snapshot; older ones are dropped
+        - ``buffer``: keep up to ``maxsize`` snapshots, dropping the oldest
+        - ``block``: snapshots beyond ``maxsize`` wait in order in an
+          overflow list of up to ``maxsize`` more and are counted as delayed;
+          only snapshots beyond that are dropped
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop,
+                 topics: Optional[Iterable[str]] = None,
+                 policy: str = "latest", maxsize: int = 64):
+        """
+        Initialize the stream.
+
+        Args:
+            loop: Event loop the consumer runs on
+            topics: Only deliver snapshots caused by these topics (all if None)
+            policy: One of "latest", "buffer" or "block"
+            maxsize: Queue bound for the "buffer" and "block" policies
+        """
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown policy {policy!r}, expected one of {POLICIES}")
+        self.loop = loop
+        self.topics = frozenset(topics) if topics is not None else None
+        self.policy = policy
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=1 if policy == "latest" else maxsize)
+        self.dropped = 0
+        self.delayed = 0
+        self.closed = False
+        self._overflow: Deque[Go1State] = deque()
+        self._hub: Optional['StateStreamHub'] = None
+
+    def wants(self, topic: str) -> bool:
+        """Whether a packet on ``topic`` should be delivered to this stream."""
+        return not self.closed and (self.topics is None or topic in self.topics)
+
+    def push(self, snapshot: Go1State) -> None:
+        """
+        Hand a snapshot over from any thread.
+
+        Args:
+            snapshot: Immutable-by-convention state snapshot
+        """
+        try:
+            self.loop.call_soon_threadsafe(self._deliver, snapshot)
+        except RuntimeError:
+            # Consumer loop already closed
+            self.closed = True
+
+    def _deliver(self, snapshot: Go1State) -> None:
+        """Enqueue a snapshot according to the policy. Runs on the consumer loop."""
+        if self.closed:
+            return
+        if self.policy == "block":
+            if self._overflow or self.queue.full():
+                if len(self._overflow) >= self.queue.maxsize:
+                    self.dropped += 1
+                    return
+                self.delayed += 1
+                self._overflow.append(snapshot)
+            else:
+                self.queue.put_nowait(snapshot)
+            return
+
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(snapshot)
+
+    def __aiter__(self) -> 'StateStream':
+        return self
+
+    async def __anext__(self) -> Go1State:
+        if self.closed and self.queue.empty():
+            raise StopAsyncIteration
+        snapshot = await self.queue.get()
+        if snapshot is None:
+            raise StopAsyncIteration
+        if self._overflow:
+            self.queue.put_nowait(self._overflow.popleft())
+        return snapshot
+
+    def close(self) -> None:
+        """Stop delivery and end iteration once queued snapshots are consumed."""
+        if self.closed:
+            return
+        self.closed = True
+        if self._hub:
+            self._hub.remove(self)
+        # Overflow snapshots will now never be consumed
+        self.dropped += len(self._overflow)
+        self._overflow.clear()
+        if self.queue.empty():
+            # Wake a consumer waiting in __anext__; otherwise it stops once drained
+            self.queue.put_nowait(None)
+
+    async def __aenter__(self) -> 'StateStream':
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.close()
+
+class StateStreamHub:
+    """Fans decoded state out to open streams, snapshotting once per packet."""
+
+    def __init__(self):
+        """Initialize an empty hub."""
+        self._streams: List[StateStream] = []
+        self._lock = threading.Lock()
+
+    def add(self, stream: StateStream) -> None:
+        """
+        Start delivering to a stream.
+
+        Args:
+            stream: The stream to add
+        """
+        with self._lock:
+            stream._hub = self
+            self._streams = self._streams + [stream]
+
+    def remove(self, stream: StateStream) -> None:
+        """
+        Stop delivering to a stream.
+
+        Args:
+            stream: The stream to remove
+        """
+        with self._lock:
+            self._streams = [s for s in self._streams if s is not stream]
+
+    def observe(self, topic: str, state: Go1State) -> None:
+        """
+        State listener: snapshot the state if any stream wants this topic.
+
+        Args:
+            topic: Topic the packet arrived on
+            state: Go1 state after decoding it
+        """
+        targets = [s for s in self._streams if s.wants(topic)]
+        if not targets:
+            return
+        snapshot = deepcopy(state)
+        for stream in targets:
+            stream.push(snapshot)
@@ -0,0 +1,125 @@
+"""
+Synchronous facade for the Go1 robot.
+
+Go1Sync owns one event loop running on a background thread and forwards
+every call to it with ``run_coroutine_threadsafe``. Scripts and notebooks
+can drive the robot without ``asyncio.run`` wrappers, while moves are still
+timed by a long-lived loop and the MQTT connection is reused across calls.
+"""
+
+from typing import Any, Callable, Dict, Optional
+import asyncio
+import functools
+import inspect
+import logging
+import threading
+
+from .go1 import Go1
+
+logger = logging.getLogger(__name__)
+
+class Go1Sync:
+    """
+    Blocking wrapper around a Go1 controller.
+
+    Every public Go1 method is available with the same arguments. By default
+    a call blocks until it has finished (for motion, until the move is over)
+    and returns its result; pass ``wait=False`` to get a
+    ``concurrent.futures.Future`` instead. Cancelling that future cancels
+    the move and stops the robot.
+
+    Usage::
+
+        with Go1Sync() as dog:
+            dog.set_mode(Go1Mode.WALK)
+            dog.go_forward(0.3, 2000)
+            move = dog.turn_left(0.5, 5000, wait=False)
+            move.cancel()
+    """
+
+    def __init__(self, mqtt_options: Optional[Dict[str, Any]] = None,
+                 robot: Optional[Go1] = None):
+        """
+        Start the background loop.
+
+        Args:
+            mqtt_options: Options for a new Go1 controller
+            robot: Existing controller to wrap instead of creating one
+        """
+        self.robot = robot or Go1(mqtt_options)
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever,
+                                        name="go1-sync-loop", daemon=True)
+        self._thread.start()
+        self._methods: Dict[str, Callable[..., Any]] = {}
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """The background event loop all calls run on."""
+        return self._loop
+
+    def init(self) -> None:
+        """Connect to the robot."""
+        self.call(self.robot.init)
+
+    def call(self, fn: Callable[..., Any], *args: Any, wait: bool = True,
+             timeout: Optional[float] = None, **kwargs: Any) -> Any:
+        """
+        Run a function on the background loop, awaiting its result if needed.
+
+        Args:
+            fn: Plain function, coroutine function or function returning an awaitable
+            *args: Positional arguments for fn
+            wait: Block until fn has finished and return its result
+            timeout: Seconds to wait before raising TimeoutError
+            **kwargs: Keyword arguments for fn
+
+        Returns:
+            The result if wait is True, otherwise a Future for it
+        """
+        if threading.current_thread() is self._thread:
+            raise RuntimeError("Go1Sync cannot be called from its own event loop; use the Go1 API there")
+        future = asyncio.run_coroutine_threadsafe(self._invoke(fn, args, kwargs), self._loop)
+        return future.result(timeout) if wait else future
+
+    @staticmethod
+    async def _invoke(fn: Callable[..., Any], args: tuple, kwargs: Dict[str, Any]) -> Any:
+        """Call fn on the loop and await its result if it is awaitable (coroutine, MotionHandle)."""
+        result = fn(*args, **kwargs)
+        if inspect.isawaitable(result):
+            result = await result
+        return result
+
+    def __getattr__(self, name: str) -> Any:
+        # Only reached for names not defined on Go1Sync itself
+        if name.startswith("_"):
+            raise AttributeError(name)
+        attr = getattr(self.robot, name)
+        if not callable(attr):
+            return attr
+        method = self._methods.get(name)
+        if method is None:
+            method = functools.partial(self.call, attr)
+            functools.update_wrapper(method, attr)
+            self._methods[name] = method
+        return method
+
+    def close(self) -> None:
+        """Stop any motion, disconnect and shut the background loop down."""
+        if not self._loop.is_running():
+            return
+        try:
+            # Disconnecting also stops the motion publisher with a zero frame
+            self.call(self.robot.mqtt.disconnect, timeout=5.0)
+        except Exception as e:
+            logger.error(f"Error shutting down Go1Sync: {e}")
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+    def __enter__(self) -> 'Go1Sync':
+        self.init()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,211 @@
+"""
+High-rate teleop input bridge.
+
+Setpoint packets arrive over UDP (or a TCP stream) and overwrite a single
+latest-wins slot. One long-running setpoint stream on the movement
+publisher samples that slot once per tick, so input reaches the robot
+within one publish period no matter how fast packets arrive, and a source
+that goes quiet is replaced by zero frames after its timeout.
+
+Packet format (little endian, 20 bytes)::
+
+    uint32  sequence number, increasing per source (wraps around)
+    float32 left_right, turn, look, backward_forward  (-1 to 1)
+"""
+
+from typing import Any, Dict, Iterator, Optional, Tuple
+import asyncio
+import logging
+import math
+import struct
+
+import numpy as np
+
+from .movement import MotionHandle
+
+logger = logging.getLogger(__name__)
+
+PACKET = struct.Struct("<I4f")
+
+def encode_setpoint(seq: int, left_right: float, turn: float, look: float,
+                    backward_forward: float) -> bytes:
+    """
+    Encode a teleop setpoint packet.
+
+    Args:
+        seq: Sequence number (taken modulo 2**32)
+        left_right: Left/right movement (-1 to 1)
+        turn: Turn left/right (-1 to 1)
+        look: Look up/down (-1 to 1)
+        backward_forward: Forward/backward movement (-1 to 1)
+
+    Returns:
+        Packet bytes
+    """
+    return PACKET.pack(seq & 0xFFFFFFFF, left_right, turn, look, backward_forward)
+
+class _DatagramProtocol(asyncio.DatagramProtocol):
+    """Hands every received datagram to a TeleopBridge."""
+
+    def __init__(self, bridge: 'TeleopBridge'):
+        self.bridge = bridge
+
+    def datagram_received(self, data: bytes, addr: Tuple[str, int]) -> None:
+        self.bridge.receive(data, addr)
+
+class TeleopBridge:
+    """Feeds network setpoints into the robot's movement publisher."""
+
+    def __init__(self, mqtt: Any, timeout: float = 0.2, priority: int = 0):
+        """
+        Initialize the bridge.
+
+        Args:
+            mqtt: Go1MQTT client to drive
+            timeout: Seconds without packets from the controlling source
+                before zero frames are sent instead
+            priority: Priority of the teleop setpoint stream
+        """
+        self.mqtt = mqtt
+        self.timeout = timeout
+        self.priority = priority
+        self.handle: Optional[MotionHandle] = None
+
+        self.packets = 0
+        self.malformed = 0
+        self.reordered = 0
+        self.timeouts = 0
+
+        self._frame = np.zeros(4, dtype=np.float32)
+        self._source: Optional[Any] = None
+        self._last_packet = 0.0
+        self._last_seq: Dict[Any, Tuple[int, float]] = {}  # source -> (sequence, receive time)
+        self._last_sweep = -math.inf
+        self._timed_out = True
+        self._last_submit = -math.inf
+        self._transport: Optional[asyncio.BaseTransport] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def port(self) -> Optional[int]:
+        """Bound port, useful after listening on port 0."""
+        if self._transport is not None:
+            return self._transport.get_extra_info("sockname")[1]
+        if self._server is not None:
+            return self._server.sockets[0].getsockname()[1]
+        return None
+
+    async def start(self, host: str = "0.0.0.0", port: int = 9150, protocol: str = "udp") -> None:
+        """
+        Start listening and streaming setpoints.
+
+        Args:
+            host: Interface to bind to
+            port: Port to listen on
+            protocol: "udp" for datagrams or "tcp" for a packet stream
+        """
+        self._loop = asyncio.get_running_loop()
+        if protocol == "udp":
+            self._transport, _ = await self._loop.create_datagram_endpoint(
+                lambda: _DatagramProtocol(self), local_addr=(host, port)
+            )
+        elif protocol == "tcp":
+            self._server = await asyncio.start_server(self._handle_stream, host, port)
+        else:
+            raise ValueError(f"Unknown protocol {protocol!r}, expected 'udp' or 'tcp'")
+        logger.info(f"Teleop bridge listening on {protocol}://{host}:{self.port}")
+        self._submit()
+
+    async def _handle_stream(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Read fixed-size packets from one TCP client."""
+        source = writer.get_extra_info("peername")
+        try:
+            while True:
+                self.receive(await reader.readexactly(PACKET.size), source)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self._last_seq.pop(source, None)
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    def receive(self, data: bytes, source: Any) -> None:
+        """
+        Take one packet into the setpoint slot.
+
+        Args:
+            data: Packet bytes
+            source: Sender identity (address), used for ordering and timeouts
+        """
+        if len(data) != PACKET.size:
+            self.malformed += 1
+            return
+        seq, *values = PACKET.unpack(data)
+        if not all(math.isfinite(v) for v in values):
+            self.malformed += 1
+            return
+
+        now = self._loop.time()
+        if now - self._last_sweep > self.timeout:
+            self._evict_idle_sources(now)
+        last = self._last_seq.get(source)
+        if last is not None:
+            # Serial number arithmetic so the sequence may wrap around
+            ahead = (seq - last[0]) & 0xFFFFFFFF
+            if ahead == 0 or ahead >= 0x80000000:
+                self.reordered += 1
+                return
+        self._last_seq[source] = (seq, now)
+
+        np.clip(values, -1.0, 1.0, out=self._frame)
+        self._source = source
+        self._last_packet = now
+        self._timed_out = False
+        self.packets += 1
+        if self.handle is None or self.handle.done:
+            self._submit()
+
+    def _evict_idle_sources(self, now: float) -> None:
+        """Forget the sequence numbers of sources silent for longer than the timeout."""
+        self._last_sweep = now
+        idle = [source for source, (_, seen) in self._last_seq.items()
+                if now - seen > self.timeout]
+        for source in idle:
+            del self._last_seq[source]
+
+    def _submit(self) -> None:
+        """(Re)start the setpoint stream, at most once per timeout after preemption."""
+        now = self._loop.time()
+        if now - self._last_submit < self.timeout:
+            return
+        self._last_submit = now
+        self.handle = self.mqtt.send_setpoint_stream(
+            self._frames(), priority=self.priority, policy="reject"
+        )
+
+    def _frames(self) -> Iterator[np.ndarray]:
+        """Yield the latest setpoint each tick, or zeros once the source is stale."""
+        zero = np.zeros(4, dtype=np.float32)
+        while True:
+            if not self._timed_out and self._loop.time() - self._last_packet > self.timeout:
+                self._timed_out = True
+                self.timeouts += 1
+                # A restarted controller may begin again from a lower sequence number
+                self._last_seq.pop(self._source, None)
+                logger.warning(f"Teleop source {self._source} timed out, sending zero frames")
+            yield zero if self._timed_out else self._frame.copy()
+
+    def stop(self) -> None:
+        """Stop listening and end the setpoint stream with a zero frame."""
+        if self._transport is not None:
+            self._transport.close()
+            self._transport = None
+        if self._server is not None:
+            self._server.close()
+            self._server = None
+        if self.handle is not None:
+            self.handle.cancel()
@@ -0,0 +1,178 @@
+"""
+Streaming thermal monitor over the Go1's 20 motor temperatures.
+
+Rolling statistics live in fixed NumPy arrays that are updated in place on
+every firmware/version packet, so each packet costs a handful of vectorised
+operations regardless of how long the robot has been running.
+"""
+
+from typing import Callable, Optional
+import logging
+import math
+import time
+
+import numpy as np
+
+from .mqtt.state import Go1State
+from .mqtt.topics import FirmwareSubTopic
+
+logger = logging.getLogger(__name__)
+
+NUM_MOTORS = 20
+
+# Stick frame axes that carry a speed setpoint (left_right, turn, backward_forward)
+_SPEED_AXES = np.array([1.0, 1.0, 0.0, 1.0], dtype=np.float32)
+
+class ThermalMonitor:
+    """
+    Tracks per-motor temperature statistics and throttles setpoints when hot.
+
+    Events are passed to ``on_event`` as ``(kind, motor, value)``:
+        - ``"warning"``: a motor's smoothed temperature reached ``warn_temp``
+        - ``"limit"``: a motor's smoothed temperature reached ``limit_temp``
+        - ``"rise"``: a motor is heating faster than ``max_rise_rate``
+        - ``"clear"``: a motor cooled back below ``warn_temp - hysteresis``
+    Each event fires once per crossing, not on every packet.
+    """
+
+    def __init__(self, on_event: Optional[Callable[[str, int, float], None]] = None,
+                 warn_temp: float = 65.0, limit_temp: float = 80.0,
+                 max_rise_rate: float = 0.5, min_scale: float = 0.2,
+                 hysteresis: float = 3.0, mean_tau: float = 5.0,
+                 slope_tau: float = 20.0, peak_decay: float = 0.1):
+        """
+        Initialize the monitor.
+
+        Args:
+            on_event: Called with (kind, motor, value) on the decode thread
+            warn_temp: Temperature (C) at which throttling starts
+            limit_temp: Temperature (C) at which setpoints are scaled to min_scale
+            max_rise_rate: Heating rate (C per second) that raises a "rise" event
+            min_scale: Setpoint scale applied at or above limit_temp
+            hysteresis: Cooling (C) below warn_temp required to clear a warning
+            mean_tau: Time constant (s) of the rolling mean
+            slope_tau: Time constant (s) of the rolling slope
+            peak_decay: Rate (C per second) at which the rolling max falls back
+        """
+        if limit_temp <= warn_temp:
+            raise ValueError("limit_temp must be above warn_temp")
+        self.on_event = on_event
+        self.warn_temp = warn_temp
+        self.limit_temp = limit_temp
+        self.max_rise_rate = max_rise_rate
+        self.min_scale = min_scale
+        self.hysteresis = hysteresis
+        self.mean_tau = mean_tau
+        self.slope_tau = slope_tau
+        self.peak_decay = peak_decay
+
+        self.mean = np.zeros(NUM_MOTORS)
+        self.max = np.zeros(NUM_MOTORS)
+        self.slope = np.zeros(NUM_MOTORS)
+        self.samples = 0
+        self.scale = 1.0
+
+        self._temps = np.zeros(NUM_MOTORS)
+        self._previous_mean = np.zeros(NUM_MOTORS)
+        self._warned = np.zeros(NUM_MOTORS, dtype=bool)
+        self._limited = np.zeros(NUM_MOTORS, dtype=bool)
+        self._rising = np.zeros(NUM_MOTORS, dtype=bool)
+        self._last_time: Optional[float] = None
+
+    @property
+    def hottest(self) -> int:
+        """Index of the motor with the highest rolling mean."""
+        return int(np.argmax(self.mean))
+
+    def update(self, temps, timestamp: Optional[float] = None) -> None:
+        """
+        Fold one set of motor temperatures into the statistics.
+
+        Args:
+            temps: 20 motor temperatures (C)
+            timestamp: Packet time in seconds (defaults to the monotonic clock)
+        """
+        if timestamp is None:
+            timestamp = time.monotonic()
+        self._temps[:] = temps
+
+        if self._last_time is None:
+            self.mean[:] = self._temps
+            self.max[:] = self._temps
+        else:
+            dt = timestamp - self._last_time
+            if dt <= 0:
+                return
+            np.copyto(self._previous_mean, self.mean)
+            self.mean += (1.0 - math.exp(-dt / self.mean_tau)) * (self._temps - self.mean)
+            rate = (self.mean - self._previous_mean) / dt
+            self.slope += (1.0 - math.exp(-dt / self.slope_tau)) * (rate - self.slope)
+            self.max -= self.peak_decay * dt
+            np.maximum(self.max, self._temps, out=self.max)
+        self._last_time = timestamp
+        self.samples += 1
+
+        hottest = float(self.mean.max())
+        if hottest <= self.warn_temp:
+            self.scale = 1.0
+        else:
+            excess = min((hottest - self.warn_temp) / (self.limit_temp - self.warn_temp), 1.0)
+            self.scale = 1.0 - excess * (1.0 - self.min_scale)
+
+        self._check_events()
+
+    def _check_events(self) -> None:
+        """Fire edge-triggered events for threshold and rate-of-rise crossings."""
+        warned = self.mean >= self.warn_temp
+        cleared = self._warned & (self.mean < self.warn_temp - self.hysteresis)
+        limited = self.mean >= self.limit_temp
+        rising = self.slope >= self.max_rise_rate
+        # Only the events are skipped on quiet packets; the flags always follow
+        if warned.any() or limited.any() or cleared.any() or rising.any() or self._rising.any():
+            self._fire("warning", warned & ~self._warned, self.mean)
+            self._fire("limit", limited & ~self._limited, self.mean)
+            self._fire("rise", rising & ~self._rising, self.slope)
+            self._fire("clear", cleared, self.mean)
+        self._warned = (self._warned | warned) & ~cleared
+        self._limited = limited
+        self._rising = rising
+
+    def _fire(self, kind: str, mask: np.ndarray, values: np.ndarray) -> None:
+        """Log one ``kind`` event per motor set in mask and pass each to ``on_event``."""
+        for motor in np.flatnonzero(mask):
+            value = float(values[motor])
+            if kind == "clear":
+                logger.info(f"Motor {motor} cooled to {value:.1f}C")
+            else:
+                logger.warning(f"Thermal {kind} on motor {motor}: {value:.2f}")
+            if self.on_event:
+                try:
+                    self.on_event(kind, int(motor), value)
+                except Exception as e:
+                    logger.error(f"Error in thermal event handler: {e}")
+
+    def observe(self, topic: str, state: Go1State) -> None:
+        """
+        State listener: update on firmware/version packets.
+
+        Args:
+            topic: Topic the packet arrived on
+            state: Go1 state after decoding it
+        """
+        if topic == FirmwareSubTopic.FIRMWARE_VERSION:
+            self.update(state.robot.temps)
+
+    def filter(self, frame: np.ndarray) -> np.ndarray:
+        """
+        Scale speed setpoints down while motors are hot.
+
+        Args:
+            frame: Stick frame (left_right, turn, look, backward_forward)
+
+        Returns:
+            The frame itself if no throttling applies, otherwise a scaled copy
+        """
+        if self.scale >= 1.0:
+            return frame
+        factor = 1.0 - _SPEED_AXES * (1.0 - self.scale)
+        return (frame * factor).astype(np.float32)
@@ -0,0 +1,395 @@
+"""
+Pluggable transports between go1pylib and the robot.
+
+A transport moves four things: stick setpoints, mode commands, LED commands
+and (inbound) telemetry packets. Go1MQTT keeps doing everything above the
+wire (motion ownership, watchdog, reflex, filters, decoding, metrics) and
+hands the wire work to the transport configured as ``MQTTConfig.transport``,
+or to an ``MQTTTransport`` for the robot's broker when none is configured.
+
+Implementations:
+    MQTTTransport         the robot's MQTT broker (go1pylib.mqtt.transport)
+    LoopbackTransport     in-memory, for benchmarks and tests
+    UDPHighCmdTransport   raw UDP high-level commands (legged_sdk HighCmd)
+"""
+
+from dataclasses import dataclass
+from typing import Any, Callable, List, Optional, Tuple
+import logging
+import socket
+import struct
+import threading
+
+import numpy as np
+
+from .go1 import Go1Mode
+
+logger = logging.getLogger(__name__)
+
+TelemetryCallback = Callable[[str, bytes], None]
+
+class Transport:
+    """
+    Interface every transport implements.
+
+    The owner sets ``on_telemetry``, ``on_connection`` and ``on_published``
+    before ``connect``. ``on_telemetry`` is called with (topic, payload) for
+    every inbound packet and ``on_connection`` with the new link state, both
+    possibly from another thread. ``publish_setpoint`` must never block.
+    """
+
+    name = "transport"
+    # Whether publish_setpoint can return in-flight messages whose delivery
+    # is reported through on_published (and publish_probe is available)
+    supports_acks = False
+
+    def __init__(self):
+        self.connected = False
+        self.on_telemetry: Optional[TelemetryCallback] = None
+        self.on_connection: Optional[Callable[[bool], None]] = None
+        self.on_published: Optional[Callable[[int], None]] = None
+
+    @property
+    def ready(self) -> bool:
+        """Whether publish calls can be made."""
+        return self.connected
+
+    def connect(self) -> None:
+        """Open the link; raises on failure."""
+        raise NotImplementedError
+
+    def disconnect(self) -> None:
+        """Close the link."""
+        raise NotImplementedError
+
+    def subscribe(self, topics: List[str]) -> None:
+        """
+        Ask for telemetry on topics. Transports that deliver everything
+        they receive ignore this.
+
+        Args:
+            topics: Telemetry topics
+        """
+
+    def publish_setpoint(self, payload: bytes) -> Optional[Any]:
+        """
+        Send one stick frame.
+
+        Args:
+            payload: float32 frame (left_right, turn, look, backward_forward)
+
+        Returns:
+            A message still in flight (with ``mid`` and ``is_published()``),
+            whose delivery ``on_published`` reports, or None once it is sent
+        """
+        raise NotImplementedError
+
+    def publish_mode(self, mode: Go1Mode) -> None:
+        """
+        Send a mode change.
+
+        Args:
+            mode: Target mode
+        """
+        raise NotImplementedError
+
+    def publish_led(self, r: int, g: int, b: int) -> None:
+        """
+        Send an LED colour.
+
+        Args:
+            r: Red value (0-255)
+            g: Green value (0-255)
+            b: Blue value (0-255)
+        """
+        raise NotImplementedError
+
+    def publish_probe(self) -> int:
+        """
+        Send an acknowledged probe for round-trip measurement.
+
+        Returns:
+            Message id that ``on_published`` reports when the probe is acknowledged
+        """
+        raise NotImplementedError(f"The {self.name} transport has no acknowledgements")
+
+    def _set_connected(self, connected: bool) -> None:
+        """Record the link state and tell the owner."""
+        self.connected = connected
+        if self.on_connection:
+            try:
+                self.on_connection(connected)
+            except Exception as e:
+                logger.error(f"Error handling {self.name} connection change: {e}")
+
+    def _deliver(self, topic: str, payload: bytes) -> None:
+        """Pass an inbound packet to the owner."""
+        if self.on_telemetry:
+            try:
+                self.on_telemetry(topic, payload)
+            except Exception as e:
+                logger.error(f"Error handling {self.name} telemetry: {e}")
+
+class LoopbackTransport(Transport):
+    """
+    In-memory transport that keeps what was sent and injects telemetry.
+
+    Publishing costs a few attribute writes, so benchmarks over loopback
+    measure the library's own overhead.
+    """
+
+    name = "loopback"
+
+    def __init__(self):
+        super().__init__()
+        self.setpoints = 0
+        self.last_setpoint: Optional[bytes] = None
+        self.modes: List[Go1Mode] = []
+        self.leds: List[Tuple[int, int, int]] = []
+
+    def connect(self) -> None:
+        self._set_connected(True)
+
+    def disconnect(self) -> None:
+        self._set_connected(False)
+
+    def publish_setpoint(self, payload: bytes) -> None:
+        self.setpoints += 1
+        self.last_setpoint = payload
+
+    def publish_mode(self, mode: Go1Mode) -> None:
+        self.modes.append(mode)
+
+    def publish_led(self, r: int, g: int, b: int) -> None:
+        self.leds.append((r, g, b))
+
+    def inject(self, topic: str, payload: bytes) -> None:
+        """
+        Deliver a telemetry packet as if it came from the robot.
+
+        Args:
+            topic: Telemetry topic
+            payload: Packet in the robot's wire format
+        """
+        self._deliver(topic, payload)
+
+# legged_sdk HighCmd for the Go1: 129 bytes, little endian
+HIGHCMD = struct.Struct("<2BBB2I2IHBBBff2f3f2ff4B12B40BII")
+# The SDK checksums (sizeof(HighCmd) >> 2) - 1 whole words
+HIGHCMD_CRC_SPAN = ((HIGHCMD.size >> 2) - 1) * 4
+HIGHCMD_HEAD = (0xFE, 0xEF)
+HIGHLEVEL = 0xEE
+HIGHSTATE_TOPIC = "udp/highstate"
+
+# Go1Mode -> (HighCmd mode, gait type)
+HIGHCMD_MODES = {
+    Go1Mode.STAND: (1, 0),
+    Go1Mode.WALK: (2, 1),
+    Go1Mode.RUN: (2, 2),
+    Go1Mode.CLIMB: (2, 3),
+    Go1Mode.STAND_DOWN: (5, 0),
+    Go1Mode.STAND_UP: (6, 0),
+    Go1Mode.DAMPING: (7, 0),
+    Go1Mode.RECOVER_STAND: (8, 0),
+    Go1Mode.STRAIGHT_HAND1: (11, 0),
+    Go1Mode.DANCE1: (12, 0),
+    Go1Mode.DANCE2: (13, 0),
+}
+
+def highcmd_crc(data: bytes) -> int:
+    """
+    Unitree's CRC32 (polynomial 0x04C11DB7, MSB first over 32-bit words).
+
+    Args:
+        data: Bytes to check; length must be a multiple of 4
+
+    Returns:
+        CRC value
+    """
+    crc = 0xFFFFFFFF
+    for (word,) in struct.iter_unpack("<I", data):
+        for bit in range(31, -1, -1):
+            if crc & 0x80000000:
+                crc = ((crc << 1) ^ 0x04C11DB7) & 0xFFFFFFFF
+            else:
+                crc = (crc << 1) & 0xFFFFFFFF
+            if word >> bit & 1:
+                crc ^= 0x04C11DB7
+    return crc
+
+@dataclass
+class HighCmdLimits:
+    """Scale from stick axes (-1 to 1) to HighCmd units."""
+    forward_speed: float = 0.6  # m/s at full stick
+    lateral_speed: float = 0.3  # m/s
+    yaw_speed: float = 2.0  # rad/s
+    body_roll: float = 0.3  # rad, stand mode
+    body_pitch: float = 0.3  # rad
+    body_yaw: float = 0.3  # rad
+    body_height: float = 0.1  # m
+
+@dataclass
+class HighCmd:
+    """Fields of a HighCmd packet that go1pylib drives."""
+    mode: int = 0
+    gait_type: int = 0
+    body_height: float = 0.0
+    euler: Tuple[float, float, float] = (0.0, 0.0, 0.0)
+    velocity: Tuple[float, float] = (0.0, 0.0)
+    yaw_speed: float = 0.0
+    led: Tuple[int, int, int] = (0, 0, 0)
+
+def encode_highcmd(cmd: HighCmd) -> bytes:
+    """
+    Pack a HighCmd packet including its CRC.
+
+    Args:
+        cmd: Command fields
+
+    Returns:
+        129-byte packet
+    """
+    fields = (
+        *HIGHCMD_HEAD, HIGHLEVEL, 0,  # head, levelFlag, frameReserve
+        0, 0, 0, 0,  # SN, version
+        0,  # bandWidth
+        cmd.mode, cmd.gait_type, 0,  # mode, gaitType, speedLevel
+        0.0, cmd.body_height,  # footRaiseHeight, bodyHeight
+        0.0, 0.0,  # position
+        *cmd.euler,
+        *cmd.velocity,
+        cmd.yaw_speed,
+        0, 0, 0, 0,  # bms
+        *(cmd.led * 4),
+        *([0] * 40),  # wirelessRemote
+        0, 0,  # reserve, crc
+    )
+    packet = bytearray(HIGHCMD.pack(*fields))
+    struct.pack_into("<I", packet, HIGHCMD.size - 4, highcmd_crc(packet[:HIGHCMD_CRC_SPAN]))
+    return bytes(packet)
+
+def decode_highcmd(packet: bytes) -> HighCmd:
+    """
+    Unpack and verify a HighCmd packet.
+
+    Args:
+        packet: 129-byte packet
+
+    Returns:
+        The command fields
+
+    Raises:
+        ValueError: If the size, header or CRC is wrong
+    """
+    if len(packet) != HIGHCMD.size:
+        raise ValueError(f"HighCmd must be {HIGHCMD.size} bytes, got {len(packet)}")
+    fields = HIGHCMD.unpack(packet)
+    if fields[:3] != (*HIGHCMD_HEAD, HIGHLEVEL):
+        raise ValueError("Not a high-level command")
+    if fields[-1] != highcmd_crc(packet[:HIGHCMD_CRC_SPAN]):
+        raise ValueError("HighCmd CRC mismatch")
+    return HighCmd(
+        mode=fields[9], gait_type=fields[10], body_height=fields[13],
+        euler=tuple(fields[16:19]), velocity=tuple(fields[19:21]),
+        yaw_speed=fields[21], led=tuple(fields[26:29]),
+    )
+
+class UDPHighCmdTransport(Transport):
+    """
+    Raw UDP high-level commands, as sent by Unitree's legged_sdk.
+
+    Stick frames are translated to velocities in walking modes and to body
+    pose in stand mode. HighState packets from the robot are delivered
+    undecoded on the ``udp/highstate`` topic.
+    """
+
+    name = "udp"
+
+    def __init__(self, host: str = "192.168.123.161", port: int = 8082,
+                 local_port: int = 8090, limits: Optional[HighCmdLimits] = None):
+        """
+        Initialize the transport.
+
+        Args:
+            host: Robot address for high-level commands
+            port: Robot UDP port
+            local_port: Local UDP port the robot answers to (0 picks one)
+            limits: Stick-to-HighCmd scaling
+        """
+        super().__init__()
+        self.address = (host, port)
+        self.local_port = local_port
+        self.limits = limits or HighCmdLimits()
+        # Walk until told otherwise, so stick frames move the robot like over MQTT
+        mode, gait_type = HIGHCMD_MODES[Go1Mode.WALK]
+        self.cmd = HighCmd(mode=mode, gait_type=gait_type)
+        self.sock: Optional[socket.socket] = None
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def connect(self) -> None:
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind(("0.0.0.0", self.local_port))
+        self.sock.settimeout(0.2)
+        self._set_connected(True)
+        self._thread = threading.Thread(target=self._receive, name="go1-udp-highstate", daemon=True)
+        self._thread.start()
+
+    def _receive(self) -> None:
+        """Deliver HighState packets until disconnected."""
+        while self.connected:
+            try:
+                payload, _ = self.sock.recvfrom(2048)
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            self._deliver(HIGHSTATE_TOPIC, payload)
+
+    def disconnect(self) -> None:
+        self._set_connected(False)
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+        if self.sock:
+            self.sock.close()
+            self.sock = None
+
+    def _send(self) -> None:
+        """Send the current command. Caller holds the lock."""
+        if self.sock is None:
+            return
+        try:
+            self.sock.sendto(encode_highcmd(self.cmd), self.address)
+        except OSError as e:
+            logger.error(f"Error sending HighCmd: {e}")
+
+    def publish_setpoint(self, payload: bytes) -> None:
+        left_right, turn, look, forward = np.frombuffer(payload, dtype=np.float32).tolist()
+        limits = self.limits
+        with self._lock:
+            if self.cmd.mode == 1:
+                # Stand mode: the stick poses the body (lean, twist, look, extend)
+                self.cmd.euler = (left_right * limits.body_roll, look * limits.body_pitch,
+                                  -turn * limits.body_yaw)
+                self.cmd.body_height = forward * limits.body_height
+                self.cmd.velocity = (0.0, 0.0)
+                self.cmd.yaw_speed = 0.0
+            else:
+                # HighCmd +y is left and +yaw is counter-clockwise
+                self.cmd.velocity = (forward * limits.forward_speed,
+                                     -left_right * limits.lateral_speed)
+                self.cmd.yaw_speed = -turn * limits.yaw_speed
+            self._send()
+
+    def publish_mode(self, mode: Go1Mode) -> None:
+        with self._lock:
+            self.cmd.mode, self.cmd.gait_type = HIGHCMD_MODES[mode]
+            self.cmd.velocity = (0.0, 0.0)
+            self.cmd.yaw_speed = 0.0
+            self._send()
+
+    def publish_led(self, r: int, g: int, b: int) -> None:
+        with self._lock:
+            self.cmd.led = (r, g, b)
+            self._send()
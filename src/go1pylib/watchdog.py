@@ -0,0 +1,126 @@
+"""
+Dead-man watchdog for Go1 stick commands.
+
+The watchdog runs on its own thread so it keeps working when the asyncio
+loop that drives movement is blocked or the moving coroutine has died. With a
+virtual clock it is polled on the clock's schedule instead.
+"""
+
+from typing import Callable, Optional
+import logging
+import threading
+import time
+
+import numpy as np
+
+from .clock import Clock, SYSTEM_CLOCK
+
+logger = logging.getLogger(__name__)
+
+# Pre-encoded stop frame, identical to what update_speed(0, 0, 0, 0) publishes
+ZERO_FRAME: bytes = np.zeros(4, dtype=np.float32).tobytes()
+
+class StickWatchdog:
+    """
+    Publishes a zero stick frame if no fresh setpoint arrives in time.
+
+    The watchdog is armed whenever a non-zero frame is fed to it and
+    disarmed once a zero frame has been sent, so an idle robot is not
+    spammed with stop frames.
+    """
+
+    def __init__(self, publish: Callable[[bytes], None], deadline: float = 0.5,
+                 poll_interval: Optional[float] = None, clock: Optional[Clock] = None):
+        """
+        Initialize the watchdog.
+
+        Args:
+            publish: Callable that sends a raw stick payload to the robot
+            deadline: Seconds without a fresh setpoint before stopping the robot
+            poll_interval: How often the deadline is checked (defaults to deadline / 5)
+            clock: Time source (defaults to the system clock)
+        """
+        self.publish = publish
+        self.deadline = deadline
+        self.poll_interval = poll_interval or deadline / 5
+        self.trips = 0
+        self.clock = clock or SYSTEM_CLOCK
+
+        self._last_feed = self.clock.monotonic()
+        self._armed = False
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._cancel_virtual: Optional[Callable[[], None]] = None
+
+    @property
+    def running(self) -> bool:
+        """Whether the watchdog is polling."""
+        return self._cancel_virtual is not None or (
+            self._thread is not None and self._thread.is_alive()
+        )
+
+    def feed(self, frame: bytes) -> None:
+        """
+        Record that a stick frame has just been published.
+
+        Args:
+            frame: The raw stick payload that was sent
+        """
+        with self._lock:
+            self._last_feed = self.clock.monotonic()
+            self._armed = frame != ZERO_FRAME
+
+    def start(self) -> None:
+        """
+        Start the watchdog thread (or virtual-time polling).
+
+        Does nothing if it is already running. After ``stop`` it can be
+        started again; it then waits for a fresh setpoint before arming, so
+        a frame fed before the restart cannot trip it.
+        """
+        if self.running:
+            return
+        with self._lock:
+            self._armed = False
+        if self.clock.virtual:
+            self._cancel_virtual = self.clock.every(self.poll_interval, self.check)
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="go1-stick-watchdog", daemon=True
+        )
+        self._thread.start()
+        logger.debug(f"Stick watchdog started with {self.deadline}s deadline")
+
+    def stop(self) -> None:
+        """Stop the watchdog thread and wait for it to exit."""
+        if self._cancel_virtual is not None:
+            self._cancel_virtual()
+            self._cancel_virtual = None
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        """Watchdog thread body."""
+        while not self._stop_event.wait(self.poll_interval):
+            self.check()
+
+    def check(self) -> None:
+        """Send a zero frame if the deadline has passed since the last setpoint."""
+        with self._lock:
+            if not self._armed:
+                return
+            stalled_for = self.clock.monotonic() - self._last_feed
+            if stalled_for < self.deadline:
+                return
+            self._armed = False
+
+        self.trips += 1
+        logger.warning(f"No stick setpoint for {stalled_for:.3f}s, sending zero frame")
+        try:
+            self.publish(ZERO_FRAME)
+        except Exception as e:
+            logger.error(f"Watchdog failed to send zero frame: {e}")
@@ -0,0 +1,46 @@
+import threading
+import numpy as np
+from go1pylib import Go1
+from go1pylib.analytics import AnalyticsPipeline
+from go1pylib.mqtt.state import get_go1_state_copy
+
+def mean_current(window):
+    return float(window["current"].mean())
+
+def hottest_motor(window):
+    return int(np.argmax(window["motor_temps"].max(axis=0)))
+
+def test_batches_run_in_worker_processes():
+    results = {}
+    done = threading.Event()
+
+    def on_result(name, result):
+        results[name] = result
+        if len(results) == 2:
+            done.set()
+
+    pipeline = AnalyticsPipeline(
+        {"mean_current": mean_current, "hottest_motor": hottest_motor},
+        on_result=on_result, window=4, batch_size=6, max_workers=1
+    )
+    try:
+        state = get_go1_state_copy()
+        for i in range(6):
+            state.bms.current = i * 100
+            state.robot.temps = [30] * 20
+            state.robot.temps[7] = 40 + i
+            pipeline.observe("bms/state", state)
+        assert done.wait(30)
+    finally:
+        pipeline.close()
+    # The window holds the last four packets, oldest first
+    assert results == {"mean_current": 350.0, "hottest_motor": 7}
+    assert pipeline.submitted_batches == 1
+
+def test_close_unsubscribes_from_the_robot():
+    robot = Go1({"watchdog_deadline": None})
+    pipeline = robot.add_analytics({"mean_current": mean_current}, max_workers=1)
+    assert pipeline.observe in robot.mqtt.state_listeners
+    pipeline.close()
+    assert pipeline.observe not in robot.mqtt.state_listeners
+    robot.mqtt.disconnect()
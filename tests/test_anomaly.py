@@ -0,0 +1,81 @@
+import numpy as np
+from go1pylib import Go1, sim
+from go1pylib.anomaly import AnomalyDetector, FleetAnomalyMonitor
+
+def _detector():
+    events = []
+    detector = AnomalyDetector(lambda kind, index, value: events.append((kind, index, value)))
+    return detector, events
+
+def test_current_spike_fires_on_the_spiking_packet():
+    detector, events = _detector()
+    rng = np.random.default_rng(0)
+    cells = [4000] * 10
+    for _ in range(100):
+        detector.update_bms(-3000 + rng.normal(0, 200), cells)
+    assert events == []
+    detector.update_bms(-20000, cells)
+    assert events == [("current_spike", 0, -20000.0)]
+    detector.update_bms(-21000, cells)
+    assert len(events) == 1
+
+def test_cell_divergence_and_clear():
+    detector, events = _detector()
+    cells = np.full(10, 4000.0)
+    for _ in range(50):
+        detector.update_bms(-3000, cells)
+    cells[7] = 3950
+    detector.update_bms(-3000, cells)
+    assert [e[:2] for e in events] == [("cell_divergence", 7)]
+    assert events[0][2] < -40
+    cells[7] = 4000
+    detector.update_bms(-3000, cells)
+    assert [e[:2] for e in events][-1] == ("cell_divergence_clear", 7)
+
+def test_motor_outlier_against_siblings():
+    detector, events = _detector()
+    temps = [40] * 20
+    for _ in range(30):
+        detector.update_robot(temps, [255] * 4)
+    # Front-left thigh (leg 1, joint 1) heats up while the other thighs stay cool
+    temps[4] = 58
+    for _ in range(100):
+        detector.update_robot(temps, [255] * 4)
+    assert events == [("motor_outlier", 4, 18.0)]
+    # All legs warming together is not an outlier
+    detector.update_robot([40] * 20, [255] * 4)
+    detector.update_robot([60] * 20, [255] * 4)
+    assert [e[0] for e in events] == ["motor_outlier", "motor_outlier_clear"]
+
+def test_obstacle_dropout():
+    detector, events = _detector()
+    detector.update_robot([40] * 20, [50, 255, 255, 255])
+    detector.update_robot([40] * 20, [255, 255, 255, 255])
+    assert events == [("obstacle_dropout", 0, 255.0)]
+    detector.update_robot([40] * 20, [60, 255, 255, 255])
+    assert events[-1][0] == "obstacle_dropout_clear"
+
+    # Back sensor frozen at 120 while the front keeps changing
+    detector, events = _detector()
+    for i in range(60):
+        detector.update_robot([40] * 20, [100 + i % 20, 255, 255, 120])
+    assert ("obstacle_dropout", 3, 120.0) in events
+
+def test_go1_and_fleet_wiring():
+    robot = Go1({"watchdog_deadline": None})
+    events = []
+    robot.on('go1_anomaly', lambda *event: events.append(event))
+    detector = robot.enable_anomaly_detection(warmup=5)
+    for _ in range(10):
+        sim.feed(robot, "bms/state", sim.bms_packet(current=-3000))
+    sim.feed(robot, "bms/state", sim.bms_packet(current=-30000))
+    assert events == [("current_spike", 0, -30000.0)] and detector.events == 1
+
+    fleet_events = []
+    fleet = FleetAnomalyMonitor(lambda *event: fleet_events.append(event), warmup=5)
+    for robot_id in ("a", "b"):
+        for _ in range(10):
+            fleet.observe_packet(robot_id, "bms/state", sim.bms_packet(current=-3000))
+    fleet.observe_packet("b", "bms/state", sim.bms_packet(current=-30000))
+    assert fleet_events == [("b", "current_spike", 0, -30000.0)]
+    assert sorted(fleet.detectors) == ["a", "b"]
@@ -0,0 +1,119 @@
+import os
+import threading
+import numpy as np
+import pytest
+from go1pylib import cli, sim
+from go1pylib.archive import (ArchiveReader, TelemetryArchive, read_archive, unzigzag,
+                              varint_decode, varint_encode, zigzag)
+from go1pylib.recording import TelemetryRecorder
+
+def _telemetry(count=4000):
+    rng = np.random.default_rng(0)
+    packets = []
+    for i in range(count):
+        timestamp = 1_700_000_000.0 + i * 0.05
+        if i % 2:
+            cells = tuple(4000 - i // 200 + int(rng.integers(0, 2)) for _ in range(10))
+            payload = sim.bms_packet(soc=90 - i // 400, current=-3000 + int(rng.integers(-20, 20)),
+                                     cell_voltages=cells)
+            packets.append((timestamp, "bms/state", payload))
+        else:
+            packets.append((timestamp, "firmware/version", sim.firmware_packet(temps=(40 + i // 1000,) * 20)))
+    return packets
+
+def test_varint_and_zigzag_round_trip():
+    values = np.array([0, 1, 127, 128, 300, 2**64 - 1], dtype=np.uint64)
+    assert varint_decode(varint_encode(values), len(values)).tolist() == values.tolist()
+    signed = np.array([0, -1, 1, -2**63, 2**63 - 1], dtype=np.int64)
+    assert unzigzag(zigzag(signed)).tolist() == signed.tolist()
+    assert zigzag(np.array([-1, 1, -2])).tolist() == [1, 2, 3]
+
+@pytest.mark.parametrize("codec", ["none", "zlib", "lzma"])
+def test_archive_reproduces_packets(tmp_path, codec):
+    packets = _telemetry(1000) + [(1_700_000_100.0, "other/topic", b"\x01\x02\x03")]
+    path = str(tmp_path / "telemetry.arc")
+    with TelemetryArchive(path, block_size=128, codec=codec) as archive:
+        for timestamp, topic, payload in packets:
+            archive.write(topic, payload, timestamp)
+    restored = list(read_archive(path))
+    assert [(t, p) for _, t, p in restored] == [(t, p) for _, t, p in packets]
+    assert np.allclose([r[0] for r in restored], [p[0] for p in packets], rtol=0, atol=1e-6)
+
+def test_packets_of_one_topic_with_two_sizes_come_out_in_time_order(tmp_path):
+    path = str(tmp_path / "sizes.arc")
+    full, short = sim.bms_packet(soc=50), b"\x01\x02"
+    with TelemetryArchive(path, block_size=2) as archive:
+        # The short packets fill their block first, so it is flushed first
+        for timestamp, payload in [(0.0, full), (1.0, short), (2.0, short), (3.0, full)]:
+            archive.write("bms/state", payload, timestamp)
+    restored = list(read_archive(path))
+    assert [t for t, _, _ in restored] == pytest.approx([0.0, 1.0, 2.0, 3.0])
+    assert [p for _, _, p in restored] == [full, short, short, full]
+
+def test_archive_is_ten_times_smaller_than_a_recording(tmp_path):
+    archive_path, recording_path = str(tmp_path / "t.arc"), str(tmp_path / "t.rec")
+    with TelemetryArchive(archive_path) as archive, TelemetryRecorder(recording_path) as recorder:
+        for timestamp, topic, payload in _telemetry():
+            archive.write(topic, payload, timestamp)
+            recorder.write(topic, payload, timestamp)
+    assert os.path.getsize(recording_path) >= 10 * os.path.getsize(archive_path)
+
+def test_unfinished_archive_is_readable_and_indexed(tmp_path):
+    path = str(tmp_path / "live.arc")
+    archive = TelemetryArchive(path, block_size=100, flush_interval=10.0)
+    for timestamp, topic, payload in _telemetry(1000):
+        archive.write(topic, payload, timestamp)
+    archive.flush()
+    # Writer still open: no index yet, blocks are found by scanning
+    with ArchiveReader(path) as reader:
+        assert sum(info.count for info in reader.index) == 1000
+        info = reader.index[-1]
+        block = reader.read_block(info)
+        assert block.timestamps[0] == pytest.approx(info.start)
+        assert reader.read_block(info) is block
+        if info.topic == "bms/state":
+            assert block.records["current"].dtype == np.int32
+    archive.close()
+    with ArchiveReader(path) as reader:
+        assert reader.topics == ["bms/state", "firmware/version"]
+        assert sum(info.count for info in reader.index) == 1000
+
+def test_full_blocks_are_encoded_off_the_writing_thread(tmp_path, monkeypatch):
+    from go1pylib import archive as archive_module
+    encoders = []
+    encode_block = archive_module.encode_block
+
+    def recording_encode(*args, **kwargs):
+        encoders.append(threading.current_thread())
+        return encode_block(*args, **kwargs)
+    monkeypatch.setattr(archive_module, "encode_block", recording_encode)
+
+    with TelemetryArchive(str(tmp_path / "t.arc"), block_size=10) as archive:
+        for timestamp, topic, payload in _telemetry(100):
+            archive.write(topic, payload, timestamp)
+        archive.flush()
+        assert len(archive.index) == 10
+    assert encoders and threading.current_thread() not in encoders
+
+def test_flush_interval_follows_the_oldest_remaining_buffer(tmp_path):
+    firmware = sim.firmware_packet()
+    with TelemetryArchive(str(tmp_path / "t.arc"), block_size=2, flush_interval=10.0) as archive:
+        archive.write("firmware/version", firmware, 0.0)
+        archive.write("bms/state", sim.bms_packet(), 5.0)
+        # Completes the firmware block; the bms packet is now the oldest
+        archive.write("firmware/version", firmware, 6.0)
+        assert archive._oldest == 5.0
+        # 12 s after the first packet but only 7 s after the oldest buffered one
+        archive.write("firmware/version", firmware, 12.0)
+        assert archive._oldest == 5.0
+        archive.write("other/topic", b"\x01", 15.0)
+        assert archive._oldest is None
+
+def test_cli_replays_archives(tmp_path, capsys):
+    path = str(tmp_path / "telemetry.arc")
+    with TelemetryArchive(path) as archive:
+        for i in range(20):
+            archive.write("bms/state", sim.bms_packet(soc=90 - i), timestamp=100.0 + i * 0.01)
+    assert cli.main(["replay", path, "--speed", "0"]) == 0
+    out = capsys.readouterr().out
+    assert "Replayed 20 packets" in out and "SoC  71%" in out
@@ -0,0 +1,53 @@
+import numpy as np
+from go1pylib import Go1
+
+class FakeInfo:
+    def __init__(self, mid):
+        self.mid = mid
+        self.rc = 0
+        self.published = False
+
+    def is_published(self):
+        return self.published
+
+class FakeClient:
+    def __init__(self):
+        self.sent = []
+
+    def publish(self, topic, payload, qos=0):
+        info = FakeInfo(len(self.sent))
+        self.sent.append((topic, payload, info))
+        return info
+
+def frame(forward):
+    return np.array([0, 0, 0, forward], dtype=np.float32)
+
+def make_robot():
+    robot = Go1({"watchdog_deadline": None})
+    robot.mqtt.client = FakeClient()
+    robot.mqtt.connected = True
+    return robot
+
+def test_stalled_link_keeps_only_latest_stick_frame():
+    robot = make_robot()
+    client = robot.mqtt.client
+    for speed in (0.1, 0.2, 0.3, 0.4):
+        robot.mqtt._publish_stick(frame(speed))
+    assert len(client.sent) == 1
+    assert robot.mqtt.stale_stick_drops == 2
+
+    # Link drains the first frame: only the newest setpoint follows it
+    client.sent[0][2].published = True
+    robot.mqtt.transport._on_publish(None, None, client.sent[0][2].mid)
+    assert len(client.sent) == 2
+    np.testing.assert_array_equal(np.frombuffer(client.sent[1][1], dtype=np.float32), frame(0.4))
+    assert b"go1_stale_stick_frames_dropped_total 2" in robot.mqtt.metrics.render()
+
+def test_disconnect_discards_pending_frame():
+    robot = make_robot()
+    robot.mqtt._publish_stick(frame(0.1))
+    robot.mqtt._publish_stick(frame(0.2))
+    robot.mqtt.transport._on_disconnect(None, None, 1)
+    robot.mqtt.connected = True
+    robot.mqtt._publish_stick(frame(0.3))
+    assert len(robot.mqtt.client.sent) == 2
@@ -0,0 +1,24 @@
+import pytest
+from go1pylib.battery import BatteryAnalytics
+from go1pylib.mqtt.state import BMSState
+
+def test_discharge_rate_and_runtime():
+    analytics = BatteryAnalytics(soc_tau=5.0, soc_trend_tau=20.0)
+    # 1% per 10 seconds, sampled every second
+    for second in range(600):
+        soc = 90 - second // 10
+        analytics.update(BMSState(soc=soc, current=-5000, cell_voltages=[4000] * 10), second)
+    stats = analytics.stats
+    assert stats.soc_rate == pytest.approx(-0.1, rel=0.1)
+    assert stats.runtime_remaining == pytest.approx(stats.soc * 10, rel=0.1)
+    assert stats.current_avg == pytest.approx(-5000)
+
+def test_cell_spread_and_temperature_trend():
+    analytics = BatteryAnalytics(temp_tau=5.0, temp_trend_tau=20.0)
+    for second in range(300):
+        cells = [4000] * 9 + [3950]
+        analytics.update(BMSState(soc=80, cell_voltages=cells, temps=[30, 31, 30 + second / 60, 29]), second)
+    stats = analytics.stats
+    assert stats.cell_spread == 50 and stats.cell_spread_peak == 50
+    assert stats.temp_trend == pytest.approx(1 / 60, rel=0.1)
+    assert stats.runtime_remaining is None
@@ -0,0 +1,36 @@
+from unittest.mock import Mock
+from go1pylib import Go1
+from go1pylib.bus import EventBus, SAFETY_PRIORITY
+
+def test_priority_order_and_error_isolation():
+    bus = EventBus()
+    calls = []
+    bus.on("tick", lambda v: calls.append(("normal", v)))
+    bus.on("tick", lambda v: 1 / 0)
+    bus.on("tick", lambda v: calls.append(("safety", v)), priority=SAFETY_PRIORITY)
+    bus.emit("tick", 1)
+    assert calls == [("safety", 1), ("normal", 1)]
+    assert sorted(s.errors for s in bus.handler_stats("tick").values()) == [0, 0, 1]
+
+def test_batch_dispatch_and_timing():
+    bus = EventBus()
+    bus.timing = True
+    single, batched = Mock(), Mock()
+    bus.on("update", single)
+    bus.on("update", batched, batch=True)
+    bus.emit_batch("update", [(1,), (2,), (3,)])
+    assert single.call_count == 3
+    batched.assert_called_once_with([(1,), (2,), (3,)])
+    stats = bus.handler_stats("update")[single]
+    assert stats.calls == 3 and stats.total_time > 0
+
+    bus.off("update", single)
+    bus.emit("update", 4)
+    assert single.call_count == 3
+
+def test_robot_on_receives_state_changes():
+    robot = Go1({"watchdog_deadline": None})
+    handler = Mock()
+    robot.on("go1_state_change", handler)
+    robot.publish_state(robot.go1_state)
+    handler.assert_called_once_with(robot.go1_state)
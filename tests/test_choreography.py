@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+from unittest.mock import Mock
+from go1pylib import Go1, Go1Mode
+from go1pylib.movement import MotionStatus
+from go1pylib.choreography import CompiledRoutine, compile_script
+
+SCRIPT = {
+    "rate_hz": 10,
+    "steps": [
+        {"type": "mode", "mode": "stand"},
+        {"type": "pose", "lean": 2.0, "duration_ms": 500},
+        {"type": "led", "r": 300, "g": 0, "b": 0},
+        {"type": "wait", "duration_ms": 250},
+        {"type": "move", "forward": 0.3, "duration_ms": 250},
+    ],
+}
+
+def test_compile_clamps_and_schedules_events():
+    routine = compile_script(SCRIPT)
+    assert routine.frames.shape == (10, 4)
+    np.testing.assert_array_equal(routine.frames[:5, 0], np.ones(5, dtype=np.float32))
+    assert [(e.tick, e.kind, e.value) for e in routine.events] == [
+        (0, "mode", Go1Mode.STAND), (5, "led", (255, 0, 0))
+    ]
+    assert routine is compile_script(SCRIPT)
+    # The cached routine is shared, so nothing in it may be changed in place
+    assert isinstance(routine.events, tuple) and not routine.frames.flags.writeable
+
+def test_invalid_mode_is_rejected():
+    with pytest.raises(ValueError, match="step 0"):
+        compile_script({"steps": [{"type": "mode", "mode": "fly"}]})
+
+def test_step_that_is_not_an_object_is_rejected():
+    with pytest.raises(ValueError, match="Invalid choreography step 1"):
+        compile_script({"steps": [{"type": "wait", "duration_ms": 100}, "wait"]})
+
+def test_save_and_load_roundtrip(tmp_path):
+    routine = compile_script(SCRIPT)
+    path = str(tmp_path / "routine.npz")
+    routine.save(path)
+    loaded = CompiledRoutine.load(path)
+    np.testing.assert_array_equal(loaded.frames, routine.frames)
+    assert loaded.events == routine.events
+
+@pytest.mark.asyncio
+async def test_play_routine_fires_events_in_order():
+    robot = Go1({"watchdog_deadline": None})
+    robot.mqtt.client = Mock()
+    robot.mqtt.connected = True
+    robot.mqtt.send_mode_command = Mock()
+    robot.mqtt.send_led_command = Mock()
+    await robot.play_routine(compile_script(SCRIPT, rate_hz=200))
+    robot.mqtt.send_mode_command.assert_called_once_with(Go1Mode.STAND)
+    robot.mqtt.send_led_command.assert_called_once_with(255, 0, 0)
+    # 200 routine ticks plus the final zero frame
+    assert robot.mqtt.client.publish.call_count == 201
+
+@pytest.mark.asyncio
+async def test_rejected_mode_command_fails_the_routine():
+    robot = Go1({"watchdog_deadline": None})
+    robot.mqtt.client = Mock()
+    robot.mqtt.connected = True
+    # Twelve mode changes in 60 ms, past the mode command burst of ten
+    steps = [{"type": "mode", "mode": "stand"}, {"type": "wait", "duration_ms": 5}] * 12
+    status = await robot.play_routine(compile_script({"steps": steps}, rate_hz=200))
+    assert status == MotionStatus.FAILED
+    topics = [c.args[0] for c in robot.mqtt.client.publish.call_args_list]
+    assert topics.count("controller/action") == 10
+    # Ten ticks ran before the rejected command, then the final zero frame
+    assert topics.count("controller/stick") == 11
+    assert not np.frombuffer(robot.mqtt.client.publish.call_args[0][1], dtype=np.float32).any()
@@ -0,0 +1,50 @@
+import io
+import numpy as np
+from go1pylib import Go1
+from go1pylib import cli, sim
+from go1pylib.recording import TelemetryRecorder, read_recording
+
+def test_bench_against_local_stand_in(capsys):
+    assert cli.main(["bench", "--sim", "--count", "200", "--probes", "10"]) == 0
+    out = capsys.readouterr().out
+    assert "local stand-in" in out and "packets/s" in out
+    # The stand-in acknowledges instantly, so round trips would mean nothing
+    assert "round trip" not in out
+
+def test_monitor_local_stand_in(capsys):
+    assert cli.main(["monitor", "--sim", "--interval", "0.05", "--duration", "0.1"]) == 0
+    assert "SoC" in capsys.readouterr().out
+
+def test_record_and_replay(tmp_path, capsys):
+    path = str(tmp_path / "telemetry.rec")
+    with TelemetryRecorder(path) as recorder:
+        for i in range(20):
+            recorder.write("bms/state", sim.bms_packet(soc=90 - i), timestamp=100.0 + i * 0.01)
+            recorder.write("firmware/version", sim.firmware_packet(), timestamp=100.0 + i * 0.01)
+    assert len(list(read_recording(path))) == 40
+
+    assert cli.main(["replay", path, "--speed", "0"]) == 0
+    out = capsys.readouterr().out
+    assert "Replayed 40 packets" in out and "SoC  71%" in out
+
+def test_drive_streams_stdin_setpoints(monkeypatch):
+    robot = Go1({"watchdog_deadline": None})
+    client = sim.attach(robot)
+    sticks = []
+    publish = client.publish
+
+    def record(topic, payload=None, **kwargs):
+        if topic == "controller/stick":
+            sticks.append(np.frombuffer(payload, dtype=np.float32).copy())
+        return publish(topic, payload, **kwargs)
+
+    client.publish = record
+    monkeypatch.setattr(cli, "_make_robot", lambda args: robot)
+    # stdin is already at EOF when the first tick runs
+    monkeypatch.setattr("sys.stdin", io.StringIO("0 0 0 0.5\nnot a frame\n0.2, 0, 0, 2\n"))
+    assert cli.main(["drive", "--rate", "100"]) == 0
+    # The last parsed setpoint goes out before the final zero frame
+    assert len(sticks) >= 2
+    assert sticks[-2].tolist() == [np.float32(0.2), 0, 0, 1]
+    assert not sticks[-1].any()
+    assert cli._parse_frame("0.2, 0, 0, 2").tolist() == [np.float32(0.2), 0, 0, 1]
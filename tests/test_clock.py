@@ -0,0 +1,48 @@
+import asyncio
+import time
+import numpy as np
+import pytest
+from go1pylib import Go1, sim
+from go1pylib.clock import VirtualClock
+from go1pylib.movement import MotionStatus
+
+def test_ten_minute_move_runs_in_virtual_time():
+    clock = VirtualClock()
+    robot = Go1({"watchdog_deadline": 0.5, "clock": clock})
+    client = sim.attach(robot)
+
+    async def mission():
+        status = await robot.go_forward(0.5, 10 * 60 * 1000)
+        await robot.wait(60 * 1000)
+        return status
+
+    start = time.monotonic()
+    assert clock.run(mission()) == MotionStatus.COMPLETED
+    assert time.monotonic() - start < 5
+    assert clock.monotonic() == pytest.approx(660, abs=0.2)
+    # One frame per 100 ms tick plus the final zero frame
+    assert client.publish_counts["controller/stick"] == pytest.approx(6002, abs=2)
+    assert robot.mqtt.watchdog.trips == 0
+    assert robot.odometry.pose[0] == pytest.approx(0.5 * 0.6 * 600, rel=0.01)
+    robot.mqtt.disconnect()
+
+def test_watchdog_trips_at_virtual_deadline():
+    clock = VirtualClock()
+    robot = Go1({"watchdog_deadline": 0.5, "clock": clock})
+    client = sim.attach(robot)
+    robot.mqtt._publish_stick(np.array([0, 0, 0, 0.5], dtype=np.float32))
+    clock.advance(0.45)
+    assert robot.mqtt.watchdog.trips == 0
+    clock.advance(10.0)
+    assert robot.mqtt.watchdog.trips == 1
+    assert not np.frombuffer(client.last_payloads["controller/stick"], dtype=np.float32).any()
+    robot.mqtt.disconnect()
+
+def test_periodic_callbacks_fire_at_exact_times():
+    clock = VirtualClock()
+    seen = []
+    cancel = clock.every(0.25, lambda: seen.append(clock.monotonic()))
+    clock.advance(1.0)
+    cancel()
+    clock.advance(1.0)
+    assert seen == [0.25, 0.5, 0.75, 1.0]
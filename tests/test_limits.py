@@ -0,0 +1,78 @@
+import numpy as np
+from go1pylib import Go1, Go1Mode, sim
+from go1pylib.clock import VirtualClock
+from go1pylib.mqtt.limits import PublishLimiter, TokenBucket, TopicLimit
+
+def test_token_bucket_refills_up_to_burst():
+    bucket = TokenBucket(rate=2.0, burst=2.0, now=0.0)
+    assert bucket.take(0.0) and bucket.take(0.0) and not bucket.take(0.0)
+    assert bucket.wait_time(0.0) == 0.5
+    assert bucket.take(0.5) and not bucket.take(0.5)
+    bucket.take(100.0)
+    assert bucket.tokens == 1.0
+
+def test_merge_topic_keeps_latest_and_other_topics_reject():
+    clock = VirtualClock()
+    sent = []
+    limiter = PublishLimiter({"led": TopicLimit(10.0, 1.0, merge=True), "mode": TopicLimit(1.0, 1.0)},
+                             clock=clock, hold=lambda: True)
+    for i in range(5):
+        limiter.submit("led", lambda i=i: sent.append(("led", i)))
+    assert limiter.submit("mode", lambda: sent.append(("mode", 0)))
+    assert not limiter.submit("mode", lambda: sent.append(("mode", 1)))
+    assert sent == [("mode", 0)]
+    assert limiter.throttled["led"] == 5 and limiter.merged["led"] == 4
+    assert limiter.rejected == {"led": 0, "mode": 1}
+
+    # A held limiter only delays merge topics; mode commands never wait for it
+    clock.advance(1.0)
+    assert limiter.try_acquire("mode")
+    assert limiter.pending == 1
+
+    limiter.hold = None
+    clock.advance(0.2)
+    assert sent[-1] == ("led", 4) and ("led", 0) not in sent
+    assert limiter.pending == 0
+
+    limiter.submit("other", lambda: sent.append(("other", 0)))
+    assert sent[-1] == ("other", 0)
+
+def test_limited_commands_wait_for_congested_stick():
+    clock = VirtualClock()
+    congested = [True]
+    sent = []
+    limiter = PublishLimiter({"led": TopicLimit(10.0, 5.0, merge=True)}, clock=clock,
+                             hold=lambda: congested[0])
+    assert not limiter.submit("led", lambda: sent.append(1))
+    clock.advance(1.0)
+    assert sent == []
+    congested[0] = False
+    clock.advance(0.02)
+    assert sent == [1]
+
+def test_go1_led_flood_does_not_touch_stick():
+    clock = VirtualClock()
+    robot = Go1({"watchdog_deadline": None, "clock": clock})
+    client = sim.attach(robot)
+    for i in range(100):
+        robot.set_led_color(i, 0, 0)
+        robot.mqtt._publish_stick(np.zeros(4, dtype=np.float32))
+    assert robot.set_mode(Go1Mode.WALK)
+    assert client.publish_counts["controller/stick"] == 100
+    assert client.publish_counts["programming/code"] == 5
+    assert client.publish_counts["controller/action"] == 1
+    # Mode commands are sent synchronously or rejected, never queued
+    results = [robot.set_mode(Go1Mode.STAND) for _ in range(20)]
+    assert results.count(True) == 9 and client.publish_counts["controller/action"] == 10
+    assert robot.mqtt.limiter.rejected["controller/action"] == 11
+    assert robot.mqtt.limiter.merged["programming/code"] == 94
+
+    clock.advance(1.0)
+    assert client.publish_counts["programming/code"] == 6
+    assert client.last_payloads["programming/code"] == b"child_conn.send('change_light(99,0,0)')"
+
+    unlimited = Go1({"watchdog_deadline": None, "publish_limits": None})
+    client = sim.attach(unlimited)
+    for i in range(20):
+        unlimited.set_led_color(i, 0, 0)
+    assert client.publish_counts["programming/code"] == 20
@@ -0,0 +1,71 @@
+import pytest
+import asyncio
+from go1pylib.metrics import Go1Metrics, MetricsServer
+from go1pylib.mqtt.state import get_go1_state_copy
+
+def test_bms_section_rendered():
+    metrics = Go1Metrics()
+    state = get_go1_state_copy()
+    state.bms.soc = 87
+    state.bms.current = -1500
+    state.bms.cell_voltages = [4100] * 10
+    metrics.observe_state("bms/state", state)
+    body = metrics.render().decode()
+    assert "go1_bms_soc_percent 87" in body
+    assert "go1_bms_current_milliamps -1500" in body
+    assert 'go1_bms_cell_voltage_millivolts{cell="9"} 4100' in body
+
+def test_motor_temperatures_rendered():
+    metrics = Go1Metrics()
+    state = get_go1_state_copy()
+    state.robot.temps = list(range(20))
+    metrics.observe_state("firmware/version", state)
+    body = metrics.render().decode()
+    assert 'go1_motor_temperature_celsius{motor="19"} 19' in body
+
+def test_message_rates_and_reconnects():
+    metrics = Go1Metrics()
+    for i in range(5):
+        metrics.observe_message("bms/state", now=i * 0.5)
+    metrics.observe_connect()
+    metrics.observe_connect()
+    body = metrics.render().decode()
+    assert 'go1_messages_received_total{topic="bms/state"} 5' in body
+    assert 'go1_message_rate_hertz{topic="bms/state"} 2.000' in body
+    assert "go1_reconnects_total 1" in body
+
+def test_publish_latency_histogram():
+    metrics = Go1Metrics()
+    metrics.observe_publish("controller/stick", 0.002)
+    metrics.observe_publish("controller/stick", 0.3)
+    body = metrics.render().decode()
+    assert 'go1_publish_latency_seconds_bucket{topic="controller/stick",le="0.0025"} 1' in body
+    assert 'go1_publish_latency_seconds_bucket{topic="controller/stick",le="+Inf"} 2' in body
+
+def test_counters_render_on_scrape():
+    metrics = Go1Metrics()
+    metrics.observe_publish("controller/stick", 0.002)
+    # Publishing only updates counters; the text is built by the scrape
+    assert metrics._sections["publish"] == b""
+    assert b'go1_publish_latency_seconds_count{topic="controller/stick"} 1' in metrics.render()
+    metrics.observe_publish("controller/stick", 2.0)
+    metrics.observe_stale_drop()
+    body = metrics.render().decode()
+    assert 'go1_publish_latency_seconds_bucket{topic="controller/stick",le="1.0"} 1' in body
+    assert 'go1_publish_latency_seconds_count{topic="controller/stick"} 2' in body
+    assert "go1_stale_stick_frames_dropped_total 1" in body
+
+@pytest.mark.asyncio
+async def test_metrics_server_scrape():
+    metrics = Go1Metrics()
+    server = MetricsServer(metrics, port=0)
+    await server.start()
+    try:
+        reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+        writer.write(b"GET /metrics HTTP/1.1\r\nHost: localhost\r\n\r\n")
+        response = await reader.read()
+        writer.close()
+    finally:
+        await server.stop()
+    assert response.startswith(b"HTTP/1.1 200 OK")
+    assert b"go1_connects_total 0" in response
@@ -0,0 +1,100 @@
+import asyncio
+import numpy as np
+import pytest
+from unittest.mock import Mock
+from go1pylib import Go1
+from go1pylib.movement import MotionStatus
+
+def make_robot(**options):
+    robot = Go1({"watchdog_deadline": None, **options})
+    robot.mqtt.client = Mock()
+    robot.mqtt.connected = True
+    robot.mqtt.publish_frequency = 0.01
+    return robot
+
+def published(robot):
+    return [np.frombuffer(c.args[1], dtype=np.float32) for c in robot.mqtt.client.publish.call_args_list]
+
+@pytest.mark.asyncio
+async def test_newer_command_preempts_and_keeps_its_own_setpoint():
+    robot = make_robot()
+    first = asyncio.create_task(robot.go_forward(0.5, 1000))
+    await asyncio.sleep(0.03)
+    assert await robot.turn_left(0.3, 50) == MotionStatus.COMPLETED
+    assert await first == MotionStatus.PREEMPTED
+
+    frames = published(robot)
+    forward = [f for f in frames if f[3] == 0.5]
+    turning = [f for f in frames if f[1] == np.float32(-0.3)]
+    assert forward and turning
+    # Every frame belongs to exactly one command, never a mix of both
+    assert all(f[3] == 0.5 or f[1] == np.float32(-0.3) or not f.any() for f in frames)
+    assert robot.mqtt.motion.active is None
+
+@pytest.mark.asyncio
+async def test_reject_policy_and_priority():
+    robot = make_robot(motion_policy="reject")
+    moving = robot.mqtt.send_movement_command(100)
+    assert await robot.go_backward(0.5, 100) == MotionStatus.REJECTED
+    urgent = robot.mqtt.send_setpoint_stream([np.zeros(4, dtype=np.float32)], priority=10)
+    assert await moving == MotionStatus.PREEMPTED
+    assert await urgent == MotionStatus.COMPLETED
+
+@pytest.mark.asyncio
+async def test_concurrent_behaviours_share_one_publish_rate():
+    robot = make_robot()
+
+    async def behaviour(speed):
+        for _ in range(5):
+            await robot.go_forward(speed, 40)
+
+    start = asyncio.get_running_loop().time()
+    await asyncio.gather(behaviour(0.2), behaviour(0.4))
+    elapsed = asyncio.get_running_loop().time() - start
+    # One loop at 100 Hz; only the 10 submissions may add an early tick each
+    assert robot.mqtt.client.publish.call_count <= elapsed / 0.01 + 2 + 10
+
+@pytest.mark.asyncio
+async def test_cancel_sends_zero_frame_on_next_tick():
+    robot = make_robot()
+    robot.mqtt.publish_frequency = 0.5
+    robot.mqtt.update_speed(0, 0, 0, 0.5)
+    handle = robot.mqtt.send_movement_command(10000)
+    await asyncio.sleep(0.05)
+    start = asyncio.get_running_loop().time()
+    assert handle.cancel()
+    assert await handle == MotionStatus.CANCELLED
+    await asyncio.sleep(0.01)
+    # The zero frame did not wait for the 500 ms period to run out
+    assert asyncio.get_running_loop().time() - start < 0.1
+    frames = published(robot)
+    assert frames[0][3] == 0.5 and not frames[-1].any()
+    assert robot.stop() is False
+
+@pytest.mark.asyncio
+async def test_cancelling_awaiting_task_stops_the_robot():
+    robot = make_robot()
+    task = asyncio.create_task(robot.go_forward(0.5, 10000))
+    await asyncio.sleep(0.03)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    await asyncio.sleep(0.01)
+    assert not published(robot)[-1].any()
+    assert robot.mqtt.motion.active is None
+
+@pytest.mark.asyncio
+async def test_completed_move_ends_with_single_zero_frame():
+    robot = make_robot()
+    await robot.go_forward(0.5, 30)
+    await asyncio.sleep(0.02)
+    frames = published(robot)
+    assert not frames[-1].any() and frames[-2][3] == 0.5
+
+@pytest.mark.asyncio
+async def test_stop_ends_awaited_move_with_cancelled_status():
+    robot = make_robot()
+    task = asyncio.create_task(robot.go_forward(0.5, 10000))
+    await asyncio.sleep(0.03)
+    assert robot.stop()
+    assert await task == MotionStatus.CANCELLED
@@ -0,0 +1,54 @@
+import math
+import numpy as np
+import pytest
+from unittest.mock import Mock
+from go1pylib import Go1, Go1Mode
+from go1pylib.odometry import Odometry, OdometryCalibration
+
+def frame(left_right=0.0, turn=0.0, forward=0.0):
+    return np.array([left_right, turn, 0.0, forward], dtype=np.float32)
+
+def test_straight_line_and_turn():
+    odometry = Odometry(OdometryCalibration(forward_speed=1.0, yaw_rate=math.pi / 2))
+    odometry.update(frame(forward=0.5), 0.0)
+    odometry.update(frame(turn=-1.0), 0.4)  # 0.2 m forward, then turn left for 0.4 s
+    odometry.update(frame(), 0.8)
+    x, y, theta = odometry.pose
+    assert x == pytest.approx(0.2)
+    assert y == pytest.approx(0.0)
+    assert theta == pytest.approx(0.2 * math.pi)
+    assert odometry.trajectory().shape == (3, 4)
+
+def test_hold_timeout_caps_integration():
+    odometry = Odometry(OdometryCalibration(forward_speed=1.0, hold_timeout=0.5))
+    odometry.update(frame(forward=1.0), 0.0)
+    odometry.update(frame(), 10.0)
+    assert odometry.pose[0] == pytest.approx(0.5)
+
+@pytest.mark.asyncio
+async def test_go_to_reaches_target():
+    robot = Go1({"watchdog_deadline": None})
+    robot.mqtt.client = Mock()
+    robot.mqtt.connected = True
+    robot.mqtt.publish_frequency = 0.01
+    robot.odometry.calibration = OdometryCalibration(forward_speed=5.0, yaw_rate=10.0)
+    assert await robot.go_to(0.3, 0.3, speed=1.0, tolerance=0.05, timeout_ms=5000)
+    x, y, _ = robot.odometry.pose
+    assert math.hypot(0.3 - x, 0.3 - y) < 0.1
+
+def test_stand_mode_frames_do_not_move_the_estimate():
+    odometry = Odometry(OdometryCalibration(forward_speed=1.0))
+    odometry.set_mode(Go1Mode.STAND)
+    odometry.update(frame(left_right=1.0, turn=1.0, forward=1.0), 0.0)
+    odometry.update(frame(), 0.4)
+    assert odometry.pose == (0.0, 0.0, 0.0)
+    odometry.set_mode(Go1Mode.WALK)
+    odometry.update(frame(forward=1.0), 0.4)
+    odometry.update(frame(), 0.6)
+    assert odometry.pose[0] == pytest.approx(0.2)
+
+def test_trajectory_keeps_most_recent_poses():
+    odometry = Odometry(trajectory_capacity=4)
+    for i in range(10):
+        odometry.update(frame(), float(i))
+    assert odometry.trajectory()[:, 0].tolist() == [6.0, 7.0, 8.0, 9.0]
@@ -0,0 +1,34 @@
+import numpy as np
+import pytest
+from unittest.mock import AsyncMock, Mock
+from go1pylib import Go1
+from go1pylib.profiles import ramp_profile, move_profile
+
+def test_trapezoidal_ramp_respects_accel_limit():
+    ramp = ramp_profile(0.0, 1.0, 2.0, None, 10.0)
+    assert ramp[0] == 0 and ramp[-1] == pytest.approx(1.0)
+    assert np.max(np.diff(ramp)) <= 2.0 / 10.0 + 1e-6
+
+def test_s_curve_ramp_is_monotonic_with_gentle_start():
+    ramp = ramp_profile(0.0, 1.0, 2.0, 8.0, 50.0)
+    steps = np.diff(ramp)
+    assert np.all(steps >= 0)
+    assert ramp[-1] == pytest.approx(1.0)
+    assert steps[0] < steps[len(steps) // 2]
+
+def test_move_profile_is_cached_and_read_only():
+    frames = move_profile((0.0, 0.0, 0.0, 0.5), 2.0, 2.0, None, 10.0)
+    assert frames is move_profile((0.0, 0.0, 0.0, 0.5), 2.0, 2.0, None, 10.0)
+    assert frames.shape == (20, 4)
+    assert not frames.flags.writeable
+    assert np.all(frames[0] == 0) and np.all(frames[-1] == 0)
+    assert np.max(frames[:, 3]) == pytest.approx(0.5)
+
+@pytest.mark.asyncio
+async def test_go_smooth_streams_profile():
+    robot = Go1()
+    robot.mqtt = Mock(publish_frequency=0.1, send_setpoint_stream=AsyncMock())
+    await robot.go_smooth(0, 0, 0.5, 2000)
+    frames = robot.mqtt.send_setpoint_stream.call_args[0][0]
+    assert frames is move_profile((0, 0, 0.0, 0.5), 2.0, 2.0, None, 10.0)
+    assert robot.mqtt.send_setpoint_stream.call_args[1]["period"] == 0.1
@@ -0,0 +1,82 @@
+import os
+import numpy as np
+import pytest
+from go1pylib import archive, cli, sim
+from go1pylib.archive import TelemetryArchive
+from go1pylib.query import TelemetryStore, downsample, parse_interval, resolve_field
+
+T0 = 1_700_000_000.0
+
+def _write_day(path, day, count=2000):
+    with TelemetryArchive(path, block_size=100) as writer:
+        for i in range(count):
+            timestamp = T0 + day * 86400 + i * 0.5
+            writer.write("bms/state", sim.bms_packet(current=-1000 - i, temps=(30, 31, 32, 33)), timestamp)
+            writer.write("firmware/version", sim.firmware_packet(temps=tuple(range(40, 60))), timestamp)
+
+@pytest.fixture
+def store(tmp_path):
+    for robot in ("go1-a", "go1-b"):
+        os.makedirs(tmp_path / robot)
+        for day in range(3):
+            _write_day(str(tmp_path / robot / f"day{day}.arc"), day)
+    with TelemetryStore(str(tmp_path)) as store:
+        yield store
+
+def test_parse_interval_and_fields():
+    assert parse_interval("500ms") == 0.5 and parse_interval("5min") == 300 and parse_interval(2) == 2
+    with pytest.raises(ValueError):
+        parse_interval("-1s")
+    assert resolve_field("robot.temps[3]")[:3] == ("firmware/version", "temps", 3)
+    with pytest.raises(ValueError):
+        resolve_field("bms.nothing")
+
+def test_downsample_aggregates():
+    t = np.array([0.0, 0.4, 1.1, 1.2, 1.9, 3.5])
+    v = np.array([1, 3, 2, 4, 6, 5])
+    assert downsample(t, v, 1.0, "mean")[1].tolist() == [2, 4, 5]
+    assert downsample(t, v, 1.0, "max")[0].tolist() == [0, 1, 3]
+    assert downsample(t, v, 1.0, "last")[1].tolist() == [3, 6, 5]
+    assert downsample(t, v, 1.0, "count")[1].tolist() == [2, 3, 1]
+
+def test_query_reads_only_overlapping_blocks(store, monkeypatch):
+    decoded = []
+    decode_block = archive.decode_block
+    monkeypatch.setattr(archive, "decode_block",
+                        lambda data, offset=0, fields=None: decoded.append(offset) or decode_block(data, offset, fields))
+
+    start = T0 + 86400 + 100
+    times, current = store.query("go1-a", "bms.current", start, start + 60)
+    assert len(times) == 120 and times[0] == start
+    assert current.tolist() == list(range(-1200, -1320, -1))
+    # 60 s of a 0.5 s stream spans two 100-packet blocks
+    assert len(decoded) <= 2
+
+    times, means = store.query("go1-b", "bms.current", start, start + 60, resample="10s")
+    assert len(times) == 6 and times[0] == start
+    assert means[0] == pytest.approx(np.mean(range(-1200, -1220, -1)))
+
+def test_query_array_and_derived_fields(store):
+    assert store.robots == ["go1-a", "go1-b"]
+    times, temps = store.query("go1-a", "robot.temps", end=T0 + 10)
+    assert temps.shape == (20, 20) and temps[0, 19] == 59
+    assert store.query("go1-a", "robot.temps[19]", end=T0 + 10)[1].tolist() == [59] * 20
+    assert store.query("go1-a", "bms.voltage", end=T0 + 1)[1].tolist() == [40000, 40000]
+    times, maxima = store.query("go1-a", "bms.temps", resample="1d", agg="max")
+    assert len(times) == 3 and maxima[0].tolist() == [30, 31, 32, 33]
+
+def test_cli_query(store, capsys):
+    assert cli.main(["query", store.root, "go1-a", "bms.current", "--end", str(T0 + 1)]) == 0
+    assert capsys.readouterr().out.splitlines() == [f"{T0:.6f},-1000", f"{T0 + 0.5:.6f},-1001"]
+
+def test_missing_robot_and_growing_archive(store, tmp_path):
+    with pytest.raises(ValueError):
+        store.query("go1-c", "bms.current")
+    assert cli.main(["query", store.root, "go1-c", "bms.current"]) == 1
+
+    path = str(tmp_path / "go1-a" / "day3.arc")
+    _write_day(path, 3, count=10)
+    assert len(store.query("go1-a", "bms.current", start=T0 + 3 * 86400)[0]) == 10
+    # The file grows: the next query sees the new packets instead of the stale index
+    _write_day(path, 3, count=20)
+    assert len(store.query("go1-a", "bms.current", start=T0 + 3 * 86400)[0]) == 20
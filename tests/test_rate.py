@@ -0,0 +1,84 @@
+import asyncio
+import numpy as np
+import pytest
+from go1pylib import Go1, sim
+from go1pylib.clock import VirtualClock
+from go1pylib.mqtt.rate import AdaptiveRateController, PROBE_TOPIC
+
+def probe(controller, mid, sent, acked):
+    assert controller.should_probe(sent)
+    controller.begin_probe(sent)
+    controller.probe_sent(mid)
+    return controller.on_ack(mid, acked)
+
+def test_fast_link_raises_rate_to_upper_bound():
+    controller = AdaptiveRateController(min_period=0.02, max_period=0.2)
+    for i in range(20):
+        assert probe(controller, i, i * 1.0, i * 1.0 + 0.002)
+    assert controller.rtt == pytest.approx(0.002)
+    assert controller.period == pytest.approx(0.02)
+    assert controller.rate_hz == pytest.approx(50.0)
+
+def test_congested_link_backs_off():
+    controller = AdaptiveRateController(min_period=0.02, max_period=0.2)
+    for i in range(20):
+        probe(controller, i, i * 1.0, i * 1.0 + 0.08)
+    assert 0.08 <= controller.period <= 0.2
+    probe(controller, 99, 100.0, 100.5)
+    assert controller.period == pytest.approx(0.2)
+
+def test_ack_before_mid_is_known():
+    controller = AdaptiveRateController()
+    controller.begin_probe(1.0)
+    assert not controller.on_ack(7, 1.01)
+    controller.probe_sent(7)
+    assert controller.rtt == pytest.approx(0.01)
+
+def test_lost_probe_doubles_period():
+    controller = AdaptiveRateController(min_period=0.02, max_period=0.2, initial_period=0.05,
+                                        probe_timeout=1.0)
+    controller.begin_probe(0.0)
+    controller.probe_sent(1)
+    assert not controller.should_probe(0.5)
+    assert controller.should_probe(1.5)
+    assert controller.lost_probes == 1
+    assert controller.period == pytest.approx(0.1)
+
+def test_probes_respect_probe_interval():
+    controller = AdaptiveRateController(probe_interval=1.0)
+    assert probe(controller, 1, 0.0, 0.01)
+    assert not controller.should_probe(0.1)
+    assert not controller.should_probe(0.99)
+    assert controller.should_probe(1.0)
+
+def test_lost_probe_slows_stick_cadence():
+    clock = VirtualClock()
+    robot = Go1({"watchdog_deadline": None, "adaptive_rate": True, "clock": clock,
+                 "min_publish_period": 0.02, "max_publish_period": 0.2})
+    client = sim.attach(robot)
+    sent = []
+    publish = client.publish
+
+    def record(topic, payload=None, qos=0, retain=False):
+        sent.append((topic, clock.monotonic()))
+        return publish(topic, payload, qos, retain)
+    client.publish = record
+
+    def frames():
+        while True:
+            yield np.zeros(4, dtype=np.float32)
+
+    async def drive():
+        handle = robot.mqtt.send_setpoint_stream(frames())
+        await asyncio.sleep(5.0)
+        handle.cancel()
+    clock.run(drive())
+
+    sticks = [t for topic, t in sent if topic == "controller/stick"]
+    early = np.diff([t for t in sticks if t < 1.9])
+    late = np.diff([t for t in sticks if t > 2.1])
+    # The simulated broker never acknowledges, so the probe sent at t=0 is lost at t=2
+    assert early == pytest.approx(0.1)
+    assert late == pytest.approx(0.2)
+    assert robot.mqtt.publish_frequency == pytest.approx(0.2)
+    assert sum(1 for topic, _ in sent if topic == PROBE_TOPIC) <= 3
@@ -0,0 +1,39 @@
+import numpy as np
+from types import SimpleNamespace
+from unittest.mock import Mock
+from go1pylib import Go1
+from go1pylib.reflex import ObstacleReflex
+from go1pylib.mqtt.state import get_go1_state_copy
+
+def firmware_packet(front: int, left: int = 255, right: int = 255, back: int = 255) -> bytes:
+    packet = bytearray(44)
+    packet[30:34] = bytes([front, left, right, back])
+    return bytes(packet)
+
+def test_filter_blocks_only_motion_towards_obstacle():
+    reflex = ObstacleReflex(Mock(), {"front": 0.75})
+    state = get_go1_state_copy()
+    state.robot.distance_warning.front = 1.0
+    assert reflex.evaluate(state)
+    forward = np.array([0.2, 0.3, 0, 0.5], dtype=np.float32)
+    backward = np.array([0, 0, 0, -0.5], dtype=np.float32)
+    np.testing.assert_array_equal(reflex.filter(forward), np.array([0.2, 0.3, 0, 0], dtype=np.float32))
+    np.testing.assert_array_equal(reflex.filter(backward), backward)
+
+def test_reflex_stops_in_decode_callback():
+    robot = Go1({"reflex_thresholds": {"front": 0.75}, "watchdog_deadline": None})
+    robot.mqtt.client = Mock()
+    robot.mqtt.connected = True
+    robot.mqtt._publish_stick(np.array([0.2, 0.3, 0, 0.5], dtype=np.float32))
+    published = robot.mqtt.client.publish.call_count
+
+    msg = SimpleNamespace(topic="firmware/version", payload=firmware_packet(front=5))
+    robot.mqtt.transport._on_message(None, None, msg)
+
+    # The stop went out from the decode callback itself, without waiting for a tick
+    assert robot.mqtt.client.publish.call_count == published + 1
+    topic, payload = robot.mqtt.client.publish.call_args[0][:2]
+    assert topic == "controller/stick"
+    np.testing.assert_array_equal(np.frombuffer(payload, dtype=np.float32),
+                                  np.array([0.2, 0.3, 0, 0], dtype=np.float32))
+    assert robot.mqtt.reflex.blocked["front"]
@@ -0,0 +1,68 @@
+import uuid
+from types import SimpleNamespace
+from go1pylib import Go1
+from go1pylib.shm import StateExporter, StateReader
+from go1pylib.transport import LoopbackTransport
+from go1pylib.mqtt.state import get_go1_state_copy
+
+def test_reader_sees_exported_state():
+    name = f"go1test_{uuid.uuid4().hex[:8]}"
+    exporter = StateExporter(name)
+    reader = StateReader(name)
+    try:
+        state = get_go1_state_copy()
+        state.bms.soc = 64
+        state.robot.temps = list(range(20))
+        state.robot.obstacles = [10, 20, 30, 40]
+        exporter.write(state)
+        snapshot = reader.read()
+        assert snapshot["packets"] == 1
+        assert snapshot["bms_soc"] == 64
+        assert list(snapshot["motor_temps"]) == list(range(20))
+        assert list(snapshot["obstacles"]) == [10, 20, 30, 40]
+        assert reader.seq == 2
+    finally:
+        reader.close()
+        exporter.close()
+
+def test_go1mqtt_exports_decoded_packets():
+    name = f"go1test_{uuid.uuid4().hex[:8]}"
+    robot = Go1({"shm_name": name, "watchdog_deadline": None})
+    reader = StateReader(name)
+    try:
+        payload = bytes([1, 0, 0, 87]) + bytes(40)
+        robot.mqtt.transport._deliver("bms/state", payload)
+        assert reader.read()["bms_soc"] == 87
+    finally:
+        reader.close()
+        robot.mqtt.disconnect()
+
+def test_disconnect_stops_network_loop_before_closing_export():
+    name = f"go1test_{uuid.uuid4().hex[:8]}"
+    robot = Go1({"shm_name": name, "watchdog_deadline": None})
+    calls = []
+    exporter = robot.mqtt.state_exporter
+    close = exporter.close
+    exporter.close = lambda: (calls.append("export_close"), close())
+    robot.mqtt.client = SimpleNamespace(loop_stop=lambda: calls.append("loop_stop"),
+                                        disconnect=lambda: calls.append("disconnect"))
+    robot.mqtt.disconnect()
+    assert calls == ["loop_stop", "disconnect", "export_close"]
+    assert robot.mqtt.state_exporter is None
+
+def test_export_resumes_after_reconnect():
+    name = f"go1test_{uuid.uuid4().hex[:8]}"
+    transport = LoopbackTransport()
+    robot = Go1({"shm_name": name, "watchdog_deadline": None}, transport=transport)
+    robot.init()
+    robot.mqtt.disconnect()
+    assert robot.mqtt.state_exporter is None
+
+    robot.mqtt.connect()
+    reader = StateReader(name)
+    try:
+        transport.inject("bms/state", bytes([1, 0, 0, 55]) + bytes(40))
+        assert reader.read()["bms_soc"] == 55
+    finally:
+        reader.close()
+        robot.mqtt.disconnect()
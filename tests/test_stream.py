@@ -0,0 +1,63 @@
+import asyncio
+import threading
+import pytest
+from types import SimpleNamespace
+from go1pylib import Go1
+
+def bms_packet(soc):
+    return SimpleNamespace(topic="bms/state", payload=bytes([1, 0, 0, soc]) + bytes(40))
+
+def firmware_packet():
+    return SimpleNamespace(topic="firmware/version", payload=bytes(44))
+
+def feed(robot, messages):
+    """Deliver messages from a separate thread, like paho's network loop."""
+    thread = threading.Thread(
+        target=lambda: [robot.mqtt.transport._on_message(None, None, m) for m in messages]
+    )
+    thread.start()
+    thread.join()
+
+@pytest.mark.asyncio
+async def test_buffer_policy_filters_topics_and_drops_oldest():
+    robot = Go1({"watchdog_deadline": None})
+    async with robot.states(topics=["bms/state"], policy="buffer", maxsize=2) as stream:
+        feed(robot, [bms_packet(10), firmware_packet(), bms_packet(20), bms_packet(30)])
+        await asyncio.sleep(0.01)
+        first = await stream.__anext__()
+        second = await stream.__anext__()
+    assert (first.bms.soc, second.bms.soc) == (20, 30)
+    assert stream.dropped == 1
+
+@pytest.mark.asyncio
+async def test_latest_policy_keeps_newest_snapshot():
+    robot = Go1({"watchdog_deadline": None})
+    stream = robot.states()
+    feed(robot, [bms_packet(soc) for soc in (1, 2, 3)])
+    await asyncio.sleep(0.01)
+    assert (await stream.__anext__()).bms.soc == 3
+    assert stream.dropped == 2
+    stream.close()
+    assert [snap async for snap in stream] == []
+
+@pytest.mark.asyncio
+async def test_block_policy_is_ordered_and_bounded():
+    robot = Go1({"watchdog_deadline": None})
+    stream = robot.states(policy="block", maxsize=2)
+    feed(robot, [bms_packet(soc) for soc in range(6)])
+    await asyncio.sleep(0.01)
+    received = [(await stream.__anext__()).bms.soc for _ in range(4)]
+    # Two queued, two waiting in overflow, the rest dropped
+    assert received == [0, 1, 2, 3]
+    assert stream.delayed == 2 and stream.dropped == 2
+
+@pytest.mark.asyncio
+async def test_close_counts_discarded_snapshots_as_dropped():
+    robot = Go1({"watchdog_deadline": None})
+    stream = robot.states(policy="block", maxsize=2)
+    feed(robot, [bms_packet(soc) for soc in range(3)])
+    await asyncio.sleep(0.01)
+    stream.close()
+    # Queued snapshots are still delivered; the overflow one is dropped
+    assert stream.dropped == 1
+    assert [snap.bms.soc async for snap in stream] == [0, 1]
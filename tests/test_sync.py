@@ -0,0 +1,38 @@
+import numpy as np
+from concurrent.futures import CancelledError
+from unittest.mock import Mock
+import pytest
+from go1pylib import Go1, Go1Sync
+from go1pylib.movement import MotionStatus
+
+@pytest.fixture
+def dog():
+    robot = Go1({"watchdog_deadline": None})
+    robot.mqtt.client = Mock()
+    robot.mqtt.connected = True
+    robot.mqtt.publish_frequency = 0.01
+    dog = Go1Sync(robot=robot)
+    yield dog
+    dog.close()
+
+def last_frame(dog):
+    return np.frombuffer(dog.robot.mqtt.client.publish.call_args[0][1], dtype=np.float32)
+
+def test_blocking_calls_run_on_background_loop(dog):
+    assert dog.go_forward(0.5, 50) == MotionStatus.COMPLETED
+    dog.set_led_color(0, 255, 0)
+    assert dog.robot.mqtt.client.publish.call_args[0][0] == "programming/code"
+    assert dog.battery is dog.robot.battery
+
+def test_fire_and_forget_move_can_be_cancelled(dog):
+    move = dog.go_forward(0.5, 10000, wait=False)
+    # Calls run in order on the loop, so once this returns the move has been
+    # submitted; cancelling earlier would never start it
+    dog.call(lambda: None)
+    assert dog.call(lambda: dog.robot.mqtt.motion.active is not None)
+    assert not move.done()
+    move.cancel()
+    with pytest.raises(CancelledError):
+        move.result(1.0)
+    dog.call(lambda: None)  # let the publisher run its next tick
+    assert not last_frame(dog).any()
@@ -0,0 +1,71 @@
+import asyncio
+import socket
+import numpy as np
+import pytest
+from go1pylib import Go1, sim
+from go1pylib.teleop import encode_setpoint
+
+def make_robot():
+    robot = Go1({"watchdog_deadline": None})
+    client = sim.attach(robot)
+    robot.mqtt.publish_frequency = 0.01
+    return robot, client
+
+def last_frame(client):
+    return np.frombuffer(client.last_payloads["controller/stick"], dtype=np.float32)
+
+@pytest.mark.asyncio
+async def test_udp_latest_wins_and_timeout():
+    robot, client = make_robot()
+    bridge = await robot.serve_teleop("127.0.0.1", 0, timeout=0.1)
+    sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    try:
+        for seq in range(1, 6):
+            sender.sendto(encode_setpoint(seq, 0, 0, 0, seq / 10), ("127.0.0.1", bridge.port))
+        sender.sendto(encode_setpoint(2, 0, 0, 0, 0.9), ("127.0.0.1", bridge.port))  # late duplicate
+        sender.sendto(b"short", ("127.0.0.1", bridge.port))
+        await asyncio.sleep(0.03)
+        assert last_frame(client)[3] == np.float32(0.5)
+        assert (bridge.packets, bridge.reordered, bridge.malformed) == (5, 1, 1)
+
+        await asyncio.sleep(0.15)
+        assert bridge.timeouts == 1
+        assert not last_frame(client).any()
+
+        # A restarted controller starts over from sequence 1
+        sender.sendto(encode_setpoint(1, 0, 0, 0, 0.3), ("127.0.0.1", bridge.port))
+        await asyncio.sleep(0.03)
+        assert bridge.packets == 6 and bridge.reordered == 1
+        assert last_frame(client)[3] == np.float32(0.3)
+    finally:
+        sender.close()
+        bridge.stop()
+    await asyncio.sleep(0.02)
+    assert robot.mqtt.motion.active is None
+
+@pytest.mark.asyncio
+async def test_tcp_stream_source():
+    robot, client = make_robot()
+    bridge = await robot.serve_teleop("127.0.0.1", 0, protocol="tcp")
+    reader, writer = await asyncio.open_connection("127.0.0.1", bridge.port)
+    writer.write(encode_setpoint(0xFFFFFFFF, 0.2, 0, 0, 0) + encode_setpoint(0, 0.3, 0, 0, 0))
+    await writer.drain()
+    await asyncio.sleep(0.03)
+    assert last_frame(client)[0] == np.float32(0.3)
+    assert bridge.reordered == 0
+    writer.close()
+    bridge.stop()
+
+@pytest.mark.asyncio
+async def test_idle_sources_are_forgotten():
+    robot, client = make_robot()
+    bridge = await robot.serve_teleop("127.0.0.1", 0, timeout=0.05)
+    try:
+        for i in range(100):
+            bridge.receive(encode_setpoint(7, 0, 0, 0, 0.1), (f"10.0.0.{i}", 9000))
+        assert len(bridge._last_seq) == 100
+        await asyncio.sleep(0.1)
+        bridge.receive(encode_setpoint(1, 0, 0, 0, 0.2), ("10.0.1.1", 9000))
+        assert list(bridge._last_seq) == [("10.0.1.1", 9000)]
+    finally:
+        bridge.stop()
@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+from unittest.mock import Mock
+from go1pylib import Go1
+from go1pylib.thermal import ThermalMonitor
+
+def test_rolling_statistics_and_events():
+    events = Mock()
+    monitor = ThermalMonitor(events, warn_temp=60, limit_temp=80, max_rise_rate=0.5,
+                             mean_tau=1.0, slope_tau=2.0)
+    temps = np.full(20, 40.0)
+    for second in range(60):
+        temps[7] = 40 + second  # 1 C/s on motor 7
+        monitor.update(temps, float(second))
+
+    assert monitor.hottest == 7
+    assert monitor.slope[7] == pytest.approx(1.0, rel=0.05)
+    assert monitor.slope[0] == pytest.approx(0.0, abs=1e-9)
+    assert monitor.max[7] == pytest.approx(99.0)
+    kinds = [c.args[:2] for c in events.call_args_list]
+    assert kinds.count(("rise", 7)) == 1
+    assert kinds.count(("warning", 7)) == 1
+    assert kinds.count(("limit", 7)) == 1
+    assert monitor.scale == pytest.approx(monitor.min_scale)
+
+def test_packet_without_time_step_is_not_counted():
+    monitor = ThermalMonitor()
+    monitor.update(np.full(20, 40.0), 1.0)
+    monitor.update(np.full(20, 50.0), 1.0)
+    assert monitor.samples == 1
+    assert monitor.mean[0] == pytest.approx(40.0)
+
+def test_throttle_scales_outgoing_setpoints():
+    robot = Go1({"watchdog_deadline": None})
+    robot.mqtt.client = Mock()
+    robot.mqtt.connected = True
+    monitor = robot.enable_thermal_protection(warn_temp=60, limit_temp=80, min_scale=0.2)
+    monitor.update(np.full(20, 70.0), 0.0)
+    assert monitor.scale == pytest.approx(0.6)
+
+    robot.mqtt._publish_stick(np.array([0.5, 0.5, 0.3, 1.0], dtype=np.float32))
+    payload = robot.mqtt.client.publish.call_args[0][1]
+    np.testing.assert_allclose(np.frombuffer(payload, dtype=np.float32), [0.3, 0.3, 0.3, 0.6], rtol=1e-6)
+
+def test_limit_fires_again_after_dropping_below_warning():
+    events = Mock()
+    monitor = ThermalMonitor(events, warn_temp=60, limit_temp=80, hysteresis=10,
+                             max_rise_rate=1000, mean_tau=0.01)
+    # 55 C is under the warning but inside its hysteresis band, so nothing fires
+    for second, temp in enumerate((85.0, 55.0, 85.0)):
+        monitor.update(np.full(20, temp), float(second))
+    kinds = [c.args[:2] for c in events.call_args_list]
+    assert kinds.count(("limit", 0)) == 2
+    assert kinds.count(("warning", 0)) == 1
@@ -0,0 +1,139 @@
+import asyncio
+import time
+import numpy as np
+import pytest
+from types import SimpleNamespace
+from go1pylib import Go1, Go1Mode
+from go1pylib import cli, sim
+from go1pylib.mqtt.transport import MQTTTransport
+from go1pylib.transport import (HIGHCMD, HIGHSTATE_TOPIC, HighCmd, LoopbackTransport,
+                                UDPHighCmdTransport, decode_highcmd, encode_highcmd, highcmd_crc)
+
+def test_loopback_carries_commands_and_telemetry():
+    transport = LoopbackTransport()
+    robot = Go1({"watchdog_deadline": None}, transport=transport)
+    robot.init()
+    assert transport.connected and robot.mqtt.ready
+
+    robot.set_led_color(1, 2, 3)
+    robot.set_mode(Go1Mode.WALK)
+    robot.mqtt._publish_stick(np.array([0, 0, 0, 0.5], dtype=np.float32))
+    assert transport.leds == [(1, 2, 3)]
+    assert transport.modes == [Go1Mode.WALK]
+    assert np.frombuffer(transport.last_setpoint, dtype=np.float32)[3] == np.float32(0.5)
+
+    transport.inject("bms/state", sim.bms_packet(soc=42))
+    assert robot.mqtt.go1_state.bms.soc == 42
+
+    robot.mqtt.disconnect()
+    assert not transport.connected
+
+def test_motion_runs_over_loopback():
+    transport = LoopbackTransport()
+    robot = Go1({"watchdog_deadline": None}, transport=transport)
+    robot.init()
+    robot.mqtt.publish_frequency = 0.001
+
+    async def move():
+        await robot.go_forward(speed=0.5, duration_ms=20)
+    asyncio.run(move())
+    # Every tick plus the final zero frame
+    assert transport.setpoints >= 2
+    assert not np.frombuffer(transport.last_setpoint, dtype=np.float32).any()
+
+def test_highcmd_round_trip_and_crc():
+    cmd = HighCmd(mode=2, gait_type=1, velocity=(0.3, -0.1), yaw_speed=0.5, led=(9, 8, 7))
+    packet = encode_highcmd(cmd)
+    assert len(packet) == HIGHCMD.size == 129
+    decoded = decode_highcmd(packet)
+    assert decoded.mode == 2 and decoded.led == (9, 8, 7)
+    assert decoded.velocity == pytest.approx((0.3, -0.1))
+
+    corrupted = bytearray(packet)
+    corrupted[40] ^= 1
+    with pytest.raises(ValueError):
+        decode_highcmd(bytes(corrupted))
+    # Reference value of the SDK's crc32_core over one zero word
+    assert highcmd_crc(bytes(4)) == 0xC704DD7B
+
+def test_udp_highcmd_against_stand_in():
+    receiver = sim.HighCmdReceiver()
+    transport = UDPHighCmdTransport(*receiver.address, local_port=0)
+    telemetry = []
+    robot = Go1({"watchdog_deadline": None}, transport=transport)
+    robot.mqtt.add_raw_listener(lambda topic, payload: telemetry.append(topic))
+    robot.init()
+    try:
+        robot.set_mode(Go1Mode.WALK)
+        robot.mqtt._publish_stick(np.array([0.5, 0.5, 0, 1.0], dtype=np.float32))
+        assert receiver.wait_for(2)
+        walk = receiver.commands[-1]
+        limits = transport.limits
+        assert (walk.mode, walk.gait_type) == (2, 1)
+        assert walk.velocity == pytest.approx((limits.forward_speed, -0.5 * limits.lateral_speed))
+        assert walk.yaw_speed == pytest.approx(-0.5 * limits.yaw_speed)
+
+        robot.set_mode(Go1Mode.STAND)
+        robot.mqtt._publish_stick(np.array([0, 0, 1.0, 0], dtype=np.float32))
+        assert receiver.wait_for(4)
+        stand = receiver.commands[-1]
+        assert stand.mode == 1 and stand.velocity == (0.0, 0.0)
+        assert stand.euler[1] == pytest.approx(limits.body_pitch)
+        assert receiver.rejected == 0
+
+        receiver.send_state(b"\xfe\xef" + bytes(20))
+        for _ in range(100):
+            if telemetry:
+                break
+            time.sleep(0.01)
+        assert telemetry == [HIGHSTATE_TOPIC]
+    finally:
+        robot.mqtt.disconnect()
+        receiver.close()
+
+def test_bench_over_loopback(capsys):
+    assert cli.main(["bench", "--transport", "loopback", "--count", "200"]) == 0
+    out = capsys.readouterr().out
+    assert "loopback transport" in out and "frames/s" in out and "round trip" not in out
+
+def test_udp_highcmd_walks_before_any_mode_command():
+    receiver = sim.HighCmdReceiver()
+    transport = UDPHighCmdTransport(*receiver.address, local_port=0)
+    robot = Go1({"watchdog_deadline": None}, transport=transport)
+    robot.init()
+    try:
+        robot.mqtt._publish_stick(np.array([0, 0, 0, 1.0], dtype=np.float32))
+        assert receiver.wait_for(1)
+        cmd = receiver.commands[-1]
+        assert (cmd.mode, cmd.gait_type) == (2, 1)
+        assert cmd.velocity[0] == pytest.approx(transport.limits.forward_speed)
+    finally:
+        robot.mqtt.disconnect()
+        receiver.close()
+
+def test_bench_rejects_sim_with_transport():
+    with pytest.raises(SystemExit):
+        cli.main(["bench", "--sim", "--transport", "loopback"])
+
+def test_mqtt_is_the_default_transport():
+    robot = Go1({"host": "10.0.0.2", "port": 1884, "watchdog_deadline": None})
+    transport = robot.mqtt.transport
+    assert isinstance(transport, MQTTTransport)
+    assert (transport.host, transport.port) == ("10.0.0.2", 1884)
+    assert not robot.mqtt.ready
+
+    client = sim.attach(robot)
+    assert transport.client is client and robot.mqtt.ready
+    robot.set_led_color(1, 2, 3)
+    robot.set_mode(Go1Mode.WALK)
+    robot.mqtt._publish_stick(np.array([0, 0, 0, 0.5], dtype=np.float32))
+    assert client.publish_counts == {"programming/code": 1, "controller/action": 1,
+                                     "controller/stick": 1}
+
+    transport._on_message(None, None, SimpleNamespace(topic="bms/state", payload=sim.bms_packet(soc=42)))
+    assert robot.mqtt.go1_state.bms.soc == 42
+
+    statuses = []
+    robot.on("go1_connection_status", statuses.append)
+    transport._on_disconnect(None, None, 1)
+    assert not robot.mqtt.ready and statuses == [False]
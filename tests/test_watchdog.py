@@ -0,0 +1,54 @@
+import time
+import numpy as np
+from go1pylib import Go1
+from go1pylib.transport import LoopbackTransport
+from go1pylib.watchdog import StickWatchdog, ZERO_FRAME
+
+def test_zero_frame_sent_after_deadline():
+    sent = []
+    watchdog = StickWatchdog(sent.append, deadline=0.05, poll_interval=0.01)
+    watchdog.start()
+    try:
+        watchdog.feed(np.array([0, 0, 0, 0.5], dtype=np.float32).tobytes())
+        time.sleep(0.2)
+    finally:
+        watchdog.stop()
+    assert sent == [ZERO_FRAME]
+    assert watchdog.trips == 1
+
+def test_fresh_setpoints_keep_watchdog_quiet():
+    sent = []
+    watchdog = StickWatchdog(sent.append, deadline=0.1, poll_interval=0.01)
+    watchdog.start()
+    try:
+        frame = np.array([0, 0, 0, 0.5], dtype=np.float32).tobytes()
+        for _ in range(10):
+            watchdog.feed(frame)
+            time.sleep(0.02)
+        watchdog.feed(ZERO_FRAME)
+        time.sleep(0.2)
+    finally:
+        watchdog.stop()
+    assert sent == []
+
+def test_watchdog_restarts_disarmed_on_reconnect():
+    transport = LoopbackTransport()
+    robot = Go1({"watchdog_deadline": 0.05}, transport=transport)
+    robot.init()
+    watchdog = robot.mqtt.watchdog
+    robot.mqtt._publish_stick(np.array([0, 0, 0, 0.5], dtype=np.float32))
+    robot.mqtt.disconnect()
+    assert not watchdog.running
+
+    robot.mqtt.connect()
+    try:
+        assert watchdog.running
+        # The frame fed before the disconnect does not trip the new run
+        time.sleep(0.15)
+        assert watchdog.trips == 0
+        robot.mqtt._publish_stick(np.array([0, 0, 0, 0.5], dtype=np.float32))
+        time.sleep(0.15)
+        assert watchdog.trips == 1
+        assert transport.last_setpoint == ZERO_FRAME
+    finally:
+        robot.mqtt.disconnect()